@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+# pylint: disable=E0611,E0213,E1102,C0103,E1101,W0613,R0913,R0904
+#
+# A library that provides a testing suite fot python-telegram-bot
+# wich can be found on https://github.com/python-telegram-bot/python-telegram-bot
+# Copyright (C) 2017
+# Pieter Schutz - https://github.com/eldinnie
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser Public License for more details.
+#
+# You should have received a copy of the GNU Lesser Public License
+# along with this program.  If not, see [http://www.gnu.org/licenses/].
+"""
+Micro-benchmark of the per-send overhead of the Mockbot.
+
+Measures sendMessage with and without reading the returned message, once with the bot identity cached (current
+behaviour) and once with the identity rebuilt on every send (the behaviour before getMe cached it).
+
+    PYTHONPATH=. python benchmarks/bench_send.py [sends per run]
+"""
+from __future__ import print_function
+
+import sys
+import timeit
+
+from ptbtest import Mockbot
+
+
+def per_send(bot, n, read, rebuild_identity):
+    def send():
+        if rebuild_identity:
+            bot.invalidate_identity()
+        m = bot.sendMessage(1, "hello")
+        if read:
+            m.text
+
+    return min(timeit.repeat(send, number=n, repeat=3)) / n * 1e6
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    print("{0:<28} {1:>12} {2:>12}".format("", "rebuilt (us)", "cached (us)"))
+    for read in (False, True):
+        label = "send + read message" if read else "send only"
+        before = per_send(Mockbot(max_sent_messages=1000), n, read, True)
+        after = per_send(Mockbot(max_sent_messages=1000), n, read, False)
+        print("{0:<28} {1:>12.2f} {2:>12.2f}".format(label, before, after))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+# pylint: disable=E0611,E0213,E1102,C0103,E1101,W0613,R0913,R0904
+#
+# A library that provides a testing suite fot python-telegram-bot
+# wich can be found on https://github.com/python-telegram-bot/python-telegram-bot
+# Copyright (C) 2017
+# Pieter Schutz - https://github.com/eldinnie
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser Public License for more details.
+#
+# You should have received a copy of the GNU Lesser Public License
+# along with this program.  If not, see [http://www.gnu.org/licenses/].
+"""
+Stress benchmark for the update buffer behind the Mockbot.
+
+Every run starts a number of producer threads that insert updates while one consumer thread drains the buffer the
+way the Updater's polling thread does, checks that nothing was lost or duplicated and prints the insert throughput.
+
+    PYTHONPATH=. python benchmarks/bench_updatequeue.py [updates per run]
+"""
+from __future__ import print_function
+
+import sys
+import threading
+import time
+
+from telegram import Update
+
+from ptbtest.updatequeue import UpdateQueue
+
+
+def run(producers, total):
+    queue = UpdateQueue()
+    per_producer = total // producers
+    updates = [[Update(n * per_producer + i) for i in range(per_producer)]
+               for n in range(producers)]
+    received = []
+    done = threading.Event()
+
+    def produce(own):
+        for u in own:
+            queue.put(u)
+
+    def consume():
+        while not done.is_set() or len(queue):
+            received.extend(queue.drain(timeout=.01))
+
+    consumer = threading.Thread(target=consume)
+    consumer.start()
+    threads = [threading.Thread(target=produce, args=(own, )) for own in updates]
+    start = time.time()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.time() - start
+    done.set()
+    consumer.join()
+
+    ids = [u.update_id for u in received]
+    assert len(ids) == producers * per_producer, "updates were lost"
+    assert len(set(ids)) == len(ids), "updates were duplicated"
+    return len(ids) / elapsed
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    print("{0:>9} {1:>15}".format("producers", "inserts/sec"))
+    for producers in (1, 2, 4, 8, 16, 32):
+        print("{0:>9} {1:>15,.0f}".format(producers, run(producers, total)))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,6 @@
 from __future__ import absolute_import
 import unittest
 
-import time
-
 from telegram.ext import CommandHandler
 from telegram.ext import Job
 from telegram.ext import Updater
@@ -10,12 +8,14 @@ from telegram.ext import Updater
 from ptbtest import ChatGenerator
 from ptbtest import MessageGenerator
 from ptbtest import Mockbot
+from ptbtest import VirtualClock
 
 """
 This is an example to show how the ptbtest suite can be used.
 This example follows the timerbot example at:
 https://github.com/python-telegram-bot/python-telegram-bot/blob/master/examples/timerbot.py
 We will skip the start and help handlers and focus on the timer.
+Instead of waiting for the timer in real time we use a VirtualClock and move it forward ourselves.
 
 """
 class Testtimerbot(unittest.TestCase):
@@ -27,6 +27,11 @@ class Testtimerbot(unittest.TestCase):
         # And a Messagegenerator and updater (for use with the bot.)
         self.mg = MessageGenerator(self.bot)
         self.updater = Updater(bot=self.bot)
+        # The virtual clock replaces the job queue of the updater so we decide when time passes
+        self.clock = VirtualClock()
+        self.clock.attach(self.updater)
+        # And attaching the updater lets insertUpdate return as soon as the update is handled
+        self.bot.attach(self.updater)
 
     def test_timer(self):
         # first declare the callback methods
@@ -99,20 +104,20 @@ class Testtimerbot(unittest.TestCase):
         self.bot.insertUpdate(u3)
         data = self.bot.sent_messages[-1]
         self.assertEqual(data['text'], 'Timer successfully set!')
-        time.sleep(2)
+        self.clock.advance(2)
         self.bot.insertUpdate(u4)
         data = self.bot.sent_messages[-1]
         self.assertEqual(data['text'], 'Timer successfully unset!')
         # and to be certain we have to wait some more to see if it stops sending the message
         # we reset the bot so we can be sure nothing more has been sent
         self.bot.reset()
-        time.sleep(5)
+        self.clock.advance(5)
         data = self.bot.sent_messages
         self.assertEqual(len(data), 0)
 
         # lastly we will make sure an alarm message is sent after the timelimit has passed
         self.bot.insertUpdate(u3)
-        time.sleep(6)
+        self.clock.advance(6)
         data = self.bot.sent_messages[-1]
         self.assertEqual(data['text'], 'Beep!')
         self.assertEqual(data['chat_id'], chat.id)
@@ -18,6 +18,7 @@
 #
 # You should have received a copy of the GNU Lesser Public License
 # along with this program.  If not, see [http://www.gnu.org/licenses/].
+import sys
 
 from .mockbot import Mockbot
 from .usergenerator import UserGenerator
@@ -25,6 +26,10 @@ from .chatgenerator import ChatGenerator
 from .messagegenerator import MessageGenerator
 from .callbackquerygenerator import CallbackQueryGenerator
 from .inlinequerygenerator import InlineQueryGenerator
+from .virtualclock import VirtualClock
+from .registry import Registry
+from .webhookdriver import WebhookDriver
+from .botapiserver import BotApiServer
 from .errors import BadUserException
 from .errors import BadChatException
 from .errors import BadMessageException
@@ -36,5 +41,10 @@ __all__ = [
     "BadUserException", "BadChatException", "BadMessageException",
     "BadBotException", "Mockbot", "UserGenerator", "ChatGenerator",
     "MessageGenerator", "BadMarkupException", "CallbackQueryGenerator",
-    "BadCallbackQueryException", "InlineQueryGenerator"
+    "BadCallbackQueryException", "InlineQueryGenerator", "VirtualClock",
+    "Registry", "WebhookDriver", "BotApiServer"
 ]
+
+if sys.version_info >= (3, 5):
+    from .asyncmockbot import AsyncMockbot  # noqa: F401
+    __all__.append("AsyncMockbot")
@@ -0,0 +1,203 @@
+#!/usr/bin/env python
+# pylint: disable=E0611,E0213,E1102,C0103,E1101,W0613,R0913,R0904
+#
+# A library that provides a testing suite fot python-telegram-bot
+# wich can be found on https://github.com/python-telegram-bot/python-telegram-bot
+# Copyright (C) 2017
+# Pieter Schutz - https://github.com/eldinnie
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser Public License for more details.
+#
+# You should have received a copy of the GNU Lesser Public License
+# along with this program.  If not, see [http://www.gnu.org/licenses/].
+"""This module provides an asyncio version of the Mockbot. It needs python 3.5 or newer."""
+import asyncio
+import functools
+import logging
+
+from .correlation import (reset_update_id, set_update_id)
+from .mockbot import Mockbot
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+
+class AsyncMockbot(object):
+    """
+    An asyncio front for a :py:class:`ptbtest.Mockbot`. Every method of the Mockbot that talks to telegram is
+    a coroutine here, under both its camelCase and snake_case name. The calls are recorded by the wrapped Mockbot,
+    so ``sent_messages``, ``message_store`` and the other attributes of the Mockbot are available on this object
+    as well. The ``latency`` of the Mockbot is awaited, so slow calls do not block the event loop. With a
+    ``clock`` the latency does not move the clock, it makes the time of the task waiting for it late, so
+    concurrent calls overlap like they do without one.
+
+    Updates are handled by whatever is attached with :py:meth:`attach`. A coroutine function attached is awaited
+    on the event loop for every inserted update, so many conversations can be handled concurrently by one loop::
+
+        async def echo(bot, update):
+            await bot.send_message(update.message.chat_id, update.message.text)
+
+        bot = AsyncMockbot()
+        bot.attach(echo)
+        await asyncio.gather(*(bot.insert_update(u) for u in updates))
+
+    Args:
+        mockbot (Optional[ptbtest.Mockbot]): The Mockbot recording the calls. Defaults to a new one created with
+            ``kwargs``.
+        **kwargs: Passed to :py:class:`ptbtest.Mockbot` when no ``mockbot`` is given.
+
+    Attributes:
+        mockbot (ptbtest.Mockbot): The wrapped Mockbot.
+    """
+
+    def __init__(self, mockbot=None, **kwargs):
+        self.mockbot = mockbot if mockbot is not None else Mockbot(**kwargs)
+        self._handler = None
+
+    def __getattr__(self, item):
+        if item == 'mockbot':
+            raise AttributeError(item)
+        return getattr(self.mockbot, item)
+
+    def attach(self, dispatcher):
+        """
+        Attaches what handles the inserted updates.
+
+        Args:
+            dispatcher: A coroutine function called as ``handler(bot, update)`` with this bot, or a
+                :py:class:`telegram.ext.Dispatcher` or :py:class:`telegram.ext.Updater` of the wrapped Mockbot
+                running in its own threads, see :py:meth:`ptbtest.Mockbot.attach`.
+        """
+        if hasattr(dispatcher, 'process_update') or hasattr(dispatcher, 'dispatcher'):
+            self._handler = None
+            self.mockbot.attach(dispatcher)
+        else:
+            self._handler = dispatcher
+
+    async def insert_update(self, update, timeout=None):
+        """
+        Inserts an update and resolves when it has been handled. An attached coroutine function is awaited
+        directly. Otherwise the update goes through :py:meth:`ptbtest.Mockbot.insertUpdate` in an executor, so the
+        event loop keeps running while the updater threads handle it.
+
+        Args:
+            update (telegram.Update): The update to insert.
+            timeout (Optional[float]): Seconds to wait for the update to be handled. Defaults to the
+                ``update_timeout`` of the Mockbot.
+
+        Returns:
+            bool: False if the update was not handled in time, True otherwise.
+        """
+        if timeout is None:
+            timeout = self.mockbot.update_timeout
+        if self._handler is None:
+            loop = asyncio.get_event_loop()
+            return await loop.run_in_executor(
+                None, functools.partial(self.mockbot.insertUpdate, update, timeout))
+        update_id = getattr(update, 'update_id', None)
+        response_times = self.mockbot.response_times
+        self.mockbot.message_store.add_update(update)
+        if response_times is not None:
+            response_times.inserted(update, self.mockbot._time())
+        # the task running the handler copies the context, so its calls are tagged with this update
+        token = set_update_id(update_id)
+        try:
+            await asyncio.wait_for(self._handle(update), timeout)
+        except asyncio.TimeoutError:
+            logger.warning('Update %s was not processed within %s seconds',
+                           getattr(update, 'update_id', update), timeout)
+            return False
+        finally:
+            reset_update_id(token)
+        return True
+
+    async def _handle(self, update):
+        # runs in a task of its own, with a clock the latency of its calls only makes the time of this task late
+        self.mockbot._lag.set(0)
+        try:
+            await self._handler(self, update)
+        finally:
+            if self.mockbot.response_times is not None:
+                self.mockbot.response_times.processed(getattr(update, 'update_id', None), self.mockbot._time())
+
+    async def insert_updates(self, updates, wait=False, timeout=None):
+        """
+        Inserts many updates at once. An attached coroutine function is started for every update, and awaited
+        with ``wait``. Otherwise the updates go through :py:meth:`ptbtest.Mockbot.insertUpdates`.
+
+        Args:
+            updates (iterable(telegram.Update)): The updates to insert, a list or a generator.
+            wait (Optional[bool]): Resolve only when every update has been handled. Defaults to False.
+            timeout (Optional[float]): Seconds to wait for each update. Defaults to the ``update_timeout`` of the
+                Mockbot.
+
+        Returns:
+            bool: False if an update was not handled in time, True otherwise.
+        """
+        if self._handler is None:
+            call = functools.partial(self.mockbot.insertUpdates, updates, wait, timeout)
+            return await asyncio.get_event_loop().run_in_executor(None, call)
+        tasks = [asyncio.ensure_future(self.insert_update(update, timeout)) for update in updates]
+        if not wait:
+            return True
+        return all(await asyncio.gather(*tasks))
+
+    async def getUpdates(self, offset=None, limit=100, timeout=0, **kwargs):
+        """
+        Awaitable :py:meth:`ptbtest.Mockbot.getUpdates`. A long poll waits in an executor instead of blocking the
+        event loop.
+        """
+        if not timeout:
+            await self._delay('getUpdates')
+            return self.mockbot._undelayed('getUpdates', offset, limit, timeout, **kwargs)
+        call = functools.partial(self.mockbot.getUpdates, offset, limit, timeout, **kwargs)
+        return await asyncio.get_event_loop().run_in_executor(None, call)
+
+    async def _delay(self, method):
+        # the latency of the Mockbot, without blocking the event loop
+        latency = self.mockbot.latency
+        seconds = latency.sample(method) if latency is not None else 0
+        if not seconds:
+            return
+        if self.mockbot.clock is None:
+            await asyncio.sleep(seconds)
+        elif method != 'getUpdates':
+            # concurrent calls wait at the same time, so they overlap instead of moving the shared clock one
+            # after another
+            self.mockbot._fall_behind(seconds)
+            await asyncio.sleep(0)
+
+    get_updates = getUpdates
+    insertUpdate = insert_update
+    insertUpdates = insert_updates
+
+
+def _awaitable(name):
+    async def method(self, *args, **kwargs):
+        # like the Mockbot, getMe is answered from the cached identity without latency
+        if name != 'getMe':
+            await self._delay(name)
+        return self.mockbot._undelayed(name, *args, **kwargs)
+
+    method.__name__ = name
+    method.__doc__ = 'Awaitable :py:meth:`ptbtest.Mockbot.{0}`.'.format(name)
+    return method
+
+
+for _name in Mockbot.API_METHODS:
+    if _name != 'getUpdates':
+        setattr(AsyncMockbot, _name, _awaitable(_name))
+
+# snake_case (PEP8) aliases, taken from the Mockbot so both stay in line
+for _name, _value in list(vars(Mockbot).items()):
+    if '_' in _name and not _name.startswith('_') and callable(_value) \
+            and _value.__name__ != _name and hasattr(AsyncMockbot, _value.__name__):
+        setattr(AsyncMockbot, _name, getattr(AsyncMockbot, _value.__name__))
@@ -0,0 +1,242 @@
+#!/usr/bin/env python
+# pylint: disable=E0611,E0213,E1102,C0103,E1101,W0613,R0913,R0904
+#
+# A library that provides a testing suite fot python-telegram-bot
+# wich can be found on https://github.com/python-telegram-bot/python-telegram-bot
+# Copyright (C) 2017
+# Pieter Schutz - https://github.com/eldinnie
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser Public License for more details.
+#
+# You should have received a copy of the GNU Lesser Public License
+# along with this program.  If not, see [http://www.gnu.org/licenses/].
+"""This module provides a local http server answering Bot API requests with a Mockbot"""
+import json
+import logging
+import threading
+
+from telegram import TelegramObject
+from telegram.error import (RetryAfter, TelegramError)
+
+from .mockbot import Mockbot
+
+try:
+    from http.server import (BaseHTTPRequestHandler, HTTPServer)
+    from socketserver import ThreadingMixIn
+    from urllib.parse import parse_qsl
+except ImportError:
+    from BaseHTTPServer import (BaseHTTPRequestHandler, HTTPServer)
+    from SocketServer import ThreadingMixIn
+    from urlparse import parse_qsl
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+
+class BotApiServer(object):
+    """
+    A local http server speaking the telegram Bot API for the methods the :py:class:`ptbtest.Mockbot` implements.
+    Requests are handed to a Mockbot, so everything sent through the server ends up in its ``sent_messages`` and
+    updates inserted in it are returned to ``getUpdates``. A normal :py:class:`telegram.Bot` pointed at
+    :py:attr:`base_url` goes through its complete request and serialization path without any network.
+
+    Examples:
+        Running an unmodified updater against the server::
+
+            server = BotApiServer().start()
+            bot = telegram.Bot("123:token", base_url=server.base_url)
+            updater = Updater(bot=bot)
+            server.bot.attach(updater)
+            updater.start_polling()
+            server.bot.insertUpdate(MessageGenerator(server.bot).get_message(text="/start"))
+            server.bot.sent_messages
+            updater.stop()
+            server.stop()
+
+    Args:
+        bot (Optional[ptbtest.Mockbot]): The Mockbot answering the requests. Defaults to a new one.
+        host (Optional[str]): Address to listen on. Defaults to ``127.0.0.1``.
+        port (Optional[int]): Port to listen on. Defaults to a free port.
+
+    Attributes:
+        bot (ptbtest.Mockbot): The Mockbot answering the requests.
+    """
+
+    METHODS = Mockbot.API_METHODS
+
+    def __init__(self, bot=None, host='127.0.0.1', port=0):
+        self.bot = bot if bot is not None else Mockbot()
+        self.host = host
+        self.port = port
+        self._httpd = None
+        self._thread = None
+
+    @property
+    def base_url(self):
+        """str: The ``base_url`` to create a :py:class:`telegram.Bot` with."""
+        return 'http://{0}:{1}/bot'.format(self.host, self.port)
+
+    def start(self):
+        """
+        Starts serving in a background thread.
+
+        Returns:
+            BotApiServer: This server.
+        """
+        self._httpd = _BotApiHTTPServer((self.host, self.port), _BotApiHandler, self)
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._httpd.serve_forever,
+                                        name='BotApiServer')
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stops serving and closes the socket."""
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._thread.join()
+            self._httpd = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def call(self, method, params):
+        """
+        Answers one Bot API call.
+
+        Args:
+            method (str): Name of the Bot API method.
+            params (dict): Its parameters.
+
+        Returns:
+            tuple: The HTTP status and the response as a dict, like ``(200, {'ok': True, 'result': ...})``.
+        """
+        if method not in self.METHODS and method not in ('deleteWebhook', 'getWebhookInfo'):
+            return 404, {'ok': False, 'error_code': 404, 'description': 'Not Found'}
+        try:
+            # the Mockbot is thread safe, so requests are answered in parallel like telegram does
+            if method in self.METHODS:
+                result = getattr(self.bot, method)(**params)
+            else:
+                result = None
+            if result is None:
+                result = self._default_result(method, params)
+        except RetryAfter as e:
+            return 429, {'ok': False, 'error_code': 429,
+                         'description': 'Too Many Requests: retry after {0:g}'.format(e.retry_after),
+                         'parameters': {'retry_after': e.retry_after}}
+        except (TelegramError, TypeError, ValueError) as e:
+            return 400, {'ok': False, 'error_code': 400,
+                         'description': 'Bad Request: {0}'.format(e)}
+        except Exception as e:
+            # answer instead of dropping the connection, the client would only see a network error
+            logger.exception("Error answering %s", method)
+            return 500, {'ok': False, 'error_code': 500,
+                         'description': 'Internal Server Error: {0}'.format(e)}
+        return 200, {'ok': True, 'result': _to_result(result)}
+
+    def _default_result(self, method, params):
+        # Mockbot only records these calls, answer them like telegram would for an unremarkable chat
+        if method == 'getChat':
+            return self.bot.cg.get_chat(cid=params['chat_id'])
+        if method == 'getChatMember':
+            return {'user': self.bot.mg.ug.get_user(id=params['user_id']).to_dict(),
+                    'status': 'member'}
+        if method == 'getChatAdministrators':
+            return []
+        if method == 'getChatMembersCount':
+            return 1
+        if method == 'getFile':
+            return {'file_id': params['file_id'], 'file_size': 0,
+                    'file_path': 'files/{0}'.format(params['file_id'])}
+        if method == 'getUserProfilePhotos':
+            return {'total_count': 0, 'photos': []}
+        if method == 'getGameHighScores':
+            return []
+        if method == 'getWebhookInfo':
+            return {'url': '', 'has_custom_certificate': False,
+                    'pending_update_count': 0}
+        return True
+
+
+def _to_result(result):
+    if isinstance(result, TelegramObject):
+        return result.to_dict()
+    if isinstance(result, (list, tuple)):
+        return [_to_result(x) for x in result]
+    return result
+
+
+def _parse_params(query):
+    # form and query values are all strings, decode those that are json like telegram does
+    params = {}
+    for key, value in parse_qsl(query):
+        try:
+            params[key] = json.loads(value)
+        except ValueError:
+            params[key] = value
+    return params
+
+
+class _BotApiHTTPServer(ThreadingMixIn, HTTPServer, object):
+    daemon_threads = True
+
+    def __init__(self, server_address, RequestHandlerClass, api):
+        super(_BotApiHTTPServer, self).__init__(server_address, RequestHandlerClass)
+        self.api = api
+
+
+class _BotApiHandler(BaseHTTPRequestHandler, object):
+    protocol_version = 'HTTP/1.1'
+    server_version = 'ptbtest/BotApiServer'
+
+    def do_GET(self):
+        path, _, query = self.path.partition('?')
+        parts = path.strip('/').split('/')
+        length = int(self.headers.get('content-length') or 0)
+        body = self.rfile.read(length).decode('utf-8') if length else ''
+        if len(parts) != 2 or not parts[0].startswith('bot'):
+            return self._respond(404, {'ok': False, 'error_code': 404, 'description': 'Not Found'})
+        params = _parse_params(query)
+        content_type = self.headers.get('content-type') or ''
+        if body:
+            if content_type.startswith('application/json'):
+                try:
+                    params.update(json.loads(body))
+                except ValueError:
+                    return self._respond(400, {'ok': False, 'error_code': 400,
+                                               'description': 'Bad Request: the request is not valid json'})
+            elif content_type.startswith('application/x-www-form-urlencoded'):
+                params.update(_parse_params(body))
+            else:
+                return self._respond(400, {
+                    'ok': False, 'error_code': 400,
+                    'description': 'Bad Request: only json and form encoded requests are supported'})
+        status, response = self.server.api.call(parts[1], params)
+        self._respond(status, response)
+
+    do_POST = do_GET
+
+    def _respond(self, status, response):
+        body = json.dumps(response).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(format, *args)
@@ -19,8 +19,6 @@
 # You should have received a copy of the GNU Lesser Public License
 # along with this program.  If not, see [http://www.gnu.org/licenses/].
 """This module provides a class to generate telegram callback queries"""
-import uuid
-
 from .updategenerator import update
 from .ptbgenerator import PtbGenerator
 from ptbtest import (ChatGenerator, MessageGenerator, Mockbot, UserGenerator)
@@ -38,17 +36,21 @@ class CallbackQueryGenerator(PtbGenerator):
 
         Args:
             bot (Optional[ptbtest.Mockbot]): supply your own for a custom botname
+            seed (Optional[int or random.Random]): Seed or random source for the generated users and ids, see
+                :py:class:`ptbtest.ptbgenerator.PtbGenerator`.
+            ids (Optional[ptbtest.ids.IdSpace]): The user ids to hand out. Defaults to those of ``bot``.
     """
 
-    def __init__(self, bot=None):
-        PtbGenerator.__init__(self)
-        self.ug = UserGenerator()
+    def __init__(self, bot=None, seed=None, ids=None):
         if not bot:
-            self.bot = Mockbot()
-        elif isinstance(bot, Mockbot):
-            self.bot = bot
-        else:
+            bot = Mockbot(seed=seed)
+        elif not isinstance(bot, Mockbot):
             raise BadBotException
+        # users and chats share the ids of the bot so they are never generated twice
+        mg = getattr(bot, 'mg', None)
+        PtbGenerator.__init__(self, seed, ids if ids is not None or mg is None else mg.ids)
+        self.bot = bot
+        self.ug = UserGenerator(registry=self.bot.registry, seed=self.random, ids=self.ids)
 
     @update("callback_query")
     def get_callback_query(self,
@@ -91,8 +93,9 @@ class CallbackQueryGenerator(PtbGenerator):
             if isinstance(message, Message):
                 pass
             elif isinstance(message, bool):
-                chat = ChatGenerator().get_chat(user=user)
-                message = MessageGenerator().get_message(
+                # the message ids of the bot, a message of its own would replace one in its message_store
+                chat = ChatGenerator(seed=self.random, ids=self.ids).get_chat(user=user)
+                message = MessageGenerator(bot=self.bot, seed=self.random, ids=self.ids).get_message(
                     user=self.bot.getMe(), chat=chat,
                     bot=self.bot.getMe()).message
             else:
@@ -119,4 +122,4 @@ class CallbackQueryGenerator(PtbGenerator):
                              self.bot)
 
     def _gen_id(self):
-        return str(uuid.uuid4())
+        return self.gen_uuid()
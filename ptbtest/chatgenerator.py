@@ -19,8 +19,6 @@
 # You should have received a copy of the GNU Lesser Public License
 # along with this program.  If not, see [http://www.gnu.org/licenses/].
 """This module provides a class to generate telegram chats"""
-import random
-
 from .ptbgenerator import PtbGenerator
 from ptbtest import UserGenerator
 from telegram import (Chat, User)
@@ -36,8 +34,10 @@ class ChatGenerator(PtbGenerator):
         "Flirty Crowns", "My Amigos"
     ]
 
-    def __init__(self):
-        PtbGenerator.__init__(self)
+    def __init__(self, registry=None, seed=None, ids=None):
+        PtbGenerator.__init__(self, seed, ids)
+        self.registry = registry
+        self.ug = UserGenerator(registry=registry, seed=self.random, ids=self.ids)
 
     def get_chat(self,
                  cid=None,
@@ -54,7 +54,12 @@ class ChatGenerator(PtbGenerator):
         When called without arguments will return a telegram.Chat object for a private chat with a randomly
         generated user.
 
+        With a registry, asking for a known cid returns the registered chat and every generated chat is
+        registered. When a different type is asked for than the known chat has, a chat of that type is generated
+        but the registered chat is kept.
+
         Args:
+            cid (Optional[int]): Id for the chat. A negative id makes a private chat a group.
             type (str): Type of chat can be private, group, supergroup or channel.
             title (Optional[str]): Title  for the group/supergroup/channel/
             username (Optional[str]): Username for the private/supergroup/channel.
@@ -65,12 +70,29 @@ class ChatGenerator(PtbGenerator):
             telegram.Chat: A telegram Chat object.
 
         """
+        known = None
+        if cid and self.registry is not None:
+            known = self.registry.get_chat(cid)
+            if known and type in ("private", known.type):
+                return known
+        if cid:
+            self.ids.reserve(cid)
+        chat = self._generate_chat(cid, type, title, username, user,
+                                   all_members_are_administrators)
+        if chat and self.registry is not None and known is None:
+            self.registry.add_chat(chat)
+        return chat
+
+    def _generate_chat(self, cid, type, title, username, user,
+                       all_members_are_administrators):
         if cid and type == 'private':
             if cid < 0:
                 type = "group"
         if user:
             if isinstance(user, User):
                 u = user
+                if self.registry is not None:
+                    self.registry.add_user(u)
                 return Chat(
                     cid or u.id,
                     type,
@@ -78,7 +100,7 @@ class ChatGenerator(PtbGenerator):
                     first_name=u.first_name,
                     last_name=u.last_name)
         elif type == "private":
-            u = UserGenerator().get_user(username=username)
+            u = self.ug.get_user(username=username, id=cid)
             return Chat(
                 cid or u.id,
                 type,
@@ -87,7 +109,7 @@ class ChatGenerator(PtbGenerator):
                 last_name=u.last_name)
         elif type == "group":
             if not title:
-                title = random.choice(self.GROUPNAMES)
+                title = self.random.choice(self.GROUPNAMES)
             return Chat(
                 cid or self.gen_id(group=True),
                 type,
@@ -95,7 +117,7 @@ class ChatGenerator(PtbGenerator):
                 all_members_are_administrators=all_members_are_administrators)
         elif type == "supergroup" or type == "channel":
             if not title:
-                gn = random.choice(self.GROUPNAMES)
+                gn = self.random.choice(self.GROUPNAMES)
             else:
                 gn = title
             if not username:
@@ -0,0 +1,215 @@
+#!/usr/bin/env python
+# pylint: disable=E0611,E0213,E1102,C0103,E1101,W0613,R0913,R0904
+#
+# A library that provides a testing suite fot python-telegram-bot
+# wich can be found on https://github.com/python-telegram-bot/python-telegram-bot
+# Copyright (C) 2017
+# Pieter Schutz - https://github.com/eldinnie
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser Public License for more details.
+#
+# You should have received a copy of the GNU Lesser Public License
+# along with this program.  If not, see [http://www.gnu.org/licenses/].
+"""This module ties the calls of a Mockbot to the update being handled and times the handling of updates"""
+import array
+import collections
+import threading
+
+from .metrics import percentile
+
+try:
+    import contextvars
+except ImportError:
+    contextvars = None
+
+if contextvars is not None:
+    # a context variable follows asyncio tasks as well as threads
+    _current = contextvars.ContextVar('ptbtest_update_id', default=None)
+else:
+    _local = threading.local()
+
+UPDATE_TYPES = ('message', 'edited_message', 'channel_post', 'edited_channel_post', 'inline_query',
+                'chosen_inline_result', 'callback_query', 'shipping_query', 'pre_checkout_query')
+PERCENTILES = (50, 95, 99)
+
+
+def current_update_id():
+    """
+    Returns:
+        int: The ``update_id`` handled in this thread or asyncio task, None outside of a handler.
+    """
+    if contextvars is not None:
+        return _current.get()
+    return getattr(_local, 'update_id', None)
+
+
+def set_update_id(update_id):
+    """
+    Marks ``update_id`` as handled in this thread or asyncio task. Before python 3.7 there are no context variables
+    and the mark is per thread, so asyncio tasks sharing a thread share it.
+
+    Returns:
+        object: The token to pass to :py:func:`reset_update_id` when done.
+    """
+    if contextvars is not None:
+        return _current.set(update_id)
+    token = getattr(_local, 'update_id', None)
+    _local.update_id = update_id
+    return token
+
+
+def reset_update_id(token):
+    """Restores the ``update_id`` that was handled before the :py:func:`set_update_id` returning ``token``."""
+    if contextvars is not None:
+        _current.reset(token)
+    else:
+        _local.update_id = token
+
+
+class ContextValue(object):
+    """
+    A value of its own for every thread and asyncio task. Before python 3.7 there are no context variables and
+    the value is per thread, so asyncio tasks sharing a thread share it.
+
+    Args:
+        name (str): Name of the context variable.
+        default: Value until one is set.
+    """
+
+    def __init__(self, name, default=None):
+        self.default = default
+        if contextvars is not None:
+            self._var = contextvars.ContextVar(name)
+        else:
+            self._local = threading.local()
+
+    def get(self):
+        if contextvars is not None:
+            return self._var.get(self.default)
+        return getattr(self._local, 'value', self.default)
+
+    def set(self, value):
+        if contextvars is not None:
+            self._var.set(value)
+        else:
+            self._local.value = value
+
+
+def update_type(update):
+    """
+    Returns:
+        str: The kind of ``update``, like ``message`` or ``callback_query``, None if unknown.
+    """
+    for name in UPDATE_TYPES:
+        if getattr(update, name, None) is not None:
+            return name
+    return None
+
+
+class ResponseTimes(object):
+    """
+    How long a bot takes to answer its updates. For every update it times the first call the bot makes while
+    handling it (``first_response``) and the moment its handlers are done (``handling``), both from when the
+    update was inserted, or from when the dispatcher picked it up for updates that were not inserted in the
+    :py:class:`ptbtest.Mockbot`, like those posted to a webhook.
+
+    Pass ``response_times=True`` or an instance of this class to the Mockbot to collect them. Updates are only
+    known to be done when the Mockbot is attached to their dispatcher, see :py:meth:`ptbtest.Mockbot.attach`.
+
+    Examples:
+        The 95th percentile of the time to the first answer to callback queries::
+
+            bot = Mockbot(response_times=True)
+            bot.attach(updater)
+            ...
+            bot.response_times.report()['callback_query']['first_response']['p95']
+
+    Args:
+        max_updates (Optional[int]): Only keep the times of the last this many updates in :py:attr:`updates`.
+            The percentiles always count every update. Defaults to unbounded.
+    """
+
+    def __init__(self, max_updates=None):
+        self.updates = collections.deque(maxlen=max_updates)
+        self._pending = {}
+        self._first_response = {}
+        self._handling = {}
+        self._lock = threading.Lock()
+
+    def inserted(self, update, now):
+        """Starts timing ``update``."""
+        update_id = getattr(update, 'update_id', None)
+        if update_id is None:
+            return
+        with self._lock:
+            self._pending[update_id] = [now, update_type(update), None]
+
+    def started(self, update, now):
+        """Starts timing ``update`` when it was not inserted."""
+        update_id = getattr(update, 'update_id', None)
+        if update_id is None:
+            return
+        with self._lock:
+            if update_id not in self._pending:
+                self._pending[update_id] = [now, update_type(update), None]
+
+    def responded(self, update_id, now):
+        """Notes a call made while handling ``update_id``."""
+        with self._lock:
+            pending = self._pending.get(update_id)
+            if pending is not None and pending[2] is None:
+                pending[2] = now
+
+    def processed(self, update_id, now):
+        """Stops timing ``update_id``."""
+        with self._lock:
+            pending = self._pending.pop(update_id, None)
+            if pending is None:
+                return
+            start, kind, first = pending
+            first = None if first is None else first - start
+            handling = now - start
+            self.updates.append((update_id, kind, first, handling))
+            for key in (kind or 'other', 'all'):
+                if first is not None:
+                    self._first_response.setdefault(key, array.array('d')).append(first)
+                self._handling.setdefault(key, array.array('d')).append(handling)
+
+    def reset(self):
+        """Forgets every timed update."""
+        with self._lock:
+            self.updates.clear()
+            self._pending.clear()
+            self._first_response.clear()
+            self._handling.clear()
+
+    def report(self):
+        """
+        Returns:
+            dict: Per update type (``other`` for those of an unknown type) and for all updates as ``all``: the
+            number of handled updates as ``count``, the number that made no call as ``unanswered`` and the ``p50``,
+            ``p95`` and ``p99`` in seconds of ``first_response`` and ``handling``.
+        """
+        with self._lock:
+            times = dict((kind, (sorted(self._first_response.get(kind, ())), sorted(handling)))
+                         for kind, handling in self._handling.items())
+        report = {}
+        for kind, (first, handling) in times.items():
+            report[kind] = {
+                'count': len(handling),
+                'unanswered': len(handling) - len(first),
+                'first_response': _percentiles(first),
+                'handling': _percentiles(handling)}
+        return report
+
+
+def _percentiles(values):
+    return dict(('p{0}'.format(p), percentile(values, p)) for p in PERCENTILES)
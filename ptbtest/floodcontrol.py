@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+# pylint: disable=E0611,E0213,E1102,C0103,E1101,W0613,R0913,R0904
+#
+# A library that provides a testing suite fot python-telegram-bot
+# wich can be found on https://github.com/python-telegram-bot/python-telegram-bot
+# Copyright (C) 2017
+# Pieter Schutz - https://github.com/eldinnie
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser Public License for more details.
+#
+# You should have received a copy of the GNU Lesser Public License
+# along with this program.  If not, see [http://www.gnu.org/licenses/].
+"""This module provides a simulation of the flood limits telegram puts on bots"""
+import math
+import threading
+
+from telegram.error import RetryAfter
+
+
+class TokenBucket(object):
+    """
+    Allows ``rate`` events per second on average and bursts of up to ``capacity`` events.
+
+    Args:
+        rate (float): Tokens added per second.
+        capacity (float): Most tokens the bucket holds. It starts full.
+        now (float): The current time in seconds.
+    """
+    __slots__ = ('rate', 'capacity', 'tokens', 'last')
+
+    def __init__(self, rate, capacity, now):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last = now
+
+    def refill(self, now):
+        if now > self.last:
+            self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+
+    def wait(self):
+        """
+        Returns:
+            float: Seconds until a token is available, 0 if there is one now.
+        """
+        # refilling in small steps can leave the tokens a rounding error short of a whole one
+        if self.tokens >= 1 - 1e-9:
+            return 0.
+        return (1 - self.tokens) / self.rate
+
+    @property
+    def full(self):
+        return self.tokens >= self.capacity
+
+
+class FloodControl(object):
+    """
+    The flood limits of telegram as token buckets: about 30 messages per second for the whole bot, 1 per second
+    in a chat and 20 per minute in a group. A message is only allowed when every bucket it falls in has a token,
+    otherwise :py:class:`telegram.error.RetryAfter` is raised with the whole seconds to wait, like telegram does.
+
+    Pass ``flood_control=True`` or an instance of this class to :py:class:`ptbtest.Mockbot` to enable it. The Mockbot
+    checks every method sending or editing a message before recording it, so a throttled call does not end up in
+    ``sent_messages``.
+
+    Args:
+        global_rate (Optional[float]): Messages per second for the whole bot. Defaults to 30.
+        chat_rate (Optional[float]): Messages per second in one chat. Defaults to 1.
+        group_rate (Optional[float]): Messages per second in one group, supergroup or channel. Defaults to 20 per
+            minute.
+        global_burst (Optional[float]): Messages the bot may send at once. Defaults to ``global_rate``.
+        chat_burst (Optional[float]): Messages that may be sent at once to one chat. Defaults to 1.
+        group_burst (Optional[float]): Messages that may be sent at once to one group. Defaults to 20.
+    """
+
+    SCOPES = ('global', 'chat', 'group')
+    PRUNE_SIZE = 10000
+
+    def __init__(self, global_rate=30., chat_rate=1., group_rate=20 / 60.,
+                 global_burst=None, chat_burst=1., group_burst=20.):
+        self.global_rate = global_rate
+        self.chat_rate = chat_rate
+        self.group_rate = group_rate
+        self.global_burst = global_rate if global_burst is None else global_burst
+        self.chat_burst = chat_burst
+        self.group_burst = group_burst
+        self._global = None
+        self._chats = {}
+        self._groups = {}
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        """Sets the counters of :py:attr:`stats` back to zero."""
+        self._allowed = 0
+        self._throttled = dict((scope, 0) for scope in self.SCOPES)
+        self._throttled_total = 0
+        self._max_retry_after = 0.
+
+    @property
+    def stats(self):
+        """
+        dict: ``allowed`` and ``throttled`` messages, ``throttled_by`` with the throttled messages per bucket that
+        was empty (``global``, ``chat`` or ``group``) and the longest exact wait as ``max_retry_after``.
+        """
+        with self._lock:
+            return {'allowed': self._allowed,
+                    'throttled': self._throttled_total,
+                    'throttled_by': dict(self._throttled),
+                    'max_retry_after': self._max_retry_after}
+
+    def _bucket(self, buckets, key, rate, capacity, now):
+        bucket = buckets.get(key)
+        if bucket is None:
+            if len(buckets) >= self.PRUNE_SIZE:
+                self._prune(buckets, now)
+            bucket = buckets[key] = TokenBucket(rate, capacity, now)
+        else:
+            bucket.refill(now)
+        return bucket
+
+    @staticmethod
+    def _prune(buckets, now):
+        # a full bucket is the same as a new one
+        for key in list(buckets):
+            bucket = buckets[key]
+            bucket.refill(now)
+            if bucket.full:
+                del buckets[key]
+
+    def acquire(self, chat_id, group, now):
+        """
+        Takes a token for a message, raising when there is none.
+
+        Args:
+            chat_id (int or str): The chat the message goes to, None for inline messages.
+            group (bool): Whether the chat is a group, supergroup or channel.
+            now (float): The current time in seconds.
+
+        Raises:
+            telegram.error.RetryAfter: When a bucket is empty.
+        """
+        with self._lock:
+            if self._global is None:
+                self._global = TokenBucket(self.global_rate, self.global_burst, now)
+            self._global.refill(now)
+            buckets = [('global', self._global)]
+            if chat_id is not None:
+                buckets.append(('chat', self._bucket(self._chats, chat_id, self.chat_rate,
+                                                     self.chat_burst, now)))
+                if group:
+                    buckets.append(('group', self._bucket(self._groups, chat_id, self.group_rate,
+                                                          self.group_burst, now)))
+            waits = [(bucket.wait(), scope) for scope, bucket in buckets]
+            wait, scope = max(waits)
+            if wait > 0:
+                self._throttled[scope] += 1
+                self._throttled_total += 1
+                self._max_retry_after = max(self._max_retry_after, wait)
+                raise RetryAfter(int(math.ceil(wait)))
+            for _, bucket in buckets:
+                bucket.tokens = max(bucket.tokens - 1, 0.)
+            self._allowed += 1
@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+# pylint: disable=E0611,E0213,E1102,C0103,E1101,W0613,R0913,R0904
+#
+# A library that provides a testing suite fot python-telegram-bot
+# wich can be found on https://github.com/python-telegram-bot/python-telegram-bot
+# Copyright (C) 2017
+# Pieter Schutz - https://github.com/eldinnie
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser Public License for more details.
+#
+# You should have received a copy of the GNU Lesser Public License
+# along with this program.  If not, see [http://www.gnu.org/licenses/].
+"""This module provides allocators handing out unique ids"""
+import random
+import threading
+
+try:
+    from math import gcd
+except ImportError:
+    from fractions import gcd
+
+
+class IdCounter(object):
+    """
+    A thread safe counter handing out increasing ids, used for update and message ids. It is an iterator, so
+    ``next(counter)`` returns the next id, and any number of threads can take ids at once without getting the same
+    one twice.
+
+    Args:
+        start (Optional[int]): The first id. Defaults to 1.
+    """
+
+    def __init__(self, start=1):
+        self._next = start
+        self._lock = threading.Lock()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        with self._lock:
+            value = self._next
+            self._next += 1
+        return value
+
+    next = __next__
+
+    @property
+    def last(self):
+        """int: The last id handed out."""
+        return self._next - 1
+
+
+class IdAllocator(object):
+    """
+    Hands out every id between ``low`` and ``high`` at most once, in a scrambled order so they still look random.
+    The n-th id is ``low + (a * n + b) % size`` for an ``a`` without common factors with the size of the range,
+    which visits every id in the range exactly once, so no memory is needed to remember the ids handed out.
+
+    The ids can be split between worker processes: worker ``k`` of ``workers`` only takes every n-th id with
+    ``n % workers == k``. Workers never collide as long as they use the same ``seed``.
+
+    Args:
+        low (int): Lowest id.
+        high (int): Highest id.
+        seed (Optional[int or random.Random]): Seed or random source for the order of the ids. Defaults to a
+            random order, or a fixed one when the ids are split between workers.
+        worker (Optional[int]): Number of this worker, from 0. Defaults to 0.
+        workers (Optional[int]): Number of workers sharing the range. Defaults to 1.
+    """
+
+    def __init__(self, low, high, seed=None, worker=0, workers=1):
+        if high < low:
+            raise ValueError("high must not be lower than low")
+        if not 0 <= worker < workers:
+            raise ValueError("worker must be between 0 and workers - 1")
+        if seed is None and workers > 1:
+            seed = 0
+        rng = seed if isinstance(seed, random.Random) else random.Random(seed)
+        self.low = low
+        self.size = high - low + 1
+        self.worker = worker
+        self.workers = workers
+        self._a = 1
+        if self.size > 2:
+            self._a = rng.randrange(2, self.size)
+            while gcd(self._a, self.size) != 1:
+                self._a = rng.randrange(2, self.size)
+        self._b = rng.randrange(self.size)
+        self._next = 0
+        self._reserved = set()
+        self._lock = threading.Lock()
+
+    def __contains__(self, id):
+        return 0 <= id - self.low < self.size
+
+    def reserve(self, id):
+        """Makes sure ``id``, taken without the allocator, is never handed out."""
+        if id in self:
+            with self._lock:
+                self._reserved.add(id)
+
+    def allocate(self):
+        """
+        Returns:
+            int: An id that was not handed out or reserved before.
+
+        Raises:
+            ValueError: When all ids of this worker have been handed out.
+        """
+        with self._lock:
+            while True:
+                n = self._next * self.workers + self.worker
+                if n >= self.size:
+                    raise ValueError("all ids between {0} and {1} are taken".format(
+                        self.low, self.low + self.size - 1))
+                self._next += 1
+                id = self.low + (self._a * n + self._b) % self.size
+                if id not in self._reserved:
+                    return id
+                self._reserved.discard(id)
+
+
+class IdSpace(object):
+    """
+    The user and group ids of a generator context, in the ranges telegram uses. Generators created for a
+    :py:class:`ptbtest.Mockbot` share the id space of the bot, so the users and chats they generate never share an
+    id. Give every worker process its own slice of the ids with ``worker`` and ``workers``.
+
+    Examples:
+        Worker 3 of 32 in a load test::
+
+            bot = Mockbot(ids=IdSpace(seed=1234, worker=3, workers=32))
+
+    Args:
+        seed (Optional[int or random.Random]): Seed or random source for the order of the ids, the same for all
+            workers.
+        worker (Optional[int]): Number of this worker, from 0. Defaults to 0.
+        workers (Optional[int]): Number of workers sharing the ids. Defaults to 1.
+
+    Attributes:
+        users (ptbtest.ids.IdAllocator): Ids of users and their private chats.
+        groups (ptbtest.ids.IdAllocator): Ids of groups.
+    """
+
+    USER_IDS = (10000, 99999999)
+    GROUP_IDS = (-99999999, -222222)
+
+    def __init__(self, seed=None, worker=0, workers=1):
+        if seed is None and workers > 1:
+            seed = 0
+        rng = seed if isinstance(seed, random.Random) else random.Random(seed)
+        self.users = IdAllocator(self.USER_IDS[0], self.USER_IDS[1], rng, worker, workers)
+        self.groups = IdAllocator(self.GROUP_IDS[0], self.GROUP_IDS[1], rng, worker, workers)
+
+    def gen_id(self, group=False):
+        """
+        Returns:
+            int: A new group id if ``group`` is True, a new user id otherwise.
+        """
+        return (self.groups if group else self.users).allocate()
+
+    def reserve(self, id):
+        """Makes sure an id given to a generator is not handed out later."""
+        self.users.reserve(id)
+        self.groups.reserve(id)
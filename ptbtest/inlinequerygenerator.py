@@ -19,8 +19,6 @@
 # You should have received a copy of the GNU Lesser Public License
 # along with this program.  If not, see [http://www.gnu.org/licenses/].
 """This module provides a class to generate telegram callback queries"""
-import uuid
-
 from telegram import ChosenInlineResult
 from .updategenerator import update
 from .ptbgenerator import PtbGenerator
@@ -38,17 +36,21 @@ class InlineQueryGenerator(PtbGenerator):
 
         Args:
             bot (Optional[ptbtest.Mockbot]): supply your own for a custom botname
+            seed (Optional[int or random.Random]): Seed or random source for the generated users, locations and
+                ids, see :py:class:`ptbtest.ptbgenerator.PtbGenerator`.
+            ids (Optional[ptbtest.ids.IdSpace]): The user ids to hand out. Defaults to those of ``bot``.
     """
 
-    def __init__(self, bot=None):
-        PtbGenerator.__init__(self)
-        self.ug = UserGenerator()
+    def __init__(self, bot=None, seed=None, ids=None):
         if not bot:
-            self.bot = Mockbot()
-        elif isinstance(bot, Mockbot):
-            self.bot = bot
-        else:
+            bot = Mockbot(seed=seed)
+        elif not isinstance(bot, Mockbot):
             raise BadBotException
+        # users and chats share the ids of the bot so they are never generated twice
+        mg = getattr(bot, 'mg', None)
+        PtbGenerator.__init__(self, seed, ids if ids is not None or mg is None else mg.ids)
+        self.bot = bot
+        self.ug = UserGenerator(registry=self.bot.registry, seed=self.random, ids=self.ids)
 
     @update("inline_query")
     def get_inline_query(self,
@@ -90,9 +92,8 @@ class InlineQueryGenerator(PtbGenerator):
             if isinstance(location, Location):
                 pass
             elif isinstance(location, bool):
-                import random
                 location = Location(
-                    random.uniform(-180, 180), random.uniform(-90, 90))
+                    self.random.uniform(-180, 180), self.random.uniform(-90, 90))
             else:
                 raise AttributeError(
                     "Location must be either telegram.Location or True")
@@ -143,9 +144,8 @@ class InlineQueryGenerator(PtbGenerator):
             if isinstance(location, Location):
                 pass
             elif isinstance(location, bool):
-                import random
                 location = Location(
-                    random.uniform(-180, 180), random.uniform(-90, 90))
+                    self.random.uniform(-180, 180), self.random.uniform(-90, 90))
             else:
                 raise AttributeError(
                     "Location must be either telegram.Location or True")
@@ -161,4 +161,4 @@ class InlineQueryGenerator(PtbGenerator):
             inline_message_id=inline_message_id)
 
     def _gen_id(self):
-        return str(uuid.uuid4())
+        return self.gen_uuid()
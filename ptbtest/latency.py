@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+# pylint: disable=E0611,E0213,E1102,C0103,E1101,W0613,R0913,R0904
+#
+# A library that provides a testing suite fot python-telegram-bot
+# wich can be found on https://github.com/python-telegram-bot/python-telegram-bot
+# Copyright (C) 2017
+# Pieter Schutz - https://github.com/eldinnie
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser Public License for more details.
+#
+# You should have received a copy of the GNU Lesser Public License
+# along with this program.  If not, see [http://www.gnu.org/licenses/].
+"""This module provides latency distributions to slow down Mockbot calls like a network would"""
+import bisect
+import math
+import random
+import threading
+
+
+class Latency(object):
+    """
+    Base class of the latency distributions. Subclasses implement :py:meth:`sample`.
+    """
+
+    def sample(self, rng):
+        """
+        Args:
+            rng (random.Random): Random source to draw from.
+
+        Returns:
+            float: A latency in seconds.
+        """
+        raise NotImplementedError
+
+
+class ConstantLatency(Latency):
+    """
+    Args:
+        seconds (float): The latency of every call.
+    """
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+
+    def sample(self, rng):
+        return self.seconds
+
+
+class NormalLatency(Latency):
+    """
+    Args:
+        mean (float): Mean latency in seconds.
+        stddev (float): Standard deviation in seconds.
+        minimum (Optional[float]): Samples below this are raised to it. Defaults to 0.
+    """
+
+    def __init__(self, mean, stddev, minimum=0.):
+        self.mean = mean
+        self.stddev = stddev
+        self.minimum = minimum
+
+    def sample(self, rng):
+        return max(self.minimum, rng.normalvariate(self.mean, self.stddev))
+
+
+class LogNormalLatency(Latency):
+    """
+    The usual shape of network latencies: most calls close to the median and a long tail of slow ones.
+
+    Args:
+        median (float): Median latency in seconds.
+        sigma (float): Standard deviation of the logarithm of the latency. Higher means a longer tail.
+    """
+
+    def __init__(self, median, sigma):
+        self.median = median
+        self.sigma = sigma
+
+    def sample(self, rng):
+        return rng.lognormvariate(math.log(self.median), self.sigma)
+
+
+class HistogramLatency(Latency):
+    """
+    Replays a recorded latency histogram. A bucket is picked with a chance in proportion to its count and the
+    latency is spread evenly between the bound of the bucket before it (0 for the first) and its own bound.
+
+    Args:
+        bounds (list[float]): Upper bounds of the buckets in seconds, ascending.
+        counts (list[int]): Number of recorded calls in each bucket.
+    """
+
+    def __init__(self, bounds, counts):
+        if len(bounds) != len(counts) or not sum(counts):
+            raise ValueError("bounds and counts must have the same length and hold at least one call")
+        self.bounds = list(bounds)
+        self.counts = list(counts)
+        self._cumulative = []
+        total = 0
+        for count in counts:
+            total += count
+            self._cumulative.append(total)
+
+    def sample(self, rng):
+        i = bisect.bisect_right(self._cumulative, rng.random() * self._cumulative[-1])
+        i = min(i, len(self.bounds) - 1)
+        lower = self.bounds[i - 1] if i else 0.
+        return rng.uniform(lower, self.bounds[i])
+
+
+class LatencyModel(object):
+    """
+    The latency of each Bot API method of a :py:class:`ptbtest.Mockbot`. Pass it as ``latency`` to the Mockbot
+    and every call sending, editing or answering something, and every ``getUpdates``, takes a sampled time. With a
+    :py:class:`ptbtest.VirtualClock` attached to the bot the clock is advanced instead of waiting.
+
+    Examples:
+        Slow sends with a long tail and fast callback answers::
+
+            model = LatencyModel(default=LogNormalLatency(.12, .6),
+                                 methods={'answerCallbackQuery': ConstantLatency(.08)},
+                                 seed=1)
+            bot = Mockbot(latency=model)
+
+    Args:
+        default (Optional[ptbtest.latency.Latency]): Latency of the methods not in ``methods``. Defaults to none.
+        methods (Optional[dict]): Latency per method name, like ``sendMessage`` or ``getUpdates``.
+        seed (Optional[int or random.Random]): Seed or random source to sample with, so runs can be repeated.
+    """
+
+    def __init__(self, default=None, methods=None, seed=None):
+        self.default = default
+        self.methods = dict(methods or {})
+        self.rng = seed if isinstance(seed, random.Random) else random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample(self, method):
+        """
+        Returns:
+            float: A latency in seconds for a call to ``method``, 0 if it has none.
+        """
+        latency = self.methods.get(method, self.default)
+        if latency is None:
+            return 0.
+        with self._lock:
+            return max(0., latency.sample(self.rng))
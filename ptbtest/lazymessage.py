@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# pylint: disable=E0611,E0213,E1102,C0103,E1101,W0613,R0913,R0904
+#
+# A library that provides a testing suite fot python-telegram-bot
+# wich can be found on https://github.com/python-telegram-bot/python-telegram-bot
+# Copyright (C) 2017
+# Pieter Schutz - https://github.com/eldinnie
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser Public License for more details.
+#
+# You should have received a copy of the GNU Lesser Public License
+# along with this program.  If not, see [http://www.gnu.org/licenses/].
+"""This module provides a telegram.Message that is only built when it is used"""
+import threading
+
+from telegram import Message
+
+
+class LazyMessage(Message):
+    """
+    A :py:class:`telegram.Message` returned by the send methods of the :py:class:`ptbtest.Mockbot`. Building a
+    message means generating its chat, user and reply, which is wasted work when the caller never looks at the
+    return value. This object holds on to a factory instead and calls it the first time any attribute is read or
+    written. After that it turns into a plain :py:class:`telegram.Message`, so later access costs nothing extra.
+
+    Args:
+        factory (callable): Returns the real :py:class:`telegram.Message`.
+    """
+    _lock = threading.RLock()
+
+    def __init__(self, factory):
+        object.__setattr__(self, '_factory', factory)
+
+    def __getattribute__(self, name):
+        # isinstance() reads __class__ when the metaclass is ABCMeta, like the one of TelegramObject on python 2
+        if type(self) is LazyMessage and name != '__class__':
+            LazyMessage._materialize(self)
+        return object.__getattribute__(self, name)
+
+    def __setattr__(self, name, value):
+        if type(self) is LazyMessage:
+            LazyMessage._materialize(self)
+        object.__setattr__(self, name, value)
+
+    def _materialize(self):
+        with LazyMessage._lock:
+            if type(self) is not LazyMessage:
+                return
+            attrs = object.__getattribute__(self, '__dict__')
+            # the factory is only dropped once it succeeded, a failing build fails again on the next read
+            message = attrs['_factory']()
+            del attrs['_factory']
+            attrs.update(message.__dict__)
+            object.__setattr__(self, '__class__', type(message))
@@ -25,6 +25,7 @@ import time
 from .updategenerator import update
 from .ptbgenerator import PtbGenerator
 from .entityparser import EntityParser
+from .ids import IdCounter
 from ptbtest import (UserGenerator, ChatGenerator, Mockbot)
 from ptbtest.errors import (BadUserException, BadMessageException,
                             BadChatException, BadBotException,
@@ -42,25 +43,24 @@ class MessageGenerator(PtbGenerator):
 
         Args:
             bot (Optional[ptbtest.Mockbot]): supply your own for a custom botname
+            seed (Optional[int or random.Random]): Seed or random source for the generated users, chats and
+                attachments, see :py:class:`ptbtest.ptbgenerator.PtbGenerator`.
+            ids (Optional[ptbtest.ids.IdSpace]): The user and chat ids to hand out. Defaults to those of ``bot``.
     """
 
-    def __init__(self, bot=None):
-        PtbGenerator.__init__(self)
-        self.idgen = self._gen_id()
-        self.ug = UserGenerator()
-        self.cg = ChatGenerator()
+    def __init__(self, bot=None, seed=None, ids=None):
         if not bot:
-            self.bot = Mockbot()
-        elif isinstance(bot, Mockbot):
-            self.bot = bot
-        else:
+            bot = Mockbot(seed=seed)
+        elif not isinstance(bot, Mockbot):
             raise BadBotException
-
-    def _gen_id(self):
-        x = 1
-        while True:
-            yield x
-            x += 1
+        # message ids, users and chats are shared with the bot so they stay unique in its message_store and
+        # registry
+        mg = getattr(bot, 'mg', None)
+        PtbGenerator.__init__(self, seed, ids if ids is not None or mg is None else mg.ids)
+        self.bot = bot
+        self.idgen = mg.idgen if mg is not None else IdCounter()
+        self.ug = UserGenerator(registry=self.bot.registry, seed=self.random, ids=self.ids)
+        self.cg = ChatGenerator(registry=self.bot.registry, seed=self.random, ids=self.ids)
 
     @update("edited_channel_post")
     def get_edited_channel_post(self, channel_post=None, **kwargs):
@@ -102,7 +102,7 @@ class MessageGenerator(PtbGenerator):
                 raise BadChatException(
                     "Can only use chat.type='channel' for get_channel_post")
         else:
-            chat = ChatGenerator().get_chat(type="channel")
+            chat = self.cg.get_chat(type="channel")
 
         return self.get_message(
             chat=chat, user=user, channel=True, **kwargs).message
@@ -212,6 +212,10 @@ class MessageGenerator(PtbGenerator):
         """
         if not channel:
             user, chat = self._get_user_and_chat(user, chat, private)
+        if chat:
+            self.bot.registry.add_chat(chat)
+        if user:
+            self.bot.registry.add_user(user)
 
         if reply_to_message and not isinstance(reply_to_message, Message):
             raise BadMessageException
@@ -235,7 +239,7 @@ class MessageGenerator(PtbGenerator):
         return Message(
             id or next(self.idgen),
             user,
-            None,
+            self._get_date(),
             chat,
             text=text,
             forward_from=forward_from,
@@ -387,10 +391,10 @@ class MessageGenerator(PtbGenerator):
                 raise BadChatException(
                     'forward_from_chat must be of type "channel"')
             if not forward_from:
-                forward_from = UserGenerator().get_user()
+                forward_from = self.ug.get_user()
         if forward_from and not isinstance(forward_date, int):
             if not isinstance(forward_date, datetime.datetime):
-                now = datetime.datetime.now()
+                now = self._get_date() or datetime.datetime.now()
             else:
                 now = forward_date
             try:
@@ -405,6 +409,12 @@ class MessageGenerator(PtbGenerator):
             forward_from_message_id = next(self.idgen)
         return forward_date, forward_from, forward_from_message_id
 
+    def _get_date(self):
+        clock = getattr(self.bot, 'clock', None)
+        if clock:
+            return clock.now()
+        return None
+
     def _handle_status(self, channel_chat_created, chat, delete_chat_photo,
                        group_chat_created, left_chat_member,
                        migrate_from_chat_id, migrate_to_chat_id,
@@ -473,7 +483,7 @@ class MessageGenerator(PtbGenerator):
         if chat:
             if not user:
                 if chat.type == "private":
-                    user = self.ug.get_user(
+                    user = self.bot.registry.get_user(chat.id) or self.ug.get_user(
                         first_name=chat.first_name,
                         last_name=chat.last_name,
                         username=chat.username,
@@ -492,12 +502,16 @@ class MessageGenerator(PtbGenerator):
             chat = self.cg.get_chat(type="group")
         return user, chat
 
+    @staticmethod
+    def _check_parse_mode(text, parse_mode):
+        if text and parse_mode and parse_mode not in ["HTML", "Markdown"]:
+            raise BadMarkupException(
+                'Mardown mode must be HTML or Markdown')
+
     def _handle_text(self, text, parse_mode):
         if text and parse_mode:
-            if parse_mode not in ["HTML", "Markdown"]:
-                raise BadMarkupException(
-                    'Mardown mode must be HTML or Markdown')
-            elif parse_mode == "HTML":
+            self._check_parse_mode(text, parse_mode)
+            if parse_mode == "HTML":
                 text, entities = EntityParser.parse_html(text)
             else:
                 text, entities = EntityParser.parse_markdown(text)
@@ -507,17 +521,14 @@ class MessageGenerator(PtbGenerator):
 
     def _get_photosize(self):
         tmp = []
-        import uuid
-        from random import randint
         for _ in range(2):
-            w, h = randint(40, 400), randint(40, 400)
+            w, h = self.random.randint(40, 400), self.random.randint(40, 400)
             s = w * h * 0.3
-            tmp.append(PhotoSize(str(uuid.uuid4()), w, h, file_size=s))
+            tmp.append(PhotoSize(self.gen_uuid(), w, h, file_size=s))
         return tmp
 
     def _get_location(self):
-        from random import uniform
-        return Location(uniform(-180.0, 180.0), uniform(-90.0, 90.0))
+        return Location(self.random.uniform(-180.0, 180.0), self.random.uniform(-90.0, 90.0))
 
     def _get_venue(self):
         loc = self._get_location()
@@ -529,35 +540,26 @@ class MessageGenerator(PtbGenerator):
         return Contact("06123456789", user.first_name)
 
     def _get_voice(self):
-        import uuid
-        from random import randint
-        return Voice(str(uuid.uuid4()), randint(1, 120))
+        return Voice(self.gen_uuid(), self.random.randint(1, 120))
 
     def _get_video(self, data=None):
-        import uuid
-        from random import randint
         if data:
-            data['width'] = randint(40, 400)
-            data['height'] = randint(40, 400)
+            data['width'] = self.random.randint(40, 400)
+            data['height'] = self.random.randint(40, 400)
             return Video(**data)
         return Video(
-            str(uuid.uuid4()),
-            randint(40, 400), randint(40, 400), randint(2, 300))
+            self.gen_uuid(),
+            self.random.randint(40, 400), self.random.randint(40, 400), self.random.randint(2, 300))
 
     def _get_sticker(self, data=None):
-        import uuid
-        from random import randint
         if data:
-            data['width'] = randint(20, 200)
-            data['height'] = randint(20, 200)
+            data['width'] = self.random.randint(20, 200)
+            data['height'] = self.random.randint(20, 200)
             return Sticker(**data)
-        return Sticker(str(uuid.uuid4()), randint(20, 200), randint(20, 200))
+        return Sticker(self.gen_uuid(), self.random.randint(20, 200), self.random.randint(20, 200))
 
     def _get_document(self):
-        import uuid
-        return Document(str(uuid.uuid4()), file_name="somedoc.pdf")
+        return Document(self.gen_uuid(), file_name="somedoc.pdf")
 
     def _get_audio(self):
-        import uuid
-        from random import randint
-        return Audio(str(uuid.uuid4()), randint(1, 120), title="Some song")
+        return Audio(self.gen_uuid(), self.random.randint(1, 120), title="Some song")
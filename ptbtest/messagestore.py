@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+# pylint: disable=E0611,E0213,E1102,C0103,E1101,W0613,R0913,R0904
+#
+# A library that provides a testing suite fot python-telegram-bot
+# wich can be found on https://github.com/python-telegram-bot/python-telegram-bot
+# Copyright (C) 2017
+# Pieter Schutz - https://github.com/eldinnie
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser Public License for more details.
+#
+# You should have received a copy of the GNU Lesser Public License
+# along with this program.  If not, see [http://www.gnu.org/licenses/].
+"""This module provides a store of the messages a Mockbot has sent or seen"""
+import threading
+from collections import OrderedDict
+
+
+class MessageStore(object):
+    """
+    The messages a :py:class:`ptbtest.Mockbot` has sent or seen in inserted updates, keyed by
+    ``(chat_id, message_id)`` or by ``inline_message_id``. The Mockbot edits these messages in place and uses them
+    as the originals of replies and forwards.
+
+    When full the least recently used message is forgotten. Both storing and looking up a message count as use.
+
+    Args:
+        capacity (Optional[int]): Most messages to keep. Defaults to unbounded.
+    """
+
+    UPDATE_FIELDS = ('message', 'edited_message', 'channel_post',
+                     'edited_channel_post')
+
+    def __init__(self, capacity=None):
+        self.capacity = capacity
+        self._messages = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(chat_id, message_id, inline_message_id):
+        if inline_message_id:
+            return inline_message_id
+        if chat_id is None or message_id is None:
+            return None
+        return chat_id, message_id
+
+    def add(self, message, chat_id=None, message_id=None,
+            inline_message_id=None):
+        """
+        Stores ``message``, replacing the message stored before under the same key. Without ids the key is taken
+        from ``message.chat.id`` and ``message.message_id``.
+
+        Args:
+            message (telegram.Message): The message to store.
+            chat_id (Optional[int or str]): Chat the message is in.
+            message_id (Optional[int]): Id of the message in that chat.
+            inline_message_id (Optional[str]): Id of an inline message. Takes precedence over the other ids.
+
+        Returns:
+            telegram.Message: ``message``
+        """
+        if chat_id is None and message_id is None and not inline_message_id:
+            chat_id, message_id = message.chat.id, message.message_id
+        key = self._key(chat_id, message_id, inline_message_id)
+        if key is None:
+            return message
+        with self._lock:
+            self._store(key, message)
+        return message
+
+    def _store(self, key, message):
+        self._messages.pop(key, None)
+        self._messages[key] = message
+        if self.capacity is not None:
+            while len(self._messages) > self.capacity:
+                self._messages.popitem(last=False)
+
+    def _update_messages(self, update):
+        for field in self.UPDATE_FIELDS:
+            message = getattr(update, field, None)
+            if message is not None:
+                yield message
+        callback_query = getattr(update, 'callback_query', None)
+        if callback_query is not None and callback_query.message is not None:
+            yield callback_query.message
+
+    def add_update(self, update):
+        """
+        Stores the messages in ``update``: its (edited) message or channel post and the message of a callback query.
+        An edited message replaces the stored original.
+        """
+        for message in self._update_messages(update):
+            self.add(message)
+
+    def add_updates(self, updates):
+        """Stores the messages of every update in ``updates`` holding the lock once, see :py:meth:`add_update`."""
+        # reading the ids can build a LazyMessage, which looks up its reply in this store, so not under the lock
+        keyed = [((message.chat.id, message.message_id), message)
+                 for update in updates for message in self._update_messages(update)]
+        with self._lock:
+            for key, message in keyed:
+                self._store(key, message)
+
+    def get(self, chat_id=None, message_id=None, inline_message_id=None):
+        """
+        Returns:
+            telegram.Message: The message stored under the given ids, None if unknown.
+        """
+        key = self._key(chat_id, message_id, inline_message_id)
+        with self._lock:
+            message = self._messages.pop(key, None)
+            if message is not None:
+                self._messages[key] = message
+        return message
+
+    def clear(self):
+        """Forgets all messages."""
+        with self._lock:
+            self._messages.clear()
+
+    def __len__(self):
+        return len(self._messages)
+
+    def __contains__(self, key):
+        return key in self._messages
@@ -0,0 +1,246 @@
+#!/usr/bin/env python
+# pylint: disable=E0611,E0213,E1102,C0103,E1101,W0613,R0913,R0904
+#
+# A library that provides a testing suite fot python-telegram-bot
+# wich can be found on https://github.com/python-telegram-bot/python-telegram-bot
+# Copyright (C) 2017
+# Pieter Schutz - https://github.com/eldinnie
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser Public License for more details.
+#
+# You should have received a copy of the GNU Lesser Public License
+# along with this program.  If not, see [http://www.gnu.org/licenses/].
+"""This module provides counters and histograms of the calls made to a Mockbot"""
+import bisect
+import functools
+import json
+import math
+import threading
+import time
+
+from telegram import TelegramObject
+
+_wall_timer = getattr(time, 'perf_counter', time.time)
+_cpu_timer = getattr(time, 'thread_time', None) or getattr(time, 'process_time', None) or time.clock
+
+SECONDS_BOUNDS = (.00001, .00005, .0001, .0005, .001, .005, .01, .05, .1, .25, .5, 1., 2.5, 5., 10.)
+BYTES_BOUNDS = (64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384, 65536)
+UPDATES_BOUNDS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+
+def percentile(values, p):
+    """
+    Args:
+        values (list[float]): Sorted values.
+        p (float): The percentile, between 0 and 100.
+
+    Returns:
+        float: The nearest-rank percentile of ``values``, None if there are none.
+    """
+    if not values:
+        return None
+    rank = int(math.ceil(p / 100. * len(values))) - 1
+    return values[min(max(rank, 0), len(values) - 1)]
+
+
+class Histogram(object):
+    """
+    A histogram with fixed buckets, so it takes the same memory however many values it counts.
+
+    Args:
+        bounds (tuple[float]): Upper bounds of the buckets, ascending. Larger values go in an extra ``+Inf``
+            bucket.
+    """
+    __slots__ = ('bounds', 'counts', 'sum', 'count', 'max')
+
+    def __init__(self, bounds):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0
+        self.count = 0
+        self.max = None
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def percentile(self, p):
+        """
+        Returns:
+            float: The upper bound of the bucket holding the ``p`` th percentile, the largest value seen for the
+            ``+Inf`` bucket and None without values.
+        """
+        if not self.count:
+            return None
+        rank = p / 100. * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank and seen:
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self):
+        return {'bounds': list(self.bounds), 'counts': list(self.counts), 'sum': self.sum,
+                'count': self.count, 'max': self.max}
+
+
+class MethodMetrics(object):
+    """
+    What is known about the calls to one method.
+
+    Attributes:
+        calls (int): Number of calls.
+        errors (int): Calls that raised.
+        payload (Histogram): Size of the arguments as json, in bytes.
+        wall (Histogram): Seconds each call took, including its latency.
+        cpu (Histogram): Cpu seconds spent in each call.
+    """
+    __slots__ = ('calls', 'errors', 'payload', 'wall', 'cpu')
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.payload = Histogram(BYTES_BOUNDS)
+        self.wall = Histogram(SECONDS_BOUNDS)
+        self.cpu = Histogram(SECONDS_BOUNDS)
+
+    def to_dict(self):
+        return {'calls': self.calls, 'errors': self.errors, 'payload_bytes': self.payload.to_dict(),
+                'wall_seconds': self.wall.to_dict(), 'cpu_seconds': self.cpu.to_dict()}
+
+
+def _json_default(obj):
+    if isinstance(obj, TelegramObject):
+        return obj.to_dict()
+    return str(obj)
+
+
+def payload_size(args, kwargs):
+    """
+    Returns:
+        int: The length of ``args`` and ``kwargs`` as json, telegram objects as their dict.
+    """
+    return len(json.dumps([args, kwargs], default=_json_default))
+
+
+class Metrics(object):
+    """
+    Call counters and fixed-memory histograms for every Bot API method of a :py:class:`ptbtest.Mockbot`, and the
+    number of updates returned per ``getUpdates`` poll. Pass ``metrics=True`` to the Mockbot to collect them, see
+    its ``metrics`` attribute.
+
+    Examples:
+        Finding out where a load test spends its time::
+
+            bot = Mockbot(metrics=True)
+            ...
+            bot.metrics.to_dict()['methods']['sendMessage']['cpu_seconds']['sum']
+            print(bot.metrics.to_prometheus())
+    """
+
+    def __init__(self):
+        self.methods = {}
+        self.poll_updates = Histogram(UPDATES_BOUNDS)
+        self.empty_polls = 0
+        self._lock = threading.Lock()
+
+    def observe(self, method, payload, wall, cpu, error=False):
+        """Counts a call to ``method`` with ``payload`` bytes of arguments that took ``wall`` and ``cpu`` seconds."""
+        with self._lock:
+            metrics = self.methods.get(method)
+            if metrics is None:
+                metrics = self.methods[method] = MethodMetrics()
+            metrics.calls += 1
+            if error:
+                metrics.errors += 1
+            metrics.payload.observe(payload)
+            metrics.wall.observe(wall)
+            metrics.cpu.observe(cpu)
+
+    def observe_poll(self, updates):
+        """Counts a ``getUpdates`` poll that returned ``updates`` updates."""
+        with self._lock:
+            self.poll_updates.observe(updates)
+            if not updates:
+                self.empty_polls += 1
+
+    def meter(self, method, func):
+        """
+        Returns:
+            callable: ``func`` counting its calls as ``method``.
+        """
+        @functools.wraps(func)
+        def metered(*args, **kwargs):
+            size = payload_size(args, kwargs)
+            wall, cpu = _wall_timer(), _cpu_timer()
+            error = True
+            try:
+                result = func(*args, **kwargs)
+                error = False
+                return result
+            finally:
+                self.observe(method, size, _wall_timer() - wall, _cpu_timer() - cpu, error)
+
+        return metered
+
+    def to_dict(self):
+        with self._lock:
+            return {'methods': dict((method, metrics.to_dict())
+                                    for method, metrics in self.methods.items()),
+                    'polls': {'updates': self.poll_updates.to_dict(),
+                              'empty': self.empty_polls}}
+
+    def to_prometheus(self, prefix='ptbtest'):
+        """
+        Returns:
+            str: The metrics in the Prometheus text exposition format.
+        """
+        lines = []
+        with self._lock:
+            methods = sorted(self.methods.items())
+            lines.append('# HELP {0}_calls_total Calls per Bot API method.'.format(prefix))
+            lines.append('# TYPE {0}_calls_total counter'.format(prefix))
+            for method, metrics in methods:
+                lines.append('{0}_calls_total{{method="{1}"}} {2}'.format(prefix, method, metrics.calls))
+            lines.append('# HELP {0}_errors_total Calls per Bot API method that raised.'.format(prefix))
+            lines.append('# TYPE {0}_errors_total counter'.format(prefix))
+            for method, metrics in methods:
+                lines.append('{0}_errors_total{{method="{1}"}} {2}'.format(prefix, method, metrics.errors))
+            for name, attr, help_text in (('payload_bytes', 'payload', 'Size of the arguments as json.'),
+                                          ('call_seconds', 'wall', 'Wall time of the calls.'),
+                                          ('call_cpu_seconds', 'cpu', 'Cpu time of the calls.')):
+                name = '{0}_{1}'.format(prefix, name)
+                lines.append('# HELP {0} {1}'.format(name, help_text))
+                lines.append('# TYPE {0} histogram'.format(name))
+                for method, metrics in methods:
+                    _histogram_lines(lines, name, getattr(metrics, attr), 'method="{0}",'.format(method))
+            name = '{0}_poll_updates'.format(prefix)
+            lines.append('# HELP {0} Updates returned per getUpdates poll.'.format(name))
+            lines.append('# TYPE {0} histogram'.format(name))
+            _histogram_lines(lines, name, self.poll_updates, '')
+            lines.append('# HELP {0}_empty_polls_total getUpdates polls without updates.'.format(prefix))
+            lines.append('# TYPE {0}_empty_polls_total counter'.format(prefix))
+            lines.append('{0}_empty_polls_total {1}'.format(prefix, self.empty_polls))
+        return '\n'.join(lines) + '\n'
+
+
+def _histogram_lines(lines, name, histogram, labels):
+    cumulative = 0
+    for bound, count in zip(histogram.bounds + ('+Inf',), histogram.counts):
+        cumulative += count
+        lines.append('{0}_bucket{{{1}le="{2}"}} {3}'.format(name, labels, bound, cumulative))
+    labels = '{{{0}}}'.format(labels.rstrip(',')) if labels else ''
+    lines.append('{0}_sum{1} {2}'.format(name, labels, histogram.sum))
+    lines.append('{0}_count{1} {2}'.format(name, labels, histogram.count))
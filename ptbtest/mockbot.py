@@ -20,16 +20,31 @@
 # along with this program.  If not, see [http://www.gnu.org/licenses/].
 """This module provides a class for a Mockbot"""
 
+import collections
+import datetime
 import functools
 import logging
+import numbers
+import threading
 import warnings
 
 import time
 
-from telegram import (User, ReplyMarkup, TelegramObject)
+from telegram import (User, TelegramObject)
 from telegram.error import TelegramError
 
-logging.getLogger(__name__).addHandler(logging.NullHandler())
+from .correlation import (ContextValue, ResponseTimes, current_update_id, reset_update_id, set_update_id)
+from .floodcontrol import FloodControl
+from .latency import (Latency, LatencyModel)
+from .lazymessage import LazyMessage
+from .messagestore import MessageStore
+from .metrics import Metrics
+from .registry import Registry
+from .sentmessages import (SentMessage, SentMessages)
+from .updatequeue import UpdateQueue
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
 
 
 class Mockbot(TelegramObject):
@@ -42,11 +57,15 @@ class Mockbot(TelegramObject):
 
 
     Attributes:
-        sent_messages ([dict<sent message>]): A list of every message sent with this bot.
-
-    It will contain
-    the data dict usually passed to the methods actually sending data to telegram. With an added field
-    named ``method`` which will contain the method used to send this message to the server.
+        sent_messages (ptbtest.sentmessages.SentMessages): A list of every message sent with this bot. Besides
+            the usual list access it offers indexed lookups by chat, method, reply and inline query. It will
+            contain the data dict usually passed to the methods actually sending data to telegram. With an added
+            field named ``method`` which will contain the method used to send this message to the server. The
+            entries are :py:class:`ptbtest.sentmessages.SentMessage` objects which are read like those dicts.
+        message_store (ptbtest.messagestore.MessageStore): Every message this bot sent or saw in an inserted
+            update. Edits change these messages, replies and forwards refer to them.
+        metrics (ptbtest.metrics.Metrics): The collected call metrics, None when not collecting.
+        response_times (ptbtest.correlation.ResponseTimes): The timed updates, None when not timing them.
 
     Examples:
         A call to ``sendMessage(1, "hello")`` will return the following::
@@ -57,17 +76,93 @@ class Mockbot(TelegramObject):
 
         {'inline_message_id': 404, 'text': 'test 2', 'method': 'editMessageText', 'disable_web_page_preview': True}
     Parameters:
-        username (Optional[str]): Username for this bot. Defaults to 'MockBot'"""
-
-    def __init__(self, username="MockBot", **kwargs):
-        self._updates = []
+        username (Optional[str]): Username for this bot. Defaults to 'MockBot'
+        update_timeout (Optional[float]): Seconds :py:meth:`insertUpdate` waits for an attached dispatcher to
+            finish with an update. Defaults to 5.
+        clock (Optional[ptbtest.VirtualClock]): Clock to take message dates from instead of the system time.
+        max_poll_wait (Optional[float]): Longest time in seconds a single :py:meth:`getUpdates` call waits for
+            updates, whatever ``timeout`` is asked for. Keeps :py:meth:`telegram.ext.Updater.stop` fast.
+            Defaults to 1.
+        max_sent_messages (Optional[int]): Only keep the last this many ``sent_messages``. The totals per method
+            and chat stay exact. Also bounds ``message_store`` when ``max_stored_messages`` is not given.
+            Defaults to unbounded.
+        max_updates (Optional[int]): Only buffer this many updates that were not fetched yet, dropping the
+            oldest. Defaults to unbounded.
+        registry (Optional[ptbtest.registry.Registry]): The users and chats this bot knows. Defaults to a new,
+            empty registry.
+        max_stored_messages (Optional[int]): Only remember the last this many messages in ``message_store``.
+            Defaults to ``max_sent_messages``.
+        flood_control (Optional[ptbtest.floodcontrol.FloodControl or bool]): Limits the rate messages can be
+            sent at like telegram does, raising :py:class:`telegram.error.RetryAfter` when it is exceeded. True uses
+            the telegram limits. Defaults to no limits.
+        latency (Optional[ptbtest.latency.LatencyModel or ptbtest.latency.Latency]): How long the calls to
+            telegram take, per method or the same for all. Calls block for that time, or advance ``clock`` when it
+            is set. Only calls from the thread owning the clock advance it, other threads, like the ones handling
+            updates, and the tasks of an :py:class:`ptbtest.AsyncMockbot` see their own time run late instead.
+            Polling with getUpdates never moves the clock.
+            Defaults to no latency.
+        metrics (Optional[ptbtest.metrics.Metrics or bool]): Collect counters and histograms of the calls to the
+            Bot API methods, True for a new collection. Defaults to not collecting them.
+        response_times (Optional[ptbtest.correlation.ResponseTimes or bool]): Time how long the attached
+            dispatcher takes to answer and handle each update, True for a new collection. Defaults to not
+            timing them.
+        seed (Optional[int or random.Random]): Seed or random source for the users, chats and attachments in the
+            messages this bot returns, so runs can be repeated. Defaults to a source seeded by the system.
+        ids (Optional[ptbtest.ids.IdSpace]): The user and chat ids the generators of this bot hand out, so they are
+            never generated twice. Pass a slice of a shared id space to each worker of a parallel run. Defaults to
+            an id space of its own.
+
+    Every call made while the attached dispatcher handles an update is tagged with its ``update_id``, see
+    :py:meth:`ptbtest.sentmessages.SentMessages.by_update_id`."""
+
+    API_METHODS = ('getMe', 'sendMessage', 'forwardMessage', 'sendPhoto', 'sendAudio', 'sendDocument',
+                   'sendSticker', 'sendVideo', 'sendVoice', 'sendLocation', 'sendVenue', 'sendContact', 'sendGame',
+                   'sendChatAction', 'answerInlineQuery', 'getUserProfilePhotos', 'getFile', 'kickChatMember',
+                   'unbanChatMember', 'answerCallbackQuery', 'editMessageText', 'editMessageCaption',
+                   'editMessageReplyMarkup', 'getUpdates', 'setWebhook', 'leaveChat', 'getChat',
+                   'getChatAdministrators', 'getChatMember', 'getChatMembersCount', 'setGameScore',
+                   'getGameHighScores')
+
+    EDIT_METHODS = ('editMessageText', 'editMessageCaption',
+                    'editMessageReplyMarkup')
+
+    def __init__(self, username="MockBot", update_timeout=5., clock=None, max_poll_wait=1.,
+                 max_sent_messages=None, max_updates=None, registry=None,
+                 max_stored_messages=None, flood_control=None, latency=None, metrics=None,
+                 response_times=None, seed=None, ids=None, **kwargs):
+        self.registry = registry if registry is not None else Registry()
+        self.flood_control = FloodControl() if flood_control is True else flood_control or None
+        self.latency = LatencyModel(default=latency) if isinstance(latency, Latency) else latency
+        self._local = threading.local()
+        self._lag = ContextValue('ptbtest_lag', 0)
+        self.response_times = ResponseTimes() if response_times is True else response_times or None
+        self.message_store = MessageStore(
+            capacity=max_stored_messages if max_stored_messages is not None else max_sent_messages)
+        self._updates = UpdateQueue(maxlen=max_updates)
+        self.max_sent_messages = max_sent_messages
+        self.update_timeout = update_timeout
+        self.clock = clock
+        self.max_poll_wait = max_poll_wait
+        self._polls = 0
+        self._empty_polls = 0
+        self._dispatcher = None
+        self._in_flight = {}
+        self._update_cond = threading.Condition()
         self.bot = None
         self._username = username
-        self._sendmessages = []
+        self._sendmessages = SentMessages(capacity=max_sent_messages)
+        self._listeners = []
         from .messagegenerator import MessageGenerator
         from .chatgenerator import ChatGenerator
-        self.mg = MessageGenerator(bot=self)
-        self.cg = ChatGenerator()
+        self.mg = MessageGenerator(bot=self, seed=seed, ids=ids)
+        self.cg = ChatGenerator(registry=self.registry, seed=self.mg.random, ids=self.mg.ids)
+        self.metrics = Metrics() if metrics is True else metrics or None
+        if self.metrics is not None:
+            # wrapping the methods of this instance keeps bots without metrics free of the overhead
+            for name, value in list(vars(Mockbot).items()):
+                method = getattr(value, '__name__', None)
+                if method in self.API_METHODS:
+                    setattr(self, name, self.metrics.meter(method, getattr(self, name)))
 
     @property
     def sent_messages(self):
@@ -75,15 +170,32 @@ class Mockbot(TelegramObject):
 
     @property
     def updates(self):
-        tmp = self._updates
-        self._updates = []
-        return tmp
+        return self._updates.drain()
+
+    @property
+    def poll_stats(self):
+        """
+        dict: The number of :py:meth:`getUpdates` calls as ``polls`` and how many of those returned no updates
+        as ``empty_polls``.
+        """
+        return {'polls': self._polls, 'empty_polls': self._empty_polls}
 
     def reset(self):
         """
         Resets the ``sent_messages`` property to an empty list.
         """
-        self._sendmessages = []
+        self._sendmessages = SentMessages(capacity=self.max_sent_messages)
+
+    def add_listener(self, callback):
+        """
+        Calls ``callback(record)`` with the :py:class:`ptbtest.sentmessages.SentMessage` of every call recorded in
+        ``sent_messages`` from now on, in the thread making the call.
+        """
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        """Stops calling a ``callback`` added with :py:meth:`add_listener`."""
+        self._listeners.remove(callback)
 
     def info(func):
         @functools.wraps(func)
@@ -116,6 +228,18 @@ class Mockbot(TelegramObject):
     def username(self):
         return self.bot.username
 
+    @username.setter
+    def username(self, username):
+        self._username = username
+        self.invalidate_identity()
+
+    def invalidate_identity(self):
+        """
+        Drops the cached :py:class:`telegram.User` returned by :py:meth:`getMe`, so the next call builds it again.
+        Setting ``username`` does this automatically.
+        """
+        self.bot = None
+
     @property
     def name(self):
         return '@{0}'.format(self.username)
@@ -132,65 +256,201 @@ class Mockbot(TelegramObject):
                 data['disable_notification'] = kwargs.get(
                     'disable_notification')
 
-            if kwargs.get('reply_markup'):
-                reply_markup = kwargs.get('reply_markup')
-                if isinstance(reply_markup, ReplyMarkup):
-                    data['reply_markup'] = reply_markup.to_json()
-                else:
-                    data['reply_markup'] = reply_markup
-            data['method'] = func.__name__
-            self._sendmessages.append(data)
-            if data['method'] in ['sendChatAction']:
+            if self.flood_control is not None and func.__name__ != 'sendChatAction':
+                chat_id = data.get('chat_id')
+                self.flood_control.acquire(chat_id, self._is_group(chat_id), self._time())
+
+            self._delay(func.__name__)
+            record = SentMessage(func.__name__, data,
+                                 kwargs.get('reply_markup') or None,
+                                 self._responding())
+            self._append(record)
+            if record.method in ['sendChatAction']:
                 return True
-            dat = kwargs.copy()
-            dat.update(data)
-            del (dat['method'])
-            dat.pop('disable_web_page_preview', "")
-            dat.pop('disable_notification', "")
-            dat.pop('reply_markup', "")
-            dat['user'] = self.getMe()
-            cid = dat.pop('chat_id', None)
-            if cid:
-                dat['chat'] = self.cg.get_chat(cid=cid)
+            # the message is built when it is first read, what it is built from is checked and taken now
+            self.mg._check_parse_mode(data.get('text'), data.get('parse_mode'))
+            date = self.mg._get_date()
+            if record.method in self.EDIT_METHODS:
+                message = self._edit_stored(record.method, data, kwargs)
+                if message is not None:
+                    return message
+                message_id = data.get('message_id') or next(self.mg.idgen)
             else:
-                dat['chat'] = None
-            mid = dat.pop('reply_to_message_id', None)
-            if mid:
-                dat['reply_to_message'] = self.mg.get_message(
-                    id=mid, chat=dat['chat']).message
-            dat['forward_from_message_id'] = dat.pop('message_id', None)
-            cid = dat.pop('from_chat_id', None)
-            if cid:
-                dat['forward_from_chat'] = self.cg.get_chat(
-                    cid=cid, type='channel')
-            dat.pop('inline_message_id', None)
-            dat.pop('performer', '')
-            dat.pop('title', '')
-            dat.pop('duration', '')
-            dat.pop('duration', '')
-            dat.pop('phone_number', '')
-            dat.pop('first_name', '')
-            dat.pop('last_name', '')
-            dat.pop('filename', '')
-            dat.pop('latitude', '')
-            dat.pop('longitude', '')
-            dat.pop('foursquare_id', '')
-            dat.pop('address', '')
-            dat.pop('game_short_name', '')
-            dat['document'] = dat.pop('document2', None)
-            dat['audio'] = dat.pop('audio2', None)
-            dat['voice'] = dat.pop('voice2', None)
-            dat['video'] = dat.pop('video2', None)
-            dat['sticker'] = dat.pop('sticker2', None)
-            phot = dat.pop('photo', None)
-            if phot:
-                dat['photo'] = True
-            return self.mg.get_message(**dat).message
+                message_id = next(self.mg.idgen)
+            fields = self._message_fields(data, kwargs)
+            message = LazyMessage(
+                lambda: self._build_message(message_id, fields, date))
+            return self.message_store.add(
+                message,
+                chat_id=data.get('chat_id'),
+                message_id=message_id,
+                inline_message_id=data.get('inline_message_id'))
 
         return decorator
 
+    def _record(self, data):
+        self._delay(data['method'])
+        self._append(SentMessage(data.pop('method'), data,
+                                 update_id=self._responding()))
+
+    def _append(self, record):
+        self._sendmessages.append(record)
+        for listener in self._listeners:
+            listener(record)
+
+    def _responding(self):
+        # the update this call answers, if any
+        update_id = current_update_id()
+        if update_id is not None and self.response_times is not None:
+            self.response_times.responded(update_id, self._time())
+        return update_id
+
+    def _delay(self, method):
+        if self.latency is None or getattr(self._local, 'undelayed', False):
+            return
+        seconds = self.latency.sample(method)
+        if not seconds:
+            return
+        if self.clock is None:
+            time.sleep(seconds)
+        else:
+            self._advance(method, seconds)
+
+    def _advance(self, method, seconds):
+        # only the thread owning the clock moves it. Polls never do, other threads, like the ones the dispatcher
+        # handles updates in, only run late in a time of their own
+        if method == 'getUpdates':
+            return
+        if self.clock.owned():
+            self.clock.sleep(seconds)
+        else:
+            self._fall_behind(seconds)
+
+    def _fall_behind(self, seconds):
+        self._lag.set(self._lag.get() + seconds)
+
+    def _undelayed(self, method, *args, **kwargs):
+        # for callers that wait for the latency themselves, like the AsyncMockbot
+        self._local.undelayed = True
+        try:
+            return getattr(self, method)(*args, **kwargs)
+        finally:
+            self._local.undelayed = False
+
+    def _time(self):
+        if self.clock is None:
+            return time.time()
+        return self.clock.time() + self._lag.get()
+
+    def _is_group(self, chat_id):
+        chat = self.registry.get_chat(chat_id)
+        if chat is not None:
+            return chat.type != 'private'
+        # group ids are negative, channels can be addressed by their @username
+        return not isinstance(chat_id, numbers.Integral) or chat_id < 0
+
+    def _edit_stored(self, method, data, kwargs):
+        message = self.message_store.get(
+            chat_id=data.get('chat_id'),
+            message_id=data.get('message_id'),
+            inline_message_id=data.get('inline_message_id'))
+        if message is None:
+            return None
+        if method == 'editMessageText':
+            message.text, message.entities = self.mg._handle_text(
+                data['text'], data.get('parse_mode'))
+        elif method == 'editMessageCaption':
+            message.caption = data.get('caption')
+        if method == 'editMessageReplyMarkup' or kwargs.get('reply_markup'):
+            message.reply_markup = kwargs.get('reply_markup')
+        message.edit_date = self.mg._get_date() or datetime.datetime.now()
+        return message
+
+    def _message_fields(self, data, kwargs):
+        # what the message refers to is looked up when it is sent, a later edit of the original must not show
+        dat = kwargs.copy()
+        dat.update(data)
+        dat.pop('disable_web_page_preview', "")
+        dat.pop('disable_notification', "")
+        dat.pop('reply_markup', "")
+        cid = dat.get('chat_id')
+        mid = dat.get('reply_to_message_id')
+        if mid:
+            reply = self.message_store.get(chat_id=cid, message_id=mid)
+            if reply is not None:
+                del dat['reply_to_message_id']
+                dat['reply_to_message'] = reply
+        mid = dat.pop('message_id', None)
+        cid = dat.pop('from_chat_id', None)
+        original = None
+        if cid:
+            original = self.message_store.get(chat_id=cid, message_id=mid)
+            if original is None:
+                dat['forward_from_chat_id'] = cid
+                dat['forward_from_message_id'] = mid
+        dat.pop('inline_message_id', None)
+        dat.pop('performer', '')
+        dat.pop('title', '')
+        dat.pop('duration', '')
+        dat.pop('duration', '')
+        dat.pop('phone_number', '')
+        dat.pop('first_name', '')
+        dat.pop('last_name', '')
+        dat.pop('filename', '')
+        dat.pop('latitude', '')
+        dat.pop('longitude', '')
+        dat.pop('foursquare_id', '')
+        dat.pop('address', '')
+        dat.pop('game_short_name', '')
+        dat['document'] = dat.pop('document2', None)
+        dat['audio'] = dat.pop('audio2', None)
+        dat['voice'] = dat.pop('voice2', None)
+        dat['video'] = dat.pop('video2', None)
+        dat['sticker'] = dat.pop('sticker2', None)
+        phot = dat.pop('photo', None)
+        if phot:
+            dat['photo'] = True
+        if original is not None:
+            self._copy_forwarded(original, dat)
+        return dat
+
+    def _build_message(self, message_id, fields, date):
+        dat = fields.copy()
+        dat['user'] = self.getMe()
+        cid = dat.pop('chat_id', None)
+        if cid:
+            dat['chat'] = self.cg.get_chat(cid=cid)
+        else:
+            dat['chat'] = None
+        mid = dat.pop('reply_to_message_id', None)
+        if mid:
+            dat['reply_to_message'] = self.mg.get_message(
+                id=mid, chat=dat['chat']).message
+        cid = dat.pop('forward_from_chat_id', None)
+        if cid:
+            dat['forward_from_chat'] = self.cg.get_chat(
+                cid=cid, type='channel')
+        message = self.mg.get_message(id=message_id, **dat).message
+        message.date = date
+        return message
+
+    @staticmethod
+    def _copy_forwarded(original, dat):
+        for field in ('text', 'caption', 'audio', 'document', 'photo',
+                      'sticker', 'video', 'voice', 'contact', 'location',
+                      'venue'):
+            value = getattr(original, field, None)
+            if value:
+                dat[field] = value
+        dat['forward_from'] = original.from_user
+        dat['forward_date'] = original.date
+        if original.chat.type == 'channel':
+            dat['forward_from_chat'] = original.chat
+            dat['forward_from_message_id'] = original.message_id
+
     def getMe(self, timeout=None, **kwargs):
-        self.bot = User(0, "Mockbot", last_name="Bot", username=self._username)
+        if self.bot is None:
+            self.bot = User(0, "Mockbot", last_name="Bot", username=self._username)
         return self.bot
 
     @message
@@ -482,7 +742,8 @@ class Mockbot(TelegramObject):
                           switch_pm_parameter=None,
                           timeout=None,
                           **kwargs):
-        results = [res.to_dict() for res in results]
+        # results that came in over http, like through the BotApiServer, are dicts already
+        results = [res if isinstance(res, dict) else res.to_dict() for res in results]
 
         data = {'inline_query_id': inline_query_id, 'results': results}
 
@@ -498,7 +759,7 @@ class Mockbot(TelegramObject):
             data['switch_pm_parameter'] = switch_pm_parameter
         data['method'] = "answerInlineQuery"
 
-        self._sendmessages.append(data)
+        self._record(data)
 
     def getUserProfilePhotos(self,
                              user_id,
@@ -515,27 +776,27 @@ class Mockbot(TelegramObject):
 
         data['method'] = "getUserProfilePhotos"
 
-        self._sendmessages.append(data)
+        self._record(data)
 
     def getFile(self, file_id, timeout=None, **kwargs):
         data = {'file_id': file_id}
 
         data['method'] = "getFile"
-        self._sendmessages.append(data)
+        self._record(data)
 
     def kickChatMember(self, chat_id, user_id, timeout=None, **kwargs):
         data = {'chat_id': chat_id, 'user_id': user_id}
 
         data['method'] = "kickChatMember"
 
-        self._sendmessages.append(data)
+        self._record(data)
 
     def unbanChatMember(self, chat_id, user_id, timeout=None, **kwargs):
         data = {'chat_id': chat_id, 'user_id': user_id}
 
         data['method'] = "unbanChatMember"
 
-        self._sendmessages.append(data)
+        self._record(data)
 
     def answerCallbackQuery(self,
                             callback_query_id,
@@ -558,7 +819,7 @@ class Mockbot(TelegramObject):
 
         data['method'] = "answerCallbackQuery"
 
-        self._sendmessages.append(data)
+        self._record(data)
 
     @message
     def editMessageText(self,
@@ -639,17 +900,174 @@ class Mockbot(TelegramObject):
 
         return data
 
-    def insertUpdate(self, update):
+    def attach(self, dispatcher):
+        """
+        Attaches the dispatcher processing the updates of this bot. From then on :py:meth:`insertUpdate` no longer
+        sleeps a fixed time but returns as soon as the update has been fetched with getUpdates and every handler
+        group of the dispatcher has finished with it.
+
+        Args:
+            dispatcher (telegram.ext.Dispatcher or telegram.ext.Updater): The dispatcher, or the updater owning it.
+        """
+        dispatcher = getattr(dispatcher, 'dispatcher', dispatcher)
+        process_update = dispatcher.process_update
+
+        @functools.wraps(process_update)
+        def tracked_process_update(update):
+            update_id = getattr(update, 'update_id', None)
+            self._lag.set(0)
+            if self.response_times is not None:
+                self.response_times.started(update, self._time())
+            token = set_update_id(update_id)
+            try:
+                process_update(update)
+            finally:
+                reset_update_id(token)
+                if self.response_times is not None:
+                    self.response_times.processed(update_id, self._time())
+                self._update_processed(update)
+
+        dispatcher.process_update = tracked_process_update
+        self._dispatcher = dispatcher
+
+    @staticmethod
+    def _update_key(update):
+        # the update_id survives the update being serialized on the way to the dispatcher, the object does not
+        update_id = getattr(update, 'update_id', None)
+        return id(update) if update_id is None else update_id
+
+    def _update_processed(self, update):
+        with self._update_cond:
+            key = self._update_key(update)
+            if key in self._in_flight:
+                self._in_flight[key] -= 1
+                if not self._in_flight[key]:
+                    del self._in_flight[key]
+                self._update_cond.notify_all()
+
+    def _wait_processed(self, update, timeout):
+        key = self._update_key(update)
+        deadline = time.time() + timeout
+        with self._update_cond:
+            while key in self._in_flight:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    logger.warning('Update %s was not processed within %s seconds',
+                                   getattr(update, 'update_id', update), timeout)
+                    return False
+                self._update_cond.wait(remaining)
+        return True
+
+    def insertUpdate(self, update, timeout=None):
         """
         This inserts an update into the the bot's storage. these will be retreived on a call to
         getUpdates which is used by the :py:class:`telegram.Updater`. This way the updater can function without any
         modifications.
 
+        Without an attached dispatcher (see :py:meth:`attach`) this sleeps 0.3 seconds to give the updater time to
+        process the update. With one it blocks until the dispatcher is done with the update.
+
+        The messages in the update are added to ``message_store``.
+
         Args:
             update (telegram.Update): The update to insert in the queue.
+            timeout (Optional[float]): Seconds to wait for an attached dispatcher. Defaults to ``update_timeout``.
+
+        Returns:
+            bool: False if an attached dispatcher did not finish with the update in time, True otherwise.
+        """
+        self.message_store.add_update(update)
+        # without an attached dispatcher nothing reports the update processed, so it is not timed
+        if self.response_times is not None and self._dispatcher is not None:
+            self.response_times.inserted(update, self._time())
+        if self._dispatcher is None:
+            self._updates.put(update)
+            time.sleep(.3)
+            return True
+        with self._update_cond:
+            key = self._update_key(update)
+            self._in_flight[key] = self._in_flight.get(key, 0) + 1
+        self._updates.put(update)
+        return self._wait_processed(update, self.update_timeout
+                                    if timeout is None else timeout)
+
+    def insertUpdates(self, updates, wait=False, timeout=None):
         """
-        self._updates.append(update)
-        time.sleep(.3)
+        Inserts many updates at once, like :py:meth:`insertUpdate` but taking the locks once and waking the updater
+        once for all of them, and without sleeping when there is no attached dispatcher.
+
+        Args:
+            updates (iterable(telegram.Update)): The updates to insert, a list or a generator.
+            wait (Optional[bool]): Block until the attached dispatcher is done with every update. Defaults to False.
+            timeout (Optional[float]): While waiting, seconds the dispatcher may take for the next update before
+                giving up. Defaults to ``update_timeout``.
+
+        Returns:
+            bool: False if an attached dispatcher stopped finishing updates while waiting, True otherwise.
+        """
+        updates = list(updates)
+        self.message_store.add_updates(updates)
+        if self.response_times is not None and self._dispatcher is not None:
+            now = self._time()
+            for update in updates:
+                self.response_times.inserted(update, now)
+        if self._dispatcher is None:
+            self._updates.put_many(updates)
+            return True
+        keys = [self._update_key(update) for update in updates]
+        with self._update_cond:
+            for key in keys:
+                self._in_flight[key] = self._in_flight.get(key, 0) + 1
+        self._updates.put_many(updates)
+        if not wait:
+            return True
+        return self._wait_all_processed(keys, self.update_timeout
+                                        if timeout is None else timeout)
+
+    def _wait_all_processed(self, keys, timeout):
+        # updates mostly finish in order, so only the oldest unfinished one has to be checked after a wakeup
+        pending = collections.deque(keys)
+        deadline = time.time() + timeout
+        with self._update_cond:
+            while pending:
+                if pending[0] not in self._in_flight:
+                    pending.popleft()
+                    deadline = time.time() + timeout
+                    continue
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    logger.warning('%s updates were not processed, none finished within %s seconds',
+                                   len(pending), timeout)
+                    return False
+                self._update_cond.wait(remaining)
+        return True
+
+    def join(self, timeout=None):
+        """
+        Blocks until the attached dispatcher is done with every inserted update.
+
+        Args:
+            timeout (Optional[float]): Seconds the dispatcher may take for the next update before giving up.
+                Defaults to ``update_timeout``.
+
+        Returns:
+            bool: False if the dispatcher stopped finishing updates, True otherwise.
+        """
+        timeout = self.update_timeout if timeout is None else timeout
+        deadline = time.time() + timeout
+        with self._update_cond:
+            left = len(self._in_flight)
+            while self._in_flight:
+                if len(self._in_flight) < left:
+                    left = len(self._in_flight)
+                    deadline = time.time() + timeout
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    logger.warning('%s updates were not processed, none finished within %s seconds',
+                                   left, timeout)
+                    return False
+                self._update_cond.wait(remaining)
+        return True
 
     def getUpdates(self,
                    offset=None,
@@ -658,13 +1076,30 @@ class Mockbot(TelegramObject):
                    network_delay=None,
                    read_latency=2.,
                    **kwargs):
-        return self.updates
+        """
+        Returns the inserted updates. Like the Bot API this is a long poll: when there are no updates it waits
+        until one is inserted or ``timeout`` seconds have passed, but never longer than ``max_poll_wait``.
+
+        At most ``limit`` updates are returned per call. Returned updates are returned again until a call with an
+        ``offset`` higher than their ``update_id`` acknowledges them,
+        see :py:meth:`ptbtest.updatequeue.UpdateQueue.get`.
+        """
+        updates = self._updates.get(offset, limit,
+                                    min(timeout or 0, self.max_poll_wait))
+        self._delay('getUpdates')
+        if self.metrics is not None:
+            self.metrics.observe_poll(len(updates))
+        self._polls += 1
+        if not updates:
+            self._empty_polls += 1
+        return updates
 
     def setWebhook(self,
                    webhook_url=None,
                    certificate=None,
                    timeout=None,
                    **kwargs):
+        self._delay('setWebhook')
         return None
 
     def leaveChat(self, chat_id, timeout=None, **kwargs):
@@ -672,35 +1107,35 @@ class Mockbot(TelegramObject):
 
         data['method'] = "leaveChat"
 
-        self._sendmessages.append(data)
+        self._record(data)
 
     def getChat(self, chat_id, timeout=None, **kwargs):
         data = {'chat_id': chat_id}
 
         data['method'] = "getChat"
 
-        self._sendmessages.append(data)
+        self._record(data)
 
     def getChatAdministrators(self, chat_id, timeout=None, **kwargs):
         data = {'chat_id': chat_id}
 
         data['method'] = "getChatAdministrators"
 
-        self._sendmessages.append(data)
+        self._record(data)
 
     def getChatMembersCount(self, chat_id, timeout=None, **kwargs):
         data = {'chat_id': chat_id}
 
         data['method'] = "getChatMembersCount"
 
-        self._sendmessages.append(data)
+        self._record(data)
 
     def getChatMember(self, chat_id, user_id, timeout=None, **kwargs):
         data = {'chat_id': chat_id, 'user_id': user_id}
 
         data['method'] = "getChatMember"
 
-        self._sendmessages.append(data)
+        self._record(data)
 
     def setGameScore(self,
                      user_id,
@@ -735,7 +1170,7 @@ class Mockbot(TelegramObject):
                     'edit_message is ignored when disable_edit_message is used')
 
         data['method'] = "setGameScore"
-        self._sendmessages.append(data)
+        self._record(data)
 
     def getGameHighScores(self,
                           user_id,
@@ -755,7 +1190,7 @@ class Mockbot(TelegramObject):
 
         data['method'] = "getGameHighScores"
 
-        self._sendmessages.append(data)
+        self._record(data)
 
     @staticmethod
     def de_json(data, bot):
@@ -20,18 +20,34 @@
 # along with this program.  If not, see [http://www.gnu.org/licenses/].
 """This module contains a base class for class generators."""
 import random
+import uuid
+
+from .ids import IdSpace
 
 
 class PtbGenerator:
-    """Base class for all generators."""
+    """
+    Base class for all generators.
+
+    Args:
+        seed (Optional[int or random.Random]): Seed or random source for everything the generator makes up, so a
+            run can be repeated exactly. Defaults to a source of its own seeded by the system.
+        ids (Optional[ptbtest.ids.IdSpace]): The ids to hand out, shared with other generators so they never
+            generate the same id. Defaults to an id space of its own.
 
-    def __init__(self):
-        pass
+    Attributes:
+        random (random.Random): The random source of this generator.
+        ids (ptbtest.ids.IdSpace): The ids this generator hands out.
+    """
 
-    @staticmethod
-    def gen_id(group=False):
+    def __init__(self, seed=None, ids=None):
+        self.random = seed if isinstance(seed, random.Random) else random.Random(seed)
+        self.ids = ids if ids is not None else IdSpace(seed=self.random)
+
+    def gen_id(self, group=False):
         """
         Returns an id in the range telegram id's are valid. defaults to a positive int for a private chat.
+        The id was not handed out before by this generator or the others sharing its ``ids``.
 
         Args:
             group (optional[bool]): If True will return a negative id for a group chat.
@@ -40,7 +56,11 @@ class PtbGenerator:
             int: positive or negitve depending on group argument,
 
         """
-        if group:
-            return random.randint(-99999999, -222222)
-        else:
-            return random.randint(10000, 99999999)
+        return self.ids.gen_id(group)
+
+    def gen_uuid(self):
+        """
+        Returns:
+            str: A random version 4 uuid from the random source of this generator, used for file and query ids.
+        """
+        return str(uuid.UUID(int=self.random.getrandbits(128), version=4))
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# pylint: disable=E0611,E0213,E1102,C0103,E1101,W0613,R0913,R0904
+#
+# A library that provides a testing suite fot python-telegram-bot
+# wich can be found on https://github.com/python-telegram-bot/python-telegram-bot
+# Copyright (C) 2017
+# Pieter Schutz - https://github.com/eldinnie
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser Public License for more details.
+#
+# You should have received a copy of the GNU Lesser Public License
+# along with this program.  If not, see [http://www.gnu.org/licenses/].
+"""This module provides a registry of the users and chats known in a test"""
+
+
+class Registry(object):
+    """
+    The users and chats a :py:class:`ptbtest.Mockbot` knows about, keyed by id. Generators that share a registry
+    hand out the same :py:class:`telegram.User` and :py:class:`telegram.Chat` objects for the same id instead of
+    inventing new ones, so a chat id always comes back with the same names.
+
+    Every :py:class:`ptbtest.Mockbot` has one as ``registry``. A :py:class:`ptbtest.MessageGenerator` uses the one of
+    its bot, a :py:class:`ptbtest.ChatGenerator` or :py:class:`ptbtest.UserGenerator` only when it is passed in.
+    """
+
+    def __init__(self):
+        self.users = {}
+        self.chats = {}
+
+    def get_user(self, user_id):
+        """
+        Returns:
+            telegram.User: The user registered with ``user_id``, None if unknown.
+        """
+        return self.users.get(user_id)
+
+    def get_chat(self, chat_id):
+        """
+        Returns:
+            telegram.Chat: The chat registered with ``chat_id``, None if unknown.
+        """
+        return self.chats.get(chat_id)
+
+    def add_user(self, user):
+        """
+        Registers ``user`` under its id, replacing a user registered before with that id.
+
+        Returns:
+            telegram.User: ``user``
+        """
+        self.users[user.id] = user
+        return user
+
+    def add_chat(self, chat):
+        """
+        Registers ``chat`` under its id, replacing a chat registered before with that id.
+
+        Returns:
+            telegram.Chat: ``chat``
+        """
+        self.chats[chat.id] = chat
+        return chat
+
+    def clear(self):
+        """Forgets all users and chats."""
+        self.users = {}
+        self.chats = {}
@@ -0,0 +1,325 @@
+#!/usr/bin/env python
+# pylint: disable=E0611,E0213,E1102,C0103,E1101,W0613,R0913,R0904
+#
+# A library that provides a testing suite fot python-telegram-bot
+# wich can be found on https://github.com/python-telegram-bot/python-telegram-bot
+# Copyright (C) 2017
+# Pieter Schutz - https://github.com/eldinnie
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser Public License for more details.
+#
+# You should have received a copy of the GNU Lesser Public License
+# along with this program.  If not, see [http://www.gnu.org/licenses/].
+"""This module provides the indexed store behind Mockbot.sent_messages"""
+import collections
+import threading
+
+from telegram import ReplyMarkup
+
+
+# the keys of the records, shared by every record with the same keys instead of stored per record
+_KEYS = {}
+
+
+def _keys(keys):
+    keys = tuple(keys)
+    return _KEYS.setdefault(keys, keys)
+
+
+class SentMessage(object):
+    """
+    A single message sent with the :py:class:`ptbtest.Mockbot`. It can be read like the dict that used to be
+    stored (``record['text']``, ``record.get('chat_id')``, ``'caption' in record``) but takes less memory: the
+    values of the call are kept in a tuple, and the keys in a tuple shared by every record with the same keys. The
+    reply markup is kept as the object that was passed in and only turned into JSON when
+    ``record['reply_markup']`` is read.
+
+    Args:
+        method (str): The bot method used to send the message.
+        data (dict): The data of the call.
+        reply_markup (Optional[telegram.ReplyMarkup or str]): The reply markup passed to the call.
+        update_id (Optional[int]): The update that was being handled when the call was made.
+
+    Attributes:
+        update_id (int): The update that was being handled when the call was made, None if it was made outside
+            of a handler. It is not one of the keys, so records still compare equal to the dict of the call.
+    """
+    __slots__ = ('method', '_keys', '_values', '_reply_markup', 'update_id')
+
+    def __init__(self, method, data, reply_markup=None, update_id=None):
+        self.method = method
+        self._keys = _keys(data)
+        self._values = tuple(data[key] for key in self._keys)
+        self._reply_markup = reply_markup
+        self.update_id = update_id
+
+    def _markup_json(self):
+        if isinstance(self._reply_markup, ReplyMarkup):
+            return self._reply_markup.to_json()
+        return self._reply_markup
+
+    def __getitem__(self, key):
+        if key == 'method':
+            return self.method
+        if key == 'reply_markup' and self._reply_markup is not None:
+            return self._markup_json()
+        try:
+            return self._values[self._keys.index(key)]
+        except ValueError:
+            raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key == 'method':
+            self.method = value
+        elif key == 'reply_markup':
+            self._reply_markup = value
+        elif key in self._keys:
+            i = self._keys.index(key)
+            self._values = self._values[:i] + (value,) + self._values[i + 1:]
+        else:
+            self._keys = _keys(self._keys + (key,))
+            self._values += (value,)
+
+    def __contains__(self, key):
+        return key in self.keys()
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def __eq__(self, other):
+        if isinstance(other, (SentMessage, dict)):
+            return self.to_dict() == dict(other.items())
+        return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(self.to_dict())
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        keys = list(self._keys)
+        if self._reply_markup is not None:
+            keys.append('reply_markup')
+        keys.append('method')
+        return keys
+
+    def values(self):
+        return [self[key] for key in self.keys()]
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: The message as the plain dict ``sent_messages`` used to hold.
+        """
+        return dict(self.items())
+
+
+def _field(record, key):
+    if key == 'update_id':
+        return record.update_id
+    return record.get(key)
+
+
+class SentMessages(object):
+    """
+    Every message sent with a :py:class:`ptbtest.Mockbot`, in the order they were sent. It can be used like the
+    list it replaces (``len``, indexing, slicing, iterating) and adds indexed lookups so assertions do not have to
+    scan the whole history.
+
+    Examples:
+        All messages sent to a chat and the last one of them::
+
+            bot.sent_messages.by_chat(chat.id)
+            bot.sent_messages.latest(chat.id)
+
+        Combining criteria::
+
+            bot.sent_messages.filter(chat_id=chat.id, method="editMessageText")
+
+    When a ``capacity`` is given only the last ``capacity`` messages are kept, which keeps memory flat during long
+    running tests. The totals per method and per chat always count every message ever sent.
+
+    Args:
+        capacity (Optional[int]): Maximum number of messages to keep. Defaults to unbounded.
+    """
+    INDEXED = ('chat_id', 'method', 'reply_to_message_id', 'inline_query_id', 'update_id')
+
+    def __init__(self, capacity=None):
+        if capacity is not None and capacity < 1:
+            raise ValueError("capacity must be a positive number")
+        self.capacity = capacity
+        self._records = collections.deque()
+        self._index = dict((key, {}) for key in self.INDEXED)
+        self._total = 0
+        self._by_method = collections.Counter()
+        self._by_chat = collections.Counter()
+        self._lock = threading.Lock()
+
+    def append(self, record):
+        """
+        Args:
+            record (ptbtest.sentmessages.SentMessage or dict): The sent message. A dict is turned into a
+                SentMessage, taking the method from its ``method`` key.
+        """
+        if isinstance(record, dict):
+            record = SentMessage(record.pop('method', None), record)
+        with self._lock:
+            self._records.append(record)
+            for key, index in self._index.items():
+                value = _field(record, key)
+                if value is not None:
+                    index.setdefault(value, collections.deque()).append(record)
+            self._total += 1
+            self._by_method[record.get('method')] += 1
+            if record.get('chat_id') is not None:
+                self._by_chat[record.get('chat_id')] += 1
+            if self.capacity and len(self._records) > self.capacity:
+                self._evict()
+
+    def _evict(self):
+        # The oldest record is also the oldest entry of every index bucket it is in.
+        old = self._records.popleft()
+        for key, index in self._index.items():
+            value = _field(old, key)
+            if value is not None:
+                bucket = index[value]
+                bucket.popleft()
+                if not bucket:
+                    del index[value]
+
+    def clear(self):
+        """Forgets every sent message and resets the totals."""
+        with self._lock:
+            self._records = collections.deque()
+            self._index = dict((key, {}) for key in self.INDEXED)
+            self._total = 0
+            self._by_method = collections.Counter()
+            self._by_chat = collections.Counter()
+
+    @property
+    def total(self):
+        """int: Number of messages sent, including the ones no longer kept."""
+        return self._total
+
+    @property
+    def totals_by_method(self):
+        """dict: Number of messages sent per method, including the ones no longer kept."""
+        return dict(self._by_method)
+
+    @property
+    def totals_by_chat(self):
+        """dict: Number of messages sent per chat_id, including the ones no longer kept."""
+        return dict(self._by_chat)
+
+    def __len__(self):
+        return len(self._records)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return list(self._records)[item]
+        return self._records[item]
+
+    def __iter__(self):
+        return iter(list(self._records))
+
+    def __eq__(self, other):
+        if isinstance(other, SentMessages):
+            other = other._records
+        return list(self._records) == list(other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return repr(list(self._records))
+
+    def _lookup(self, key, value):
+        return list(self._index[key].get(value, ()))
+
+    def by_chat(self, chat_id):
+        """
+        Returns:
+            list(SentMessage): Messages sent to ``chat_id``, oldest first.
+        """
+        return self._lookup('chat_id', chat_id)
+
+    def by_method(self, method):
+        """
+        Returns:
+            list(SentMessage): Messages sent with ``method``, e.g. ``'sendMessage'``, oldest first.
+        """
+        return self._lookup('method', method)
+
+    def by_reply_to_message_id(self, message_id):
+        """
+        Returns:
+            list(SentMessage): Messages sent as a reply to ``message_id``, oldest first.
+        """
+        return self._lookup('reply_to_message_id', message_id)
+
+    def by_inline_query_id(self, inline_query_id):
+        """
+        Returns:
+            list(SentMessage): Answers to the inline query ``inline_query_id``, oldest first.
+        """
+        return self._lookup('inline_query_id', inline_query_id)
+
+    def by_update_id(self, update_id):
+        """
+        Returns:
+            list(SentMessage): Calls made while handling the update ``update_id``, oldest first.
+        """
+        return self._lookup('update_id', update_id)
+
+    def latest(self, chat_id):
+        """
+        Returns:
+            SentMessage: The last message sent to ``chat_id``, None if there is none.
+        """
+        found = self._index['chat_id'].get(chat_id)
+        return found[-1] if found else None
+
+    def filter(self, **criteria):
+        """
+        Returns the messages matching all given ``field=value`` criteria. The most selective indexed field is used
+        to find candidates so only those are checked against the other criteria.
+
+        Returns:
+            list(SentMessage): The matching messages, oldest first.
+        """
+        indexed = [(key, value) for key, value in criteria.items()
+                   if key in self._index]
+        if indexed:
+            candidates = min(
+                (self._index[key].get(value, ()) for key, value in indexed),
+                key=len)
+        else:
+            candidates = self._records
+        return [
+            r for r in candidates
+            if all(_field(r, key) == value for key, value in criteria.items())
+        ]
@@ -0,0 +1,260 @@
+#!/usr/bin/env python
+# pylint: disable=E0611,E0213,E1102,C0103,E1101,W0613,R0913,R0904
+#
+# A library that provides a testing suite fot python-telegram-bot
+# wich can be found on https://github.com/python-telegram-bot/python-telegram-bot
+# Copyright (C) 2017
+# Pieter Schutz - https://github.com/eldinnie
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser Public License for more details.
+#
+# You should have received a copy of the GNU Lesser Public License
+# along with this program.  If not, see [http://www.gnu.org/licenses/].
+"""This module provides a recorder and a replayer of update traces for the Mockbot"""
+import bz2
+import functools
+import gzip
+import itertools
+import json
+import threading
+import time
+
+from telegram import Update
+
+from .metrics import _json_default
+
+
+def _open(path, mode):
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 'b')
+    if path.endswith('.bz2'):
+        return bz2.BZ2File(path, mode + 'b')
+    return open(path, mode + 'b')
+
+
+class TraceRecorder(object):
+    """
+    Streams updates and the calls a :py:class:`ptbtest.Mockbot` makes to a trace file with one json object per
+    line, so traces of any length are written without holding them in memory. An update line looks like
+    ``{"t": 0.5, "update": {...}}`` and a call line like ``{"t": 0.6, "call": {...}, "update_id": 1}``, where ``t`` is
+    the number of seconds since the recorder was created and ``call`` is the entry of ``sent_messages`` as a dict.
+
+    Examples:
+        Recording everything a bot receives and sends::
+
+            with TraceRecorder("session.jsonl.gz", bot=bot):
+                bot.insertUpdate(update)
+                ...
+
+    Args:
+        path (str or file): File to write to, compressed with gzip when the name ends in ``.gz`` and with bzip2
+            for ``.bz2``. A file object opened in binary mode is written to as is.
+        bot (Optional[ptbtest.Mockbot]): Bot to record the inserted updates and calls of, see :py:meth:`attach`.
+        clock (Optional[ptbtest.VirtualClock]): Clock to take the times from. Defaults to the clock of ``bot``, or
+            the system time.
+    """
+
+    def __init__(self, path, bot=None, clock=None):
+        if hasattr(path, 'write'):
+            self._file, self._owned = path, False
+        else:
+            self._file, self._owned = _open(path, 'w'), True
+        self.clock = clock if clock is not None else getattr(bot, 'clock', None)
+        self._start = self._time()
+        self._lock = threading.Lock()
+        self._bot = None
+        if bot is not None:
+            self.attach(bot)
+
+    def _time(self):
+        return self.clock.time() if self.clock is not None else time.time()
+
+    def _write(self, entry):
+        entry['t'] = round(self._time() - self._start, 6)
+        line = json.dumps(entry, separators=(',', ':'), default=_json_default)
+        with self._lock:
+            self._file.write(line.encode('utf-8') + b'\n')
+
+    def record_update(self, update):
+        """Writes ``update`` to the trace."""
+        self._write({'update': update.to_dict()})
+
+    def record_call(self, record):
+        """Writes a call, an entry of ``sent_messages``, to the trace."""
+        entry = {'call': record.to_dict()}
+        if getattr(record, 'update_id', None) is not None:
+            entry['update_id'] = record.update_id
+        self._write(entry)
+
+    def attach(self, bot):
+        """
+        Records the updates inserted in ``bot`` with :py:meth:`ptbtest.Mockbot.insertUpdate` or
+        :py:meth:`ptbtest.Mockbot.insertUpdates` and every call it records.
+        """
+        insert_update, insert_updates = bot.insertUpdate, bot.insertUpdates
+
+        @functools.wraps(insert_update)
+        def recorded_insert_update(update, *args, **kwargs):
+            self.record_update(update)
+            return insert_update(update, *args, **kwargs)
+
+        @functools.wraps(insert_updates)
+        def recorded_insert_updates(updates, *args, **kwargs):
+            return insert_updates(self._recorded(updates), *args, **kwargs)
+
+        bot.insertUpdate = recorded_insert_update
+        bot.insertUpdates = recorded_insert_updates
+        bot.add_listener(self.record_call)
+        self._bot = bot
+
+    def _recorded(self, updates):
+        for update in updates:
+            self.record_update(update)
+            yield update
+
+    def detach(self):
+        """Stops recording the attached bot."""
+        if self._bot is not None:
+            del self._bot.insertUpdate
+            del self._bot.insertUpdates
+            self._bot.remove_listener(self.record_call)
+            self._bot = None
+
+    def close(self):
+        """Stops recording and closes the trace file if the recorder opened it."""
+        self.detach()
+        if self._owned:
+            self._file.close()
+        else:
+            self._file.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class TraceReplayer(object):
+    """
+    Reads a trace lazily and feeds its updates to a :py:class:`ptbtest.Mockbot`. Besides the traces written by
+    :py:class:`TraceRecorder` it reads dumps of the Bot API: lines holding a single update, or a whole
+    ``getUpdates`` response like ``{"ok": true, "result": [...]}``. Those have no times and are replayed as fast as
+    possible.
+
+    Examples:
+        Replaying a recorded day ten times faster, and a dump as fast as the bot takes it::
+
+            TraceReplayer("day.jsonl.gz").replay(bot, speed=10)
+            TraceReplayer("dump.jsonl").replay(bot, speed=None)
+
+    Args:
+        path (str or file): File to read, see :py:class:`TraceRecorder`.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def entries(self):
+        """
+        Yields:
+            tuple: ``(t, kind, data)`` for every line, with ``kind`` ``"update"`` or ``"call"``. ``t`` is None when
+            the line has no time. For calls ``data`` is the dict of the call with an ``update_id`` key when it was
+            made while handling an update.
+        """
+        if hasattr(self.path, 'read'):
+            lines, owned = self.path, None
+        else:
+            lines = owned = _open(self.path, 'r')
+        try:
+            for line in lines:
+                line = line.strip()
+                if not line:
+                    continue
+                entry = json.loads(line.decode('utf-8') if isinstance(line, bytes) else line)
+                t = entry.get('t')
+                if 'update' in entry:
+                    yield t, 'update', entry['update']
+                elif 'call' in entry:
+                    call = entry['call']
+                    if entry.get('update_id') is not None:
+                        call['update_id'] = entry['update_id']
+                    yield t, 'call', call
+                elif 'result' in entry:
+                    for update in entry['result']:
+                        yield t, 'update', update
+                elif 'update_id' in entry:
+                    yield t, 'update', entry
+        finally:
+            if owned is not None:
+                owned.close()
+
+    def updates(self, bot=None):
+        """
+        Yields:
+            tuple: ``(t, update)`` for every update in the trace, as :py:class:`telegram.Update`.
+        """
+        for t, kind, data in self.entries():
+            if kind == 'update':
+                yield t, Update.de_json(data, bot)
+
+    def calls(self):
+        """
+        Yields:
+            dict: Every recorded call, like the entries of ``sent_messages``.
+        """
+        for _, kind, data in self.entries():
+            if kind == 'call':
+                yield data
+
+    def replay(self, bot, speed=1., batch=1000, wait=True, timeout=None):
+        """
+        Inserts the updates of the trace in ``bot`` with :py:meth:`ptbtest.Mockbot.insertUpdates`. Updates are
+        inserted when they are due without waiting for the bot to handle the ones before, like telegram sends
+        them. Sleeping uses the clock of ``bot`` when it has one, so a day can be replayed in virtual time.
+
+        Args:
+            bot (ptbtest.Mockbot): The bot to feed.
+            speed (Optional[float]): How much faster than recorded to replay, 1 for the original speed. None
+                inserts the updates as fast as possible.
+            batch (Optional[int]): Most updates to insert at once when replaying as fast as possible. Defaults to
+                1000.
+            wait (Optional[bool]): Return only when the attached dispatcher is done with every update, see
+                :py:meth:`ptbtest.Mockbot.join`. Defaults to True.
+            timeout (Optional[float]): Passed to :py:meth:`ptbtest.Mockbot.join`.
+
+        Returns:
+            dict: The number of ``updates`` inserted, the ``duration`` of the replay in seconds, the largest ``lag``
+            in seconds of an insert behind its due time and whether every update was ``handled`` in time.
+        """
+        clock = bot.clock if bot.clock is not None else time
+        start = clock.time()
+        updates = self.updates(bot)
+        count, lag = 0, 0.
+        if speed is None:
+            while True:
+                chunk = [update for _, update in itertools.islice(updates, batch)]
+                if not chunk:
+                    break
+                bot.insertUpdates(chunk)
+                count += len(chunk)
+        else:
+            for t, update in updates:
+                if t is not None:
+                    ahead = start + t / float(speed) - clock.time()
+                    if ahead > 0:
+                        clock.sleep(ahead)
+                    else:
+                        lag = max(lag, -ahead)
+                bot.insertUpdates((update, ))
+                count += 1
+        handled = bot.join(timeout) if wait else True
+        return {'updates': count, 'duration': clock.time() - start, 'lag': lag, 'handled': handled}
@@ -0,0 +1,218 @@
+#!/usr/bin/env python
+# pylint: disable=E0611,E0213,E1102,C0103,E1101,W0613,R0913,R0904
+#
+# A library that provides a testing suite fot python-telegram-bot
+# wich can be found on https://github.com/python-telegram-bot/python-telegram-bot
+# Copyright (C) 2017
+# Pieter Schutz - https://github.com/eldinnie
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser Public License for more details.
+#
+# You should have received a copy of the GNU Lesser Public License
+# along with this program.  If not, see [http://www.gnu.org/licenses/].
+"""This module provides golden transcripts of the messages a Mockbot sent and a streaming comparison against them"""
+import json
+import threading
+
+from .metrics import _json_default
+from .trace import _open
+
+_MISSING = object()
+
+
+def normalize(record, ignore=()):
+    """
+    Returns:
+        dict: ``record``, an entry of ``sent_messages`` or a dict, as it is stored in a transcript: plain json
+        values, the reply markup as a dict and without the fields named in ``ignore`` at any depth. The
+        ``update_id`` the calls of a trace carry is left out, a transcript is about what was sent.
+    """
+    data = dict(record.items())
+    data.pop('update_id', None)
+    if isinstance(data.get('reply_markup'), str):
+        data['reply_markup'] = json.loads(data['reply_markup'])
+    data = json.loads(json.dumps(data, default=_json_default))
+    return _drop(data, frozenset(ignore)) if ignore else data
+
+
+def _drop(value, ignore):
+    if isinstance(value, dict):
+        return dict((key, _drop(item, ignore)) for key, item in value.items() if key not in ignore)
+    if isinstance(value, list):
+        return [_drop(item, ignore) for item in value]
+    return value
+
+
+def write_transcript(path, records):
+    """
+    Writes a golden transcript, one record per line with sorted keys so transcripts diff well.
+
+    Args:
+        path (str): File to write, compressed when the name ends in ``.gz`` or ``.bz2``.
+        records (iterable): The records, like ``bot.sent_messages`` or :py:meth:`ptbtest.trace.TraceReplayer.calls`.
+
+    Returns:
+        int: The number of records written.
+    """
+    count = 0
+    with _open(path, 'w') as f:
+        for record in records:
+            f.write(json.dumps(normalize(record), sort_keys=True).encode('utf-8') + b'\n')
+            count += 1
+    return count
+
+
+def read_transcript(path):
+    """
+    Yields:
+        dict: The records of a transcript, one line at a time.
+    """
+    with _open(path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line.decode('utf-8'))
+
+
+class TranscriptDifference(object):
+    """
+    The first record where a run differs from its transcript.
+
+    Attributes:
+        index (int): Position of the record, counting from 0.
+        expected (dict): The record of the transcript, None if the run sent more records.
+        actual (dict): The record of the run, None if it sent fewer records.
+        fields (list(str)): The top level fields that differ.
+    """
+
+    def __init__(self, index, expected, actual):
+        self.index = index
+        self.expected = expected
+        self.actual = actual
+        if expected is None or actual is None:
+            self.fields = []
+        else:
+            self.fields = sorted(key for key in set(expected) | set(actual)
+                                 if expected.get(key, _MISSING) != actual.get(key, _MISSING))
+
+    def __str__(self):
+        if self.actual is None:
+            return 'record {0} is missing, expected {1}'.format(self.index, self.expected)
+        if self.expected is None:
+            return 'record {0} was not expected: {1}'.format(self.index, self.actual)
+        return 'record {0} differs in {1}: expected {2}, got {3}'.format(
+            self.index, ', '.join(self.fields),
+            dict((key, self.expected.get(key)) for key in self.fields),
+            dict((key, self.actual.get(key)) for key in self.fields))
+
+    __repr__ = __str__
+
+
+class TranscriptChecker(object):
+    """
+    Checks records one at a time against a transcript, reading it as far as needed. Nothing but the current
+    record is held in memory, so the length of a run does not matter. Added as listener to a
+    :py:class:`ptbtest.Mockbot` it checks every call as it is made, so the bot can run with a small
+    ``max_sent_messages``.
+
+    Examples:
+        Checking a long replay::
+
+            checker = TranscriptChecker("golden.jsonl.gz", ignore=("file_id", "inline_message_id"))
+            bot.add_listener(checker)
+            TraceReplayer("day.jsonl.gz").replay(bot)
+            difference = checker.finish()
+            assert difference is None, str(difference)
+
+    Args:
+        path (str): The transcript, see :py:func:`write_transcript`.
+        ignore (Optional[iterable(str)]): Fields to leave out of the comparison, at any depth.
+
+    Attributes:
+        difference (ptbtest.transcript.TranscriptDifference): The first difference found, None so far.
+        checked (int): Number of records checked.
+    """
+
+    def __init__(self, path, ignore=()):
+        self.ignore = frozenset(ignore)
+        self.difference = None
+        self.checked = 0
+        self._expected = read_transcript(path)
+        self._lock = threading.Lock()
+
+    def _next_expected(self):
+        expected = next(self._expected, None)
+        return None if expected is None else _drop(expected, self.ignore)
+
+    def check(self, record):
+        """
+        Compares ``record`` with the next record of the transcript. Once a difference is found the following
+        records are not compared anymore.
+
+        Returns:
+            bool: Whether everything matched so far.
+        """
+        with self._lock:
+            if self.difference is not None:
+                return False
+            expected = self._next_expected()
+            actual = normalize(record, self.ignore)
+            if expected != actual:
+                self.difference = TranscriptDifference(self.checked, expected, actual)
+                self._expected.close()
+                return False
+            self.checked += 1
+            return True
+
+    __call__ = check
+
+    def finish(self):
+        """
+        Ends the check, making sure the transcript has no records left.
+
+        Returns:
+            ptbtest.transcript.TranscriptDifference: The first difference, None if the run matched the transcript.
+        """
+        with self._lock:
+            if self.difference is None:
+                expected = self._next_expected()
+                if expected is not None:
+                    self.difference = TranscriptDifference(self.checked, expected, None)
+            self._expected.close()
+            return self.difference
+
+
+def compare_transcript(path, records, ignore=()):
+    """
+    Compares ``records`` with a transcript, stopping at the first difference.
+
+    Args:
+        path (str): The transcript, see :py:func:`write_transcript`.
+        records (iterable): The records of the run, like ``bot.sent_messages``.
+        ignore (Optional[iterable(str)]): Fields to leave out of the comparison, at any depth.
+
+    Returns:
+        ptbtest.transcript.TranscriptDifference: The first difference, None if the records match the transcript.
+    """
+    checker = TranscriptChecker(path, ignore)
+    for record in records:
+        if not checker.check(record):
+            break
+    return checker.finish()
+
+
+def assert_transcript(path, records, ignore=()):
+    """
+    Like :py:func:`compare_transcript`, raising :py:class:`AssertionError` with the first difference.
+    """
+    difference = compare_transcript(path, records, ignore)
+    if difference is not None:
+        raise AssertionError(str(difference))
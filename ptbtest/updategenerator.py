@@ -23,15 +23,10 @@ import functools
 
 from telegram import Update
 
+from .ids import IdCounter
 
-def _gen_id():
-    x = 1
-    while True:
-        yield x
-        x += 1
-
-
-idgen = _gen_id()
+# shared by all generators, so update ids are unique in a test run
+idgen = IdCounter()
 
 
 def update(messtype):
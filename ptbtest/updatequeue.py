@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+# pylint: disable=E0611,E0213,E1102,C0103,E1101,W0613,R0913,R0904
+#
+# A library that provides a testing suite fot python-telegram-bot
+# wich can be found on https://github.com/python-telegram-bot/python-telegram-bot
+# Copyright (C) 2017
+# Pieter Schutz - https://github.com/eldinnie
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser Public License for more details.
+#
+# You should have received a copy of the GNU Lesser Public License
+# along with this program.  If not, see [http://www.gnu.org/licenses/].
+"""This module provides the thread safe update buffer used by the Mockbot"""
+import collections
+import itertools
+import threading
+import time
+
+
+class UpdateQueue(object):
+    """
+    A FIFO buffer of updates shared by any number of producer threads and the polling consumer.
+
+    Producers only hold the lock for a single append and only pay for a wakeup when a consumer is actually
+    waiting. The consumer takes everything in one go by swapping the underlying deque, so no update is lost or
+    handed out twice.
+
+    With :py:meth:`get` the buffer behaves like the Bot API instead: updates handed out stay in the buffer and are
+    handed out again until a later call acknowledges them with an ``offset`` higher than their ``update_id``.
+
+    Args:
+        maxlen (Optional[int]): Maximum number of updates to buffer. When full the oldest update is dropped and
+            counted in ``dropped``. Defaults to unbounded.
+    """
+
+    def __init__(self, maxlen=None):
+        if maxlen is not None and maxlen < 1:
+            raise ValueError("maxlen must be a positive number")
+        self.maxlen = maxlen
+        self.dropped = 0
+        self._items = collections.deque()
+        self._delivered = 0
+        self._cond = threading.Condition(threading.Lock())
+        self._waiting = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def put(self, update):
+        """
+        Args:
+            update (telegram.Update): Update to append to the buffer.
+        """
+        with self._cond:
+            self._items.append(update)
+            if self.maxlen and len(self._items) > self.maxlen:
+                self._items.popleft()
+                self._delivered = max(self._delivered - 1, 0)
+                self.dropped += 1
+            if self._waiting:
+                self._cond.notify_all()
+
+    def put_many(self, updates):
+        """
+        Appends all ``updates`` holding the lock once and waking the consumer once.
+
+        Args:
+            updates (iterable(telegram.Update)): Updates to append to the buffer, a list or a generator.
+        """
+        # a generator is run before taking the lock, so it cannot block the consumer
+        updates = list(updates)
+        if not updates:
+            return
+        with self._cond:
+            self._items.extend(updates)
+            if self.maxlen and len(self._items) > self.maxlen:
+                dropped = len(self._items) - self.maxlen
+                for _ in range(dropped):
+                    self._items.popleft()
+                self._delivered = max(self._delivered - dropped, 0)
+                self.dropped += dropped
+            if self._waiting:
+                self._cond.notify_all()
+
+    def _wait(self, deadline):
+        while not self._items:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            self._waiting += 1
+            try:
+                self._cond.wait(remaining)
+            finally:
+                self._waiting -= 1
+
+    def _acknowledge(self, offset):
+        if offset < 0:
+            forget = max(len(self._items) + offset, 0)
+            for _ in range(forget):
+                self._items.popleft()
+            self._delivered = max(self._delivered - forget, 0)
+            return
+        delivered = [self._items.popleft() for _ in range(self._delivered)]
+        kept = [u for u in delivered if u.update_id >= offset]
+        self._items.extendleft(reversed(kept))
+        self._delivered = len(kept)
+
+    def get(self, offset=None, limit=None, timeout=0):
+        """
+        Returns updates following the rules of the Bot API's getUpdates. Updates that were handed out before and
+        have an ``update_id`` lower than ``offset`` are dropped first, the first ``limit`` of the remaining updates
+        are returned and kept until they are acknowledged. Updates that were never handed out are not dropped by
+        ``offset``, so ids inserted out of order still reach the bot.
+
+        Args:
+            offset (Optional[int]): One more than the highest ``update_id`` processed. A negative offset forgets
+                all but the last ``-offset`` updates.
+            limit (Optional[int]): Maximum number of updates to return. Defaults to all of them.
+            timeout (Optional[float]): Seconds to wait when there are no updates. Defaults to 0.
+
+        Returns:
+            list(telegram.Update): The updates, possibly empty.
+        """
+        deadline = time.time() + timeout
+        with self._cond:
+            if offset is not None:
+                self._acknowledge(offset)
+            self._wait(deadline)
+            if limit is None or limit >= len(self._items):
+                batch = list(self._items)
+            else:
+                batch = list(itertools.islice(self._items, limit))
+            self._delivered = max(self._delivered, len(batch))
+        return batch
+
+    def drain(self, timeout=0):
+        """
+        Takes every update from the buffer. If it is empty, waits up to ``timeout`` seconds for one to arrive.
+
+        Args:
+            timeout (Optional[float]): Seconds to wait when the buffer is empty. Defaults to 0.
+
+        Returns:
+            list(telegram.Update): The updates in the order they were put, possibly empty.
+        """
+        deadline = time.time() + timeout
+        with self._cond:
+            self._wait(deadline)
+            items = self._items
+            self._items = collections.deque()
+            self._delivered = 0
+        return list(items)
@@ -19,8 +19,6 @@
 # You should have received a copy of the GNU Lesser Public License
 # along with this program.  If not, see [http://www.gnu.org/licenses/].
 """This module provides a class to generate telegram users"""
-import random
-
 from .ptbgenerator import PtbGenerator
 from telegram import User
 
@@ -38,8 +36,9 @@ class UserGenerator(PtbGenerator):
         "Wilson", "Moore", "Taylor"
     ]
 
-    def __init__(self):
-        PtbGenerator.__init__(self)
+    def __init__(self, registry=None, seed=None, ids=None):
+        PtbGenerator.__init__(self, seed, ids)
+        self.registry = registry
 
     def get_user(self, first_name=None, last_name=None, username=None,
                  id=None):
@@ -48,23 +47,36 @@ class UserGenerator(PtbGenerator):
         If any of the arguments are omitted the names will be chosen randomly and the
         username will be generated as first_name + last_name.
 
+        With a registry, asking for a known id without any names returns the registered user and
+        every generated user is registered.
+
         Args:
             first_name (Optional[str]): First name for the returned user.
             last_name (Optional[str]): Lst name for the returned user.
             username (Optional[str]): Username for the returned user.
+            id (Optional[int]): Id for the returned user.
 
         Returns:
             telegram.User: A telegram user object
 
         """
+        if id and self.registry is not None:
+            user = self.registry.get_user(id)
+            if user and not (first_name or last_name or username):
+                return user
+        if id:
+            self.ids.reserve(id)
         if not first_name:
-            first_name = random.choice(self.FIRST_NAMES)
+            first_name = self.random.choice(self.FIRST_NAMES)
         if not last_name:
-            last_name = random.choice(self.LAST_NAMES)
+            last_name = self.random.choice(self.LAST_NAMES)
         if not username:
             username = first_name + last_name
-        return User(
+        user = User(
             id or self.gen_id(),
             first_name,
             last_name=last_name,
             username=username)
+        if self.registry is not None:
+            self.registry.add_user(user)
+        return user
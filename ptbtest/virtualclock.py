@@ -0,0 +1,270 @@
+#!/usr/bin/env python
+# pylint: disable=E0611,E0213,E1102,C0103,E1101,W0613,R0913,R0904
+#
+# A library that provides a testing suite fot python-telegram-bot
+# wich can be found on https://github.com/python-telegram-bot/python-telegram-bot
+# Copyright (C) 2017
+# Pieter Schutz - https://github.com/eldinnie
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser Public License for more details.
+#
+# You should have received a copy of the GNU Lesser Public License
+# along with this program.  If not, see [http://www.gnu.org/licenses/].
+"""This module provides a virtual clock to run JobQueue driven bots without waiting"""
+import datetime
+import itertools
+import logging
+import threading
+import time
+
+from telegram.ext import JobQueue
+
+try:
+    from queue import Empty
+except ImportError:
+    from Queue import Empty
+
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
+
+class VirtualClock(object):
+    """
+    A clock that only moves when told to. Attach it to an :py:class:`telegram.ext.Updater` and the job queue of
+    the updater, the :py:class:`ptbtest.Mockbot` and every :py:class:`ptbtest.MessageGenerator` using that bot
+    read their time from this clock.
+
+    Examples:
+        Running a job that is due in one hour without waiting for it::
+
+            clock = VirtualClock()
+            clock.attach(updater)
+            updater.job_queue.run_once(callback, 3600)
+            clock.advance(3600)
+
+    Args:
+        start (Optional[float or datetime.datetime]): Time the clock starts at. Defaults to the current time.
+    """
+
+    def __init__(self, start=None):
+        if start is None:
+            start = time.time()
+        elif isinstance(start, datetime.datetime):
+            start = time.mktime(start.timetuple()) + start.microsecond / 1e6
+        self._time = float(start)
+        self._job_queues = []
+        self._lock = threading.RLock()
+        self._thread = threading.current_thread()
+        self._advancing = False
+
+    def time(self):
+        """
+        Returns:
+            float: The current virtual time as a unix timestamp.
+        """
+        return self._time
+
+    def now(self):
+        """
+        Returns:
+            datetime.datetime: The current virtual time as a local datetime, like ``datetime.datetime.now()``.
+        """
+        return datetime.datetime.fromtimestamp(self._time)
+
+    def owned(self):
+        """
+        Returns:
+            bool: True when called from the thread that created the clock, the only one a
+            :py:class:`ptbtest.Mockbot` lets its latency move the clock from.
+        """
+        return threading.current_thread() is self._thread
+
+    def attach(self, obj):
+        """
+        Makes ``obj`` read its time from this clock.
+
+        Args:
+            obj (telegram.ext.Updater or ptbtest.Mockbot): When given an updater its job queue is replaced by a
+                :py:class:`VirtualJobQueue` and its bot, if it is a Mockbot, gets this clock as well.
+
+        Returns:
+            The attached object.
+        """
+        from ptbtest import Mockbot
+        if isinstance(obj, Mockbot):
+            obj.clock = self
+            return obj
+        old = obj.job_queue
+        job_queue = VirtualJobQueue(obj.bot, self)
+        if old is not None:
+            old.stop()
+            for t, job in list(old.queue.queue):
+                job.job_queue = job_queue
+                job_queue.queue.put((t, next(job_queue._seq), job))
+            if getattr(old, '_running', False):
+                job_queue.start()
+        obj.job_queue = job_queue
+        obj.dispatcher.job_queue = job_queue
+        if isinstance(obj.bot, Mockbot):
+            obj.bot.clock = self
+        return obj
+
+    def _register(self, job_queue):
+        with self._lock:
+            self._job_queues.append(job_queue)
+
+    def advance(self, seconds):
+        """
+        Moves the clock forward. Every job that falls due on the way is run in the calling thread, in order of
+        due time, with the clock set to the time the job was due, or to when the job before it finished if that is
+        later. When a job itself moves the clock, like the latency of its calls does, the jobs falling due in the
+        meantime run after it.
+
+        Args:
+            seconds (float or datetime.timedelta): How far to move the clock.
+        """
+        if isinstance(seconds, datetime.timedelta):
+            seconds = seconds.total_seconds()
+        if seconds < 0:
+            raise ValueError("A VirtualClock can not go back in time")
+        with self._lock:
+            target = self._time + seconds
+            if self._advancing:
+                # a running job waits for the latency of its calls, the outer advance runs the jobs due meanwhile
+                self._time = target
+                return
+            self._advancing = True
+            try:
+                while True:
+                    now = max(self._time, target)
+                    due = [(jq.next_t(), jq) for jq in self._job_queues
+                           if jq.running]
+                    due = [(t, jq) for t, jq in due if t is not None and t <= now]
+                    if not due:
+                        break
+                    t, jq = min(due, key=lambda x: x[0])
+                    self._time = max(self._time, t)
+                    jq.tick()
+                self._time = max(self._time, target)
+            finally:
+                self._advancing = False
+
+    def sleep(self, seconds):
+        """Alias of :py:meth:`advance` so the clock can stand in for the ``time`` module."""
+        self.advance(seconds)
+
+
+class VirtualJobQueue(JobQueue):
+    """
+    A :py:class:`telegram.ext.JobQueue` without a thread of its own. Jobs only run when the
+    :py:class:`VirtualClock` it belongs to is advanced past their due time. Jobs that are due at the same time
+    run in the order they were scheduled.
+
+    Args:
+        bot (telegram.Bot): The bot instance that should be passed to the jobs
+        clock (ptbtest.VirtualClock): Clock to read the time from.
+    """
+
+    def __init__(self, bot, clock):
+        super(VirtualJobQueue, self).__init__(bot)
+        self.clock = clock
+        self._seq = itertools.count()
+        clock._register(self)
+
+    @property
+    def running(self):
+        return self._running
+
+    def _put(self, job, next_t=None, last_t=None):
+        if next_t is None:
+            next_t = job.interval
+            if next_t is None:
+                raise ValueError('next_t is None')
+
+        now = self.clock.now()
+        if isinstance(next_t, datetime.datetime):
+            next_t = (next_t - now).total_seconds()
+
+        elif isinstance(next_t, datetime.time):
+            next_datetime = datetime.datetime.combine(now.date(), next_t)
+
+            if now.time() > next_t:
+                next_datetime += datetime.timedelta(days=1)
+
+            next_t = (next_datetime - now).total_seconds()
+
+        elif isinstance(next_t, datetime.timedelta):
+            next_t = next_t.total_seconds()
+
+        next_t += self.clock.time() if last_t is None else last_t
+
+        self.logger.debug('Putting job %s with t=%f', job.name, next_t)
+
+        self.queue.put((next_t, next(self._seq), job))
+
+    def next_t(self):
+        """
+        Returns:
+            float: The due time of the first job in the queue, None if the queue is empty.
+        """
+        with self.queue.mutex:
+            return self.queue.queue[0][0] if self.queue.queue else None
+
+    def tick(self):
+        """
+        Run all jobs that are due on the virtual clock and re-enqueue them with their interval.
+        """
+        now = self.clock.time()
+
+        self.logger.debug('Ticking jobs with t=%f', now)
+
+        while True:
+            try:
+                t, seq, job = self.queue.get(False)
+            except Empty:
+                break
+
+            if t > now:
+                self.queue.put((t, seq, job))
+                break
+
+            if job.removed:
+                self.logger.debug('Removing job %s', job.name)
+                continue
+
+            if job.enabled:
+                try:
+                    current_week_day = datetime.datetime.fromtimestamp(t).weekday()
+                    if any(day == current_week_day for day in job.days):
+                        self.logger.debug('Running job %s', job.name)
+                        job.run(self.bot)
+
+                except Exception:
+                    self.logger.exception('An uncaught error was raised while executing job %s',
+                                          job.name)
+            else:
+                self.logger.debug('Skipping disabled job %s', job.name)
+
+            if job.repeat and not job.removed:
+                self._put(job, last_t=t)
+            else:
+                self.logger.debug('Dropping non-repeating or removed job %s', job.name)
+
+    def start(self):
+        """Starts running jobs on clock advances. No thread is started."""
+        self._running = True
+
+    def stop(self):
+        """Stops running jobs on clock advances."""
+        self._running = False
+
+    def jobs(self):
+        """Returns a tuple of all jobs that are currently in the ``JobQueue``"""
+        return tuple(job[2] for job in self.queue.queue if job)
@@ -0,0 +1,225 @@
+#!/usr/bin/env python
+# pylint: disable=E0611,E0213,E1102,C0103,E1101,W0613,R0913,R0904
+#
+# A library that provides a testing suite fot python-telegram-bot
+# wich can be found on https://github.com/python-telegram-bot/python-telegram-bot
+# Copyright (C) 2017
+# Pieter Schutz - https://github.com/eldinnie
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser Public License for more details.
+#
+# You should have received a copy of the GNU Lesser Public License
+# along with this program.  If not, see [http://www.gnu.org/licenses/].
+"""This module provides a driver posting updates to the webhook server of a bot"""
+import logging
+import socket
+import threading
+import time
+from collections import Counter
+
+try:
+    from http.client import (HTTPConnection, HTTPException)
+    from urllib.parse import urlsplit
+except ImportError:
+    from httplib import (HTTPConnection, HTTPException)
+    from urlparse import urlsplit
+
+from .metrics import percentile
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+_timer = getattr(time, 'perf_counter', time.time)
+
+
+class WebhookReport(object):
+    """
+    The outcome of a :py:meth:`WebhookDriver.run`.
+
+    Attributes:
+        requests (int): The number of updates posted, including failed ones.
+        duration (float): Seconds the run took.
+        latencies (list[float]): Sorted seconds each answered request took.
+        statuses (collections.Counter): Number of responses per HTTP status code.
+        errors (int): Requests that got no response at all.
+    """
+
+    def __init__(self, latencies, statuses, errors, duration):
+        self.latencies = sorted(latencies)
+        self.statuses = statuses
+        self.errors = errors
+        self.duration = duration
+        self.requests = len(self.latencies) + errors
+
+    @property
+    def requests_per_second(self):
+        return self.requests / self.duration if self.duration else 0.
+
+    @property
+    def non_200(self):
+        """int: Responses with a status other than 200."""
+        return sum(n for status, n in self.statuses.items() if status != 200)
+
+    def percentile(self, p):
+        """
+        Returns:
+            float: The ``p`` th percentile of the latencies in seconds.
+        """
+        return percentile(self.latencies, p)
+
+    def to_dict(self):
+        return {
+            'requests': self.requests,
+            'duration': self.duration,
+            'requests_per_second': self.requests_per_second,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+            'max': self.latencies[-1] if self.latencies else None,
+            'non_200': self.non_200,
+            'statuses': dict(self.statuses),
+            'errors': self.errors
+        }
+
+    def __repr__(self):
+        return 'WebhookReport({0})'.format(self.to_dict())
+
+
+class WebhookDriver(object):
+    """
+    Posts updates as JSON over loopback HTTP to a webhook server, like the telegram servers do for a bot started
+    with :py:meth:`telegram.ext.Updater.start_webhook`. The Mockbot of the updater only needs to be attached (see
+    :py:meth:`ptbtest.Mockbot.attach`) when the handling of the updates should be awaited.
+
+    Examples:
+        Measuring the ingest of ten thousand messages with four connections::
+
+            updater.start_webhook(listen='127.0.0.1', port=8443, url_path='hook')
+            driver = WebhookDriver.from_updater(updater, concurrency=4)
+            report = driver.run(mg.get_message(text="hi") for _ in range(10000))
+            report.requests_per_second, report.percentile(99), report.non_200
+
+    Args:
+        url (str): Full url of the webhook, e.g. ``http://127.0.0.1:8443/hook``.
+        concurrency (Optional[int]): Number of connections posting at the same time. Defaults to 1.
+        keep_alive (Optional[bool]): Reuse connections for following requests, as far as the server allows.
+            Defaults to True.
+        timeout (Optional[float]): Socket timeout in seconds per request. Defaults to 10.
+    """
+
+    def __init__(self, url, concurrency=1, keep_alive=True, timeout=10.):
+        parts = urlsplit(url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.path = parts.path or '/'
+        self.concurrency = concurrency
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+
+    @classmethod
+    def from_updater(cls, updater, wait=5., **kwargs):
+        """
+        Creates a driver for the webhook server of ``updater``, waiting up to ``wait`` seconds for
+        :py:meth:`telegram.ext.Updater.start_webhook` to have it serving.
+
+        Returns:
+            WebhookDriver: A driver posting to that server.
+        """
+        deadline = time.time() + wait
+        # the server ignores a shutdown until it is serving, so make sure it is before the updater can be stopped
+        while not getattr(getattr(updater, 'httpd', None), 'is_running', False):
+            if time.time() > deadline:
+                raise RuntimeError('The updater has no webhook server running')
+            time.sleep(.01)
+        host, port = updater.httpd.server_address[:2]
+        url = 'http://{0}:{1}{2}'.format(host, port, updater.httpd.webhook_path)
+        return cls(url, **kwargs)
+
+    def _connect(self):
+        return HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def _post(self, connection, body):
+        headers = {'Content-Type': 'application/json'}
+        if not self.keep_alive:
+            headers['Connection'] = 'close'
+        connection.request('POST', self.path, body, headers)
+        response = connection.getresponse()
+        response.read()
+        if not self.keep_alive:
+            connection.close()
+        return response.status
+
+    def post(self, update):
+        """
+        Posts a single update on a new connection.
+
+        Returns:
+            int: The HTTP status of the response.
+        """
+        connection = self._connect()
+        try:
+            return self._post(connection, update.to_json())
+        finally:
+            connection.close()
+
+    def run(self, updates):
+        """
+        Posts ``updates`` using ``concurrency`` connections. The updates are taken from the iterable while posting,
+        so a generator of updates is never held in memory as a whole.
+
+        Args:
+            updates (iterable[telegram.Update]): The updates to post.
+
+        Returns:
+            WebhookReport: Throughput, latencies and statuses of the run.
+        """
+        updates = iter(updates)
+        lock = threading.Lock()
+        latencies = []
+        statuses = Counter()
+        errors = [0]
+
+        def worker():
+            connection = self._connect()
+            own_latencies = []
+            own_statuses = Counter()
+            own_errors = 0
+            while True:
+                with lock:
+                    try:
+                        update = next(updates)
+                    except StopIteration:
+                        break
+                body = update.to_json()
+                start = _timer()
+                try:
+                    status = self._post(connection, body)
+                except (HTTPException, socket.error) as error:
+                    logger.debug('Posting update %s failed: %s', update.update_id, error)
+                    own_errors += 1
+                    connection.close()
+                    connection = self._connect()
+                    continue
+                own_latencies.append(_timer() - start)
+                own_statuses[status] += 1
+            connection.close()
+            with lock:
+                latencies.extend(own_latencies)
+                statuses.update(own_statuses)
+                errors[0] += own_errors
+
+        threads = [threading.Thread(target=worker) for _ in range(self.concurrency)]
+        start = _timer()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return WebhookReport(latencies, statuses, errors[0], _timer() - start)
@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+# pylint: disable=E0611,E0213,E1102,C0103,E1101,W0613,R0913,R0904
+#
+# A library that provides a testing suite fot python-telegram-bot
+# wich can be found on https://github.com/python-telegram-bot/python-telegram-bot
+# Copyright (C) 2017
+# Pieter Schutz - https://github.com/eldinnie
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser Public License for more details.
+#
+# You should have received a copy of the GNU Lesser Public License
+# along with this program.  If not, see [http://www.gnu.org/licenses/].
+from __future__ import absolute_import
+import sys
+import time
+import unittest
+
+from telegram.ext import Updater, CommandHandler
+
+from ptbtest import ChatGenerator
+from ptbtest import MessageGenerator
+from ptbtest import Mockbot
+from ptbtest import VirtualClock
+from ptbtest.latency import ConstantLatency
+
+if sys.version_info >= (3, 5):
+    import asyncio
+    from ptbtest import AsyncMockbot
+
+
+@unittest.skipIf(sys.version_info < (3, 5), "asyncio needs python 3.5")
+class TestAsyncMockbot(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.bot = AsyncMockbot()
+        self.mg = MessageGenerator(bot=self.bot.mockbot)
+
+    def tearDown(self):
+        self.loop.close()
+        asyncio.set_event_loop(None)
+
+    def run_loop(self, coro):
+        return self.loop.run_until_complete(coro)
+
+    def test_awaitable_methods(self):
+        message = self.run_loop(self.bot.sendMessage(1, "hello"))
+        self.assertEqual(message.text, "hello")
+        self.run_loop(self.bot.send_chat_action(1, "typing"))
+        self.assertEqual(self.bot.sent_messages[-1]['method'], "sendChatAction")
+        self.assertEqual(self.run_loop(self.bot.get_me()).username, "MockBot")
+        self.assertEqual(self.bot.name, "@MockBot")
+        self.assertEqual(self.bot.edit_message_text, self.bot.editMessageText)
+
+    def test_wraps_mockbot(self):
+        mockbot = Mockbot(username="Other")
+        bot = AsyncMockbot(mockbot)
+        self.assertIs(bot.mockbot, mockbot)
+        self.assertEqual(bot.username, "Other")
+
+    def test_concurrent_handlers(self):
+        def echo(bot, update):
+            return bot.send_message(update.message.chat_id, update.message.text)
+
+        self.bot.attach(echo)
+        chats = [ChatGenerator().get_chat() for _ in range(50)]
+        updates = [self.mg.get_message(chat=c, text=str(c.id)) for c in chats]
+        results = self.run_loop(
+            asyncio.gather(*(self.bot.insert_update(u) for u in updates)))
+        self.assertTrue(all(results))
+        self.assertEqual(len(self.bot.sent_messages), 50)
+        for chat in chats:
+            self.assertEqual(self.bot.sent_messages.latest(chat.id)['text'], str(chat.id))
+
+    def test_latency_does_not_block_loop(self):
+        bot = AsyncMockbot(latency=ConstantLatency(.2))
+        start = time.time()
+        self.run_loop(asyncio.gather(*(bot.send_message(i, "hi") for i in range(20))))
+        self.assertTrue(.2 <= time.time() - start < 1)
+        self.assertEqual(len(bot.sent_messages), 20)
+
+    def test_latency_on_virtual_clock(self):
+        clock = VirtualClock(start=0)
+        bot = AsyncMockbot(latency=ConstantLatency(.1), clock=clock, response_times=True)
+        self.run_loop(asyncio.gather(*(bot.send_message(i, "hi") for i in range(100))))
+        self.assertEqual(clock.time(), 0)
+        bot.attach(lambda bot, update: bot.send_message(update.message.chat_id, update.message.text))
+        updates = [self.mg.get_message(text=str(i)) for i in range(100)]
+        self.assertTrue(all(self.run_loop(asyncio.gather(*(bot.insert_update(u) for u in updates)))))
+        self.assertEqual(clock.time(), 0)
+        report = bot.response_times.report()['message']
+        self.assertAlmostEqual(report['first_response']['p99'], .1)
+        self.assertAlmostEqual(report['handling']['p99'], .1)
+
+    def test_insert_updates(self):
+        def echo(bot, update):
+            return bot.send_message(update.message.chat_id, update.message.text)
+
+        self.bot.attach(echo)
+        updates = (self.mg.get_message(text=str(i)) for i in range(30))
+        self.assertTrue(self.run_loop(self.bot.insert_updates(updates, wait=True)))
+        self.assertEqual(len(self.bot.sent_messages), 30)
+
+    def test_calls_tagged_with_update(self):
+        # the latency makes the handlers of the updates interleave on the loop
+        bot = AsyncMockbot(response_times=True, latency=ConstantLatency(.01))
+        bot.attach(lambda bot, update: bot.send_message(update.message.chat_id, update.message.text))
+        updates = [self.mg.get_message(text=str(i)) for i in range(20)]
+        self.assertTrue(all(self.run_loop(asyncio.gather(*(bot.insert_update(u) for u in updates)))))
+        for update in updates:
+            tagged = bot.sent_messages.by_update_id(update.update_id)
+            self.assertEqual([r['text'] for r in tagged], [update.message.text])
+        self.assertEqual(bot.response_times.report()['message']['count'], 20)
+
+    def test_insert_update_timeout(self):
+        self.bot.attach(lambda bot, update: asyncio.sleep(1))
+        self.assertFalse(
+            self.run_loop(self.bot.insert_update(self.mg.get_message(), timeout=.05)))
+
+    def test_attached_updater(self):
+        def start(bot, update):
+            bot.sendMessage(update.message.chat_id, "started")
+
+        updater = Updater(workers=2, bot=self.bot.mockbot)
+        updater.dispatcher.add_handler(CommandHandler("start", start))
+        self.bot.attach(updater)
+        updater.start_polling()
+        self.assertTrue(
+            self.run_loop(self.bot.insert_update(self.mg.get_message(text="/start"))))
+        self.assertEqual(self.bot.sent_messages[-1]['text'], "started")
+        updater.stop()
+
+    def test_get_updates(self):
+        self.bot.mockbot._updates.put(self.mg.get_message())
+        self.assertEqual(len(self.run_loop(self.bot.get_updates(timeout=.1))), 1)
+        self.assertEqual(self.run_loop(self.bot.get_updates(offset=100)), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
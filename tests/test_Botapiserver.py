@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+# pylint: disable=E0611,E0213,E1102,C0103,E1101,W0613,R0913,R0904
+#
+# A library that provides a testing suite fot python-telegram-bot
+# wich can be found on https://github.com/python-telegram-bot/python-telegram-bot
+# Copyright (C) 2017
+# Pieter Schutz - https://github.com/eldinnie
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser Public License for more details.
+#
+# You should have received a copy of the GNU Lesser Public License
+# along with this program.  If not, see [http://www.gnu.org/licenses/].
+from __future__ import absolute_import
+import json
+import unittest
+
+import telegram
+from telegram import (InlineKeyboardButton, InlineKeyboardMarkup, InlineQueryResultArticle,
+                      InputTextMessageContent)
+from telegram.error import (InvalidToken, RetryAfter)
+from telegram.ext import Updater, CommandHandler
+
+from ptbtest import BotApiServer
+from ptbtest import MessageGenerator
+from ptbtest import Mockbot
+
+try:
+    from urllib.request import urlopen
+except ImportError:
+    from urllib2 import urlopen
+
+
+class TestBotApiServer(unittest.TestCase):
+    def setUp(self):
+        self.server = BotApiServer().start()
+        self.bot = telegram.Bot("123:token", base_url=self.server.base_url)
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_methods(self):
+        self.assertEqual(self.bot.getMe().username, "MockBot")
+        keyboard = InlineKeyboardMarkup([[InlineKeyboardButton("a", callback_data="b")]])
+        message = self.bot.sendMessage(5, "hello", reply_markup=keyboard)
+        self.assertEqual(message.text, "hello")
+        self.assertEqual(message.chat.id, 5)
+        edited = self.bot.editMessageText("bye", chat_id=5, message_id=message.message_id)
+        self.assertEqual(edited.message_id, message.message_id)
+        self.assertEqual(self.server.bot.message_store.get(5, message.message_id).text, "bye")
+        self.assertTrue(self.bot.answerCallbackQuery("query"))
+        self.assertTrue(self.bot.sendChatAction(5, "typing"))
+        self.assertEqual(self.bot.getChat(5).id, 5)
+        self.assertEqual(self.bot.getChatMember(5, 7).user.id, 7)
+        self.assertEqual(self.bot.getChatMembersCount(5), 1)
+        sent = self.server.bot.sent_messages
+        self.assertEqual([m['method'] for m in sent],
+                         ["sendMessage", "editMessageText", "answerCallbackQuery",
+                          "sendChatAction", "getChat", "getChatMember", "getChatMembersCount"])
+        self.assertEqual(json.loads(sent[0]['reply_markup']), keyboard.to_dict())
+
+    def test_inline_query(self):
+        results = [InlineQueryResultArticle("1", "title", InputTextMessageContent("text"))]
+        self.assertTrue(self.bot.answerInlineQuery("query", results, cache_time=0))
+        sent = self.server.bot.sent_messages[-1]
+        self.assertEqual(sent['method'], "answerInlineQuery")
+        self.assertEqual(sent['results'], [results[0].to_dict()])
+
+    def test_errors(self):
+        status, response = self.server.call("sendMessage", {"chat_id": 5})
+        self.assertEqual(status, 400)
+        self.assertFalse(response['ok'])
+        status, response = self.server.call("answerInlineQuery", {"inline_query_id": "1", "results": [1]})
+        self.assertEqual(status, 500)
+        self.assertEqual(response['error_code'], 500)
+        with self.assertRaises(InvalidToken):
+            self.bot._request.post(self.bot.base_url + "/doesNotExist", {})
+
+    def test_flood_control(self):
+        server = BotApiServer(Mockbot(flood_control=True)).start()
+        bot = telegram.Bot("123:token", base_url=server.base_url)
+        bot.sendMessage(5, "one")
+        with self.assertRaises(RetryAfter) as cm:
+            bot.sendMessage(5, "two")
+        self.assertEqual(cm.exception.retry_after, 1)
+        server.stop()
+
+    def test_query_parameters(self):
+        url = "{0}123:token/sendMessage?chat_id=12&text=hi".format(self.server.base_url)
+        response = json.loads(urlopen(url).read().decode('utf-8'))
+        self.assertTrue(response['ok'])
+        self.assertEqual(self.server.bot.sent_messages[-1]['chat_id'], 12)
+
+    def test_updater(self):
+        def start(bot, update):
+            bot.sendMessage(update.message.chat_id, "started")
+
+        updater = Updater(bot=self.bot)
+        updater.dispatcher.add_handler(CommandHandler("start", start))
+        self.server.bot.attach(updater)
+        updater.start_polling(poll_interval=0)
+        update = MessageGenerator(bot=self.server.bot).get_message(text="/start")
+        self.assertTrue(self.server.bot.insertUpdate(update))
+        self.assertEqual(self.server.bot.sent_messages[-1]['text'], "started")
+        self.assertEqual(self.server.bot.sent_messages[-1]['chat_id'],
+                         update.message.chat.id)
+        updater.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
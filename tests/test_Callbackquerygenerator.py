@@ -73,6 +73,12 @@ class TestMessageGeneratorChannelPost(unittest.TestCase):
         self.assertEqual(u.callback_query.message.from_user.username,
                          self.cqg.bot.username)
 
+        user = self.cqg.ug.get_user()
+        sent = self.cqg.bot.sendMessage(user.id, "hi")
+        u = self.cqg.get_callback_query(user=user, message=True, data="test-data")
+        self.assertEqual(u.callback_query.message.chat.id, user.id)
+        self.assertNotEqual(u.callback_query.message.message_id, sent.message_id)
+
         with self.assertRaises(BadMessageException):
             self.cqg.get_callback_query(message="message", data="test-data")
 
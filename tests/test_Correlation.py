@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+# pylint: disable=E0611,E0213,E1102,C0103,E1101,W0613,R0913,R0904
+#
+# A library that provides a testing suite fot python-telegram-bot
+# wich can be found on https://github.com/python-telegram-bot/python-telegram-bot
+# Copyright (C) 2017
+# Pieter Schutz - https://github.com/eldinnie
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser Public License for more details.
+#
+# You should have received a copy of the GNU Lesser Public License
+# along with this program.  If not, see [http://www.gnu.org/licenses/].
+from __future__ import absolute_import
+import threading
+import unittest
+
+from telegram import Update
+from telegram.ext import (CallbackQueryHandler, CommandHandler, Updater)
+
+from ptbtest import CallbackQueryGenerator
+from ptbtest import MessageGenerator
+from ptbtest import Mockbot
+from ptbtest import VirtualClock
+from ptbtest.correlation import (ResponseTimes, current_update_id, reset_update_id, set_update_id,
+                                 update_type)
+from ptbtest.latency import (ConstantLatency, LatencyModel)
+
+
+class TestCorrelation(unittest.TestCase):
+    def setUp(self):
+        latency = LatencyModel(methods={'sendMessage': ConstantLatency(.5),
+                                        'answerCallbackQuery': ConstantLatency(.25)})
+        self.bot = Mockbot(clock=VirtualClock(), latency=latency, response_times=True)
+        self.mg = MessageGenerator(bot=self.bot)
+        self.updater = Updater(workers=2, bot=self.bot)
+        self.bot.attach(self.updater)
+
+    def tearDown(self):
+        self.updater.stop()
+
+    def start(self):
+        dp = self.updater.dispatcher
+
+        def start(bot, update):
+            bot.sendMessage(update.message.chat_id, "hello")
+            bot.sendMessage(update.message.chat_id, "again")
+
+        def button(bot, update):
+            bot.answerCallbackQuery(update.callback_query.id)
+
+        dp.add_handler(CommandHandler("start", start))
+        dp.add_handler(CommandHandler("quiet", lambda bot, update: None))
+        dp.add_handler(CallbackQueryHandler(button))
+        self.updater.start_polling()
+
+    def test_calls_tagged_with_update(self):
+        self.start()
+        self.bot.sendMessage(1, "outside")
+        first = self.mg.get_message(text="/start")
+        second = self.mg.get_message(text="/start")
+        self.assertTrue(self.bot.insertUpdate(first))
+        self.assertTrue(self.bot.insertUpdate(second))
+        self.assertIsNone(self.bot.sent_messages[0].update_id)
+        tagged = self.bot.sent_messages.by_update_id(first.update_id)
+        self.assertEqual([r['text'] for r in tagged], ["hello", "again"])
+        self.assertEqual(len(self.bot.sent_messages.filter(update_id=second.update_id)), 2)
+        self.assertEqual(tagged[0], {'chat_id': first.message.chat_id, 'text': "hello",
+                                     'method': "sendMessage"})
+        self.assertIsNone(current_update_id())
+
+    def test_report(self):
+        self.start()
+        for _ in range(3):
+            self.assertTrue(self.bot.insertUpdate(self.mg.get_message(text="/start")))
+        self.assertTrue(self.bot.insertUpdate(self.mg.get_message(text="/quiet")))
+        query = CallbackQueryGenerator(bot=self.bot).get_callback_query(message=True, data="x")
+        self.assertTrue(self.bot.insertUpdate(query))
+        report = self.bot.response_times.report()
+        self.assertEqual(report['message']['count'], 4)
+        self.assertEqual(report['message']['unanswered'], 1)
+        self.assertAlmostEqual(report['message']['first_response']['p50'], .5)
+        self.assertAlmostEqual(report['message']['handling']['p95'], 1.)
+        self.assertAlmostEqual(report['callback_query']['first_response']['p99'], .25)
+        self.assertEqual(report['all']['count'], 5)
+        self.assertAlmostEqual(report['all']['handling']['p50'], 1.)
+        self.assertEqual(len(self.bot.response_times.updates), 5)
+        update_id, kind, first, handling = self.bot.response_times.updates[-1]
+        self.assertEqual((update_id, kind), (query.update_id, 'callback_query'))
+
+    def test_not_timed_without_dispatcher(self):
+        bot = Mockbot(response_times=True)
+        bot.insertUpdates([self.mg.get_message() for _ in range(3)])
+        self.assertEqual(bot.response_times._pending, {})
+        self.assertEqual(bot.response_times.report(), {})
+
+    def test_context_is_per_thread(self):
+        seen = []
+        token = set_update_id(7)
+        thread = threading.Thread(target=lambda: seen.append(current_update_id()))
+        thread.start()
+        thread.join()
+        self.assertEqual(current_update_id(), 7)
+        reset_update_id(token)
+        self.assertEqual(seen, [None])
+        self.assertIsNone(current_update_id())
+
+    def test_response_times(self):
+        times = ResponseTimes(max_updates=2)
+        for update_id in range(4):
+            update = Update(update_id, message=self.mg.get_message().message)
+            times.inserted(update, 10.)
+            times.responded(update_id, 10. + update_id)
+            times.responded(update_id, 20.)
+            times.processed(update_id, 30.)
+        times.processed(99, 30.)
+        self.assertEqual(len(times.updates), 2)
+        report = times.report()
+        self.assertEqual(report['message']['count'], 4)
+        self.assertEqual(report['message']['first_response'], {'p50': 1., 'p95': 3., 'p99': 3.})
+        self.assertEqual(update_type(Update(1)), None)
+        times.reset()
+        self.assertEqual(times.report(), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
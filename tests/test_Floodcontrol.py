@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# pylint: disable=E0611,E0213,E1102,C0103,E1101,W0613,R0913,R0904
+#
+# A library that provides a testing suite fot python-telegram-bot
+# wich can be found on https://github.com/python-telegram-bot/python-telegram-bot
+# Copyright (C) 2017
+# Pieter Schutz - https://github.com/eldinnie
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser Public License for more details.
+#
+# You should have received a copy of the GNU Lesser Public License
+# along with this program.  If not, see [http://www.gnu.org/licenses/].
+from __future__ import absolute_import
+import unittest
+
+from telegram.error import RetryAfter
+
+from ptbtest import ChatGenerator
+from ptbtest import Mockbot
+from ptbtest import VirtualClock
+from ptbtest.floodcontrol import FloodControl
+
+
+class TestFloodControl(unittest.TestCase):
+    def setUp(self):
+        self.clock = VirtualClock(start=1000)
+        self.bot = Mockbot(flood_control=True, clock=self.clock)
+
+    def test_chat_limit(self):
+        self.bot.sendMessage(1, "one")
+        with self.assertRaises(RetryAfter) as cm:
+            self.bot.sendMessage(1, "two")
+        self.assertEqual(cm.exception.retry_after, 1)
+        self.assertEqual(len(self.bot.sent_messages), 1)
+        self.bot.sendChatAction(1, "typing")
+        self.bot.sendMessage(2, "other chat")
+        self.clock.advance(1)
+        self.bot.sendMessage(1, "two")
+        stats = self.bot.flood_control.stats
+        self.assertEqual(stats['allowed'], 3)
+        self.assertEqual(stats['throttled'], 1)
+        self.assertEqual(stats['throttled_by']['chat'], 1)
+        self.assertAlmostEqual(stats['max_retry_after'], 1)
+
+    def test_group_limit(self):
+        group = ChatGenerator(registry=self.bot.registry).get_chat(type="group")
+        # one message a second keeps the chat limit, the group allows 20 at once and one every 3 seconds after
+        for i in range(29):
+            self.bot.sendMessage(group.id, str(i))
+            self.clock.advance(1)
+        with self.assertRaises(RetryAfter) as cm:
+            self.bot.sendMessage(group.id, "too many")
+        self.assertEqual(cm.exception.retry_after, 1)
+        self.assertEqual(self.bot.flood_control.stats['throttled_by']['group'], 1)
+        self.clock.advance(2)
+        with self.assertRaises(RetryAfter):
+            self.bot.sendMessage(-5, "new group")
+            self.bot.sendMessage(-5, "again")
+
+    def test_global_limit(self):
+        for i in range(30):
+            self.bot.sendMessage(i + 1, "hello")
+        with self.assertRaises(RetryAfter) as cm:
+            self.bot.sendMessage(100, "hello")
+        self.assertEqual(cm.exception.retry_after, 1)
+        self.assertEqual(self.bot.flood_control.stats['throttled_by']['global'], 1)
+        self.clock.advance(.5)
+        for i in range(15):
+            self.bot.sendMessage(i + 200, "hello")
+        self.assertRaises(RetryAfter, self.bot.sendMessage, 300, "hello")
+
+    def test_inline_edits(self):
+        for i in range(30):
+            self.bot.editMessageText(text="edit", inline_message_id="abc")
+        self.assertRaises(RetryAfter, self.bot.editMessageText,
+                          text="edit", inline_message_id="abc")
+
+    def test_custom_limits(self):
+        bot = Mockbot(flood_control=FloodControl(chat_rate=.1, chat_burst=3),
+                      clock=self.clock)
+        for i in range(3):
+            bot.sendMessage(1, "burst")
+        with self.assertRaises(RetryAfter) as cm:
+            bot.sendMessage(1, "over")
+        self.assertEqual(cm.exception.retry_after, 10)
+        bot.flood_control.reset_stats()
+        self.assertEqual(bot.flood_control.stats['throttled'], 0)
+
+    def test_prune(self):
+        fc = FloodControl()
+        fc.PRUNE_SIZE = 10
+        for i in range(10):
+            fc.acquire(i, False, i * 2.)
+        fc.acquire(100, False, 100.)
+        self.assertEqual(len(fc._chats), 1)
+
+    def test_disabled(self):
+        bot = Mockbot()
+        self.assertIsNone(bot.flood_control)
+        for i in range(100):
+            bot.sendMessage(1, "hello")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+# pylint: disable=E0611,E0213,E1102,C0103,E1101,W0613,R0913,R0904
+#
+# A library that provides a testing suite fot python-telegram-bot
+# wich can be found on https://github.com/python-telegram-bot/python-telegram-bot
+# Copyright (C) 2017
+# Pieter Schutz - https://github.com/eldinnie
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser Public License for more details.
+#
+# You should have received a copy of the GNU Lesser Public License
+# along with this program.  If not, see [http://www.gnu.org/licenses/].
+from __future__ import absolute_import
+import threading
+import unittest
+
+from ptbtest import ChatGenerator
+from ptbtest import MessageGenerator
+from ptbtest import Mockbot
+from ptbtest import UserGenerator
+from ptbtest.ids import (IdAllocator, IdCounter, IdSpace)
+
+
+class TestIds(unittest.TestCase):
+    def test_every_id_once(self):
+        allocator = IdAllocator(-500, 499, seed=1)
+        ids = [allocator.allocate() for _ in range(1000)]
+        self.assertEqual(sorted(ids), list(range(-500, 500)))
+        self.assertNotEqual(ids, sorted(ids))
+        with self.assertRaises(ValueError):
+            allocator.allocate()
+
+    def test_workers_do_not_collide(self):
+        seen = []
+        for worker in range(3):
+            allocator = IdAllocator(1, 100, worker=worker, workers=3)
+            seen.extend(allocator.allocate() for _ in range(len(range(worker, 100, 3))))
+            with self.assertRaises(ValueError):
+                allocator.allocate()
+        self.assertEqual(sorted(seen), list(range(1, 101)))
+        with self.assertRaises(ValueError):
+            IdAllocator(1, 100, worker=3, workers=3)
+
+    def test_reserve(self):
+        allocator = IdAllocator(1, 10, seed=2)
+        for id in (3, 4, 50):
+            allocator.reserve(id)
+        ids = [allocator.allocate() for _ in range(8)]
+        self.assertEqual(sorted(ids), [1, 2, 5, 6, 7, 8, 9, 10])
+        self.assertNotIn(50, allocator)
+
+    def test_id_space(self):
+        ids = IdSpace(seed=3)
+        self.assertTrue(ids.gen_id() >= 10000)
+        self.assertTrue(ids.gen_id(group=True) < 0)
+        self.assertEqual(IdSpace(seed=3).gen_id(), IdSpace(seed=3).gen_id())
+
+    def test_generators_share_ids(self):
+        bot = Mockbot()
+        mg = MessageGenerator(bot=bot)
+        self.assertIs(mg.ids, bot.mg.ids)
+        self.assertIs(mg.cg.ids, mg.ug.ids)
+        users = set(mg.ug.get_user().id for _ in range(20000))
+        users.update(bot.cg.get_chat().id for _ in range(1000))
+        self.assertEqual(len(users), 21000)
+        ug = UserGenerator(ids=mg.ids)
+        ug.get_user(id=77777)
+        self.assertNotIn(77777, set(mg.ug.get_user().id for _ in range(1000)))
+
+    def test_split_between_workers(self):
+        chats = set()
+        for worker in range(4):
+            cg = ChatGenerator(ids=IdSpace(seed=9, worker=worker, workers=4))
+            chats.update(cg.get_chat(type="group").id for _ in range(500))
+        self.assertEqual(len(chats), 2000)
+
+
+class TestIdCounters(unittest.TestCase):
+    THREADS = 16
+    PER_THREAD = 500
+
+    def run_threads(self, work):
+        results = [[] for _ in range(self.THREADS)]
+        start = threading.Event()
+
+        def run(result):
+            start.wait()
+            for _ in range(self.PER_THREAD):
+                result.append(work())
+
+        threads = [threading.Thread(target=run, args=(r, )) for r in results]
+        for thread in threads:
+            thread.start()
+        start.set()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def assertUniqueAndIncreasing(self, results):
+        for result in results:
+            self.assertEqual(result, sorted(result))
+            self.assertEqual(len(set(result)), len(result))
+        merged = sorted(id for result in results for id in result)
+        self.assertEqual(len(set(merged)), len(merged))
+
+    def test_counter(self):
+        counter = IdCounter(start=10)
+        results = self.run_threads(lambda: next(counter))
+        self.assertUniqueAndIncreasing(results)
+        total = self.THREADS * self.PER_THREAD
+        self.assertEqual(sorted(id for r in results for id in r), list(range(10, 10 + total)))
+        self.assertEqual(counter.last, 10 + total - 1)
+
+    def test_generated_updates(self):
+        bot = Mockbot()
+        mg = MessageGenerator(bot=bot)
+        updates = self.run_threads(mg.get_message)
+        self.assertUniqueAndIncreasing([[u.update_id for u in r] for r in updates])
+        self.assertUniqueAndIncreasing([[u.message.message_id for u in r] for r in updates])
+
+    def test_sent_messages(self):
+        bot = Mockbot()
+        messages = self.run_threads(lambda: bot.sendMessage(1, "load"))
+        self.assertUniqueAndIncreasing([[m.message_id for m in r] for r in messages])
+        self.assertEqual(len(bot.sent_messages), self.THREADS * self.PER_THREAD)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -49,6 +49,13 @@ class TestInlineQueryGenerator(unittest.TestCase):
         with self.assertRaises(BadBotException):
             iqg3 = InlineQueryGenerator(bot="bot")
 
+    def test_seed(self):
+        updates = [InlineQueryGenerator(seed=3).get_inline_query(location=True) for _ in range(2)]
+        self.assertEqual(updates[0].inline_query.id, updates[1].inline_query.id)
+        self.assertEqual(updates[0].inline_query.location.latitude,
+                         updates[1].inline_query.location.latitude)
+        self.assertEqual(updates[0].inline_query.from_user.id, updates[1].inline_query.from_user.id)
+
     def test_with_user(self):
         ug = UserGenerator()
         user = ug.get_user()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# pylint: disable=E0611,E0213,E1102,C0103,E1101,W0613,R0913,R0904
+#
+# A library that provides a testing suite fot python-telegram-bot
+# wich can be found on https://github.com/python-telegram-bot/python-telegram-bot
+# Copyright (C) 2017
+# Pieter Schutz - https://github.com/eldinnie
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser Public License for more details.
+#
+# You should have received a copy of the GNU Lesser Public License
+# along with this program.  If not, see [http://www.gnu.org/licenses/].
+from __future__ import absolute_import
+import random
+import threading
+import time
+import unittest
+
+from ptbtest import Mockbot
+from ptbtest import VirtualClock
+from ptbtest.latency import (ConstantLatency, HistogramLatency, LatencyModel,
+                             LogNormalLatency, NormalLatency)
+
+
+class TestLatency(unittest.TestCase):
+    def setUp(self):
+        self.rng = random.Random(1)
+
+    def test_distributions(self):
+        self.assertEqual(ConstantLatency(.2).sample(self.rng), .2)
+        normal = [NormalLatency(.1, .5).sample(self.rng) for _ in range(1000)]
+        self.assertEqual(min(normal), 0)
+        lognormal = sorted(LogNormalLatency(.1, .5).sample(self.rng) for _ in range(1000))
+        self.assertTrue(.08 < lognormal[500] < .12)
+        self.assertTrue(min(lognormal) > 0)
+
+    def test_histogram(self):
+        hist = HistogramLatency([.1, .2, .4], [0, 3, 1])
+        samples = [hist.sample(self.rng) for _ in range(1000)]
+        self.assertTrue(all(.1 <= x <= .4 for x in samples))
+        slow = len([x for x in samples if x > .2])
+        self.assertTrue(150 < slow < 350)
+        self.assertRaises(ValueError, HistogramLatency, [.1], [0])
+        self.assertRaises(ValueError, HistogramLatency, [.1, .2], [1])
+
+    def test_model(self):
+        model = LatencyModel(default=ConstantLatency(.3),
+                             methods={'getUpdates': ConstantLatency(.01)})
+        self.assertEqual(model.sample('sendMessage'), .3)
+        self.assertEqual(model.sample('getUpdates'), .01)
+        self.assertEqual(LatencyModel().sample('sendMessage'), 0)
+        a = LatencyModel(default=LogNormalLatency(.1, 1), seed=5)
+        b = LatencyModel(default=LogNormalLatency(.1, 1), seed=5)
+        self.assertEqual([a.sample('x') for _ in range(5)],
+                         [b.sample('x') for _ in range(5)])
+
+    def test_mockbot_sleeps(self):
+        bot = Mockbot(latency=ConstantLatency(.1))
+        start = time.time()
+        bot.sendMessage(1, "slow")
+        bot.answerCallbackQuery(1)
+        self.assertTrue(time.time() - start >= .2)
+        start = time.time()
+        bot.getMe()
+        self.assertTrue(time.time() - start < .1)
+
+    def test_mockbot_virtual_clock(self):
+        clock = VirtualClock(start=0)
+        bot = Mockbot(latency=LatencyModel(methods={'sendMessage': ConstantLatency(60),
+                                                    'getUpdates': ConstantLatency(2)}),
+                      clock=clock)
+        start = time.time()
+        bot.sendMessage(1, "slow")
+        bot.getUpdates()
+        bot.editMessageText(text="fast", chat_id=1, message_id=1)
+        self.assertEqual(clock.time(), 60)
+        self.assertTrue(time.time() - start < 1)
+        thread = threading.Thread(target=bot.sendMessage, args=(1, "elsewhere"))
+        thread.start()
+        thread.join()
+        self.assertEqual(clock.time(), 60)
+
+
+if __name__ == '__main__':
+    unittest.main()
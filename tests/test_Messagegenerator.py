@@ -571,5 +571,26 @@ class TestMessageGeneratorEditedChannelPost(unittest.TestCase):
             self.mg.get_edited_channel_post(channel_post="Message")
 
 
+class TestMessageGeneratorSeed(unittest.TestCase):
+    def test_same_seed_same_messages(self):
+        def generate():
+            mg = MessageGenerator(seed=42)
+            return [mg.get_message(photo=True).message, mg.get_message(sticker=True).message,
+                    mg.get_message(chat=mg.cg.get_chat(type="group")).message]
+
+        first, second = generate(), generate()
+        self.assertEqual(first[0].photo[0].file_id, second[0].photo[0].file_id)
+        self.assertEqual(first[1].sticker.file_id, second[1].sticker.file_id)
+        self.assertEqual(first[2].chat.id, second[2].chat.id)
+        self.assertEqual(first[2].from_user.to_dict(), second[2].from_user.to_dict())
+
+    def test_uuid(self):
+        mg = MessageGenerator(seed=1)
+        file_id = mg.gen_uuid()
+        self.assertEqual(len(file_id), 36)
+        self.assertEqual(file_id[14], "4")
+        self.assertNotEqual(file_id, mg.gen_uuid())
+
+
 if __name__ == '__main__':
     unittest.main()
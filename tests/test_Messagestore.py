@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+# pylint: disable=E0611,E0213,E1102,C0103,E1101,W0613,R0913,R0904
+#
+# A library that provides a testing suite fot python-telegram-bot
+# wich can be found on https://github.com/python-telegram-bot/python-telegram-bot
+# Copyright (C) 2017
+# Pieter Schutz - https://github.com/eldinnie
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser Public License for more details.
+#
+# You should have received a copy of the GNU Lesser Public License
+# along with this program.  If not, see [http://www.gnu.org/licenses/].
+from __future__ import absolute_import
+import unittest
+
+from telegram import (InlineKeyboardButton, InlineKeyboardMarkup)
+
+from ptbtest import CallbackQueryGenerator
+from ptbtest import ChatGenerator
+from ptbtest import MessageGenerator
+from ptbtest import Mockbot
+from ptbtest.messagestore import MessageStore
+
+
+class TestMessageStore(unittest.TestCase):
+    def setUp(self):
+        self.bot = Mockbot()
+        self.mg = MessageGenerator(bot=self.bot)
+
+    def test_lru_bound(self):
+        store = MessageStore(capacity=2)
+        store.add("a", chat_id=1, message_id=1)
+        store.add("b", chat_id=1, message_id=2)
+        self.assertEqual(store.get(chat_id=1, message_id=1), "a")
+        store.add("c", inline_message_id="x")
+        self.assertEqual(len(store), 2)
+        self.assertIsNone(store.get(chat_id=1, message_id=2))
+        self.assertEqual(store.get(inline_message_id="x"), "c")
+        store.clear()
+        self.assertEqual(len(store), 0)
+
+    def test_edit_sent_message(self):
+        sent = self.bot.sendMessage(1, "first")
+        keyboard = InlineKeyboardMarkup([[InlineKeyboardButton("b", callback_data="d")]])
+        edited = self.bot.editMessageText(
+            chat_id=1, message_id=sent.message_id, text="*second*",
+            parse_mode="Markdown", reply_markup=keyboard)
+        self.assertIs(edited, sent)
+        self.assertEqual(sent.text, "second")
+        self.assertEqual(len(sent.entities), 1)
+        self.assertIs(sent.reply_markup, keyboard)
+        self.assertIsNotNone(sent.edit_date)
+        self.assertEqual(self.bot.sent_messages[-1]['method'], "editMessageText")
+
+    def test_edit_inline_message(self):
+        first = self.bot.editMessageText(text="one", inline_message_id="abc")
+        second = self.bot.editMessageText(text="two", inline_message_id="abc")
+        self.assertIs(first, second)
+        self.assertEqual(first.text, "two")
+
+    def test_edit_seen_message(self):
+        photo = self.mg.get_message(photo=True, caption="old")
+        self.bot.message_store.add_update(photo)
+        msg = photo.message
+        self.bot.editMessageCaption(chat_id=msg.chat.id,
+                                    message_id=msg.message_id, caption="new")
+        self.assertEqual(msg.caption, "new")
+
+    def test_reply_to_real_message(self):
+        chat = ChatGenerator().get_chat(type="group")
+        u = self.mg.get_message(chat=chat, text="question")
+        self.bot.insertUpdate(u)
+        reply = self.bot.sendMessage(chat.id, "answer",
+                                     reply_to_message_id=u.message.message_id)
+        self.assertIs(reply.reply_to_message, u.message)
+        own = self.bot.sendMessage(chat.id, "first")
+        reply = self.bot.sendMessage(chat.id, "second",
+                                     reply_to_message_id=own.message_id)
+        self.assertEqual(reply.reply_to_message.text, "first")
+
+    def test_callback_query_message(self):
+        sent = self.bot.sendMessage(5, "pick one")
+        cqg = CallbackQueryGenerator(bot=self.bot)
+        u = cqg.get_callback_query(message=sent, data="x")
+        self.bot.message_store.add_update(u)
+        self.assertIs(self.bot.message_store.get(5, sent.message_id), sent)
+
+        reply = self.bot.sendMessage(5, "pick again", reply_to_message_id=sent.message_id)
+        self.bot.message_store.add_updates([cqg.get_callback_query(message=reply, data="y")])
+        self.assertEqual(self.bot.message_store.get(5, reply.message_id).reply_to_message.text, "pick one")
+
+    def test_forward_real_message(self):
+        u = self.mg.get_message(text="forward me")
+        self.bot.message_store.add_update(u)
+        fwd = self.bot.forwardMessage(99, u.message.chat.id, u.message.message_id)
+        self.assertEqual(fwd.text, "forward me")
+        self.assertIs(fwd.forward_from, u.message.from_user)
+        self.assertIsNone(fwd.forward_from_chat)
+        self.assertEqual(fwd.chat.id, 99)
+
+        post = self.mg.get_channel_post(text="news")
+        self.bot.message_store.add_update(post)
+        fwd = self.bot.forwardMessage(99, post.channel_post.chat.id,
+                                      post.channel_post.message_id)
+        self.assertIs(fwd.forward_from_chat, post.channel_post.chat)
+        self.assertEqual(fwd.forward_from_message_id,
+                         post.channel_post.message_id)
+
+    def test_forward_taken_at_send_time(self):
+        bot = Mockbot(max_stored_messages=2)
+        original = bot.sendMessage(5, "orig")
+        fwd = bot.forwardMessage(6, 5, original.message_id)
+        reply = bot.sendMessage(5, "answer", reply_to_message_id=original.message_id)
+        bot.editMessageText("edited", chat_id=5, message_id=original.message_id)
+        bot.sendMessage(7, "pushes the original out")
+        bot.sendMessage(7, "and the forward")
+        self.assertEqual(fwd.text, "orig")
+        self.assertIs(reply.reply_to_message, original)
+
+    def test_bounded_mockbot(self):
+        bot = Mockbot(max_stored_messages=3)
+        for i in range(10):
+            bot.sendMessage(1, str(i))
+        self.assertEqual(len(bot.message_store), 3)
+        self.assertEqual(Mockbot(max_sent_messages=5).message_store.capacity, 5)
+        self.assertEqual(Mockbot(max_sent_messages=5, max_stored_messages=8).message_store.capacity, 8)
+
+
+if __name__ == '__main__':
+    unittest.main()
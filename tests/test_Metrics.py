@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# pylint: disable=E0611,E0213,E1102,C0103,E1101,W0613,R0913,R0904
+#
+# A library that provides a testing suite fot python-telegram-bot
+# wich can be found on https://github.com/python-telegram-bot/python-telegram-bot
+# Copyright (C) 2017
+# Pieter Schutz - https://github.com/eldinnie
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser Public License for more details.
+#
+# You should have received a copy of the GNU Lesser Public License
+# along with this program.  If not, see [http://www.gnu.org/licenses/].
+from __future__ import absolute_import
+import unittest
+
+from telegram import InlineQueryResultArticle, InputTextMessageContent
+from telegram.error import RetryAfter
+
+from ptbtest import MessageGenerator
+from ptbtest import Mockbot
+from ptbtest.latency import ConstantLatency
+from ptbtest.metrics import (Histogram, Metrics)
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        self.bot = Mockbot(metrics=True)
+
+    def test_histogram(self):
+        hist = Histogram((1, 2, 4))
+        for value in (.5, 1, 1.5, 3, 10):
+            hist.observe(value)
+        self.assertEqual(hist.counts, [2, 1, 1, 1])
+        self.assertEqual(hist.count, 5)
+        self.assertEqual(hist.sum, 16)
+        self.assertEqual(hist.percentile(40), 1)
+        self.assertEqual(hist.percentile(60), 2)
+        self.assertEqual(hist.percentile(100), 10)
+        self.assertIsNone(Histogram((1,)).percentile(50))
+
+    def test_counts_calls(self):
+        self.bot.sendMessage(1, "hello")
+        self.bot.send_message(1, "a much longer message " * 20)
+        self.bot.answerCallbackQuery("query")
+        result = InlineQueryResultArticle("1", "title", InputTextMessageContent("text"))
+        self.bot.answerInlineQuery("query", [result])
+        methods = self.bot.metrics.to_dict()['methods']
+        self.assertEqual(methods['sendMessage']['calls'], 2)
+        self.assertEqual(methods['sendMessage']['payload_bytes']['count'], 2)
+        self.assertTrue(methods['sendMessage']['payload_bytes']['max'] > 400)
+        self.assertEqual(methods['answerCallbackQuery']['calls'], 1)
+        self.assertTrue(methods['answerInlineQuery']['payload_bytes']['sum'] > 50)
+        self.assertNotIn('getMe', methods)
+        self.assertEqual(len(self.bot.sent_messages), 4)
+
+    def test_wall_and_cpu(self):
+        bot = Mockbot(metrics=True, latency=ConstantLatency(.05))
+        bot.sendMessage(1, "slow")
+        method = bot.metrics.methods['sendMessage']
+        self.assertTrue(method.wall.sum >= .05)
+        self.assertTrue(method.cpu.sum < .05)
+
+    def test_errors(self):
+        bot = Mockbot(metrics=True, flood_control=True)
+        bot.sendMessage(1, "one")
+        self.assertRaises(RetryAfter, bot.sendMessage, 1, "two")
+        method = bot.metrics.methods['sendMessage']
+        self.assertEqual((method.calls, method.errors), (2, 1))
+
+    def test_polls(self):
+        mg = MessageGenerator(bot=self.bot)
+        self.bot.getUpdates()
+        self.bot._updates.put(mg.get_message())
+        self.bot._updates.put(mg.get_message())
+        self.bot.getUpdates()
+        polls = self.bot.metrics.to_dict()['polls']
+        self.assertEqual(polls['empty'], 1)
+        self.assertEqual(polls['updates']['count'], 2)
+        self.assertEqual(polls['updates']['sum'], 2)
+        self.assertEqual(self.bot.metrics.methods['getUpdates'].calls, 2)
+
+    def test_prometheus(self):
+        self.bot.sendMessage(1, "hello")
+        self.bot.getUpdates()
+        text = self.bot.metrics.to_prometheus()
+        lines = text.splitlines()
+        self.assertIn('ptbtest_calls_total{method="sendMessage"} 1', lines)
+        self.assertIn('# TYPE ptbtest_call_seconds histogram', lines)
+        self.assertIn('ptbtest_call_seconds_bucket{method="sendMessage",le="+Inf"} 1', lines)
+        self.assertIn('ptbtest_call_seconds_count{method="sendMessage"} 1', lines)
+        self.assertIn('ptbtest_poll_updates_bucket{le="0"} 1', lines)
+        self.assertIn('ptbtest_empty_polls_total 1', lines)
+        self.assertTrue(text.endswith('\n'))
+        self.assertIn('custom_calls_total', self.bot.metrics.to_prometheus(prefix='custom'))
+
+    def test_disabled(self):
+        bot = Mockbot()
+        self.assertIsNone(bot.metrics)
+        self.assertNotIn('sendMessage', vars(bot))
+        shared = Metrics()
+        Mockbot(metrics=shared).sendMessage(1, "a")
+        Mockbot(metrics=shared).sendMessage(1, "b")
+        self.assertEqual(shared.methods['sendMessage'].calls, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
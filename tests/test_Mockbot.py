@@ -20,6 +20,8 @@
 # along with this program.  If not, see [http://www.gnu.org/licenses/].
 from __future__ import absolute_import
 
+import datetime
+import time
 import unittest
 
 import telegram
@@ -31,6 +33,8 @@ from telegram import User, Message, Chat, Update
 from telegram.ext import Updater, CommandHandler
 
 from ptbtest import Mockbot
+from ptbtest import VirtualClock
+from ptbtest.errors import BadMarkupException
 
 
 class TestMockbot(unittest.TestCase):
@@ -68,6 +72,73 @@ class TestMockbot(unittest.TestCase):
         self.assertEqual(data['chat_id'], chat.id)
         updater.stop()
 
+    def test_insertUpdate_waits_for_attached_dispatcher(self):
+        def start(bot, update):
+            time.sleep(.5)
+            bot.sendMessage(update.message.chat_id, "slow")
+
+        def stuck(bot, update):
+            time.sleep(1)
+
+        updater = Updater(workers=2, bot=self.mockbot)
+        dp = updater.dispatcher
+        dp.add_handler(CommandHandler("start", start))
+        dp.add_handler(CommandHandler("stuck", stuck), group=1)
+        self.mockbot.attach(updater)
+        updater.start_polling()
+        user = User(id=1, first_name="test")
+        chat = Chat(45, "group")
+        message = Message(
+            404, user, None, chat, text="/start", bot=self.mockbot)
+        self.assertTrue(self.mockbot.insertUpdate(Update(0, message=message)))
+        self.assertEqual(len(self.mockbot.sent_messages), 1)
+        message = Message(
+            405, user, None, chat, text="/stuck", bot=self.mockbot)
+        self.assertFalse(
+            self.mockbot.insertUpdate(Update(1, message=message), timeout=.1))
+        updater.stop()
+
+    def test_insertUpdates(self):
+        def start(bot, update):
+            bot.sendMessage(update.message.chat_id, update.message.text)
+
+        def updates(count):
+            user = User(id=1, first_name="test")
+            for i in range(count):
+                message = Message(i + 1, user, None, Chat(45, "group"), text="/start {0}".format(i),
+                                  bot=self.mockbot)
+                yield Update(i, message=message)
+
+        updater = Updater(workers=2, bot=self.mockbot)
+        updater.dispatcher.add_handler(CommandHandler("start", start))
+        self.mockbot.attach(updater)
+        updater.start_polling()
+        self.assertTrue(self.mockbot.insertUpdates(updates(500), wait=True))
+        self.assertEqual(len(self.mockbot.sent_messages), 500)
+        self.assertEqual(self.mockbot.sent_messages[-1]['text'], "/start 499")
+        self.assertEqual(self.mockbot.message_store.get(chat_id=45, message_id=500).text, "/start 499")
+        updater.stop()
+
+    def test_insertUpdates_timeout(self):
+        def stuck(bot, update):
+            time.sleep(.5)
+
+        updater = Updater(workers=2, bot=self.mockbot)
+        updater.dispatcher.add_handler(CommandHandler("stuck", stuck))
+        self.mockbot.attach(updater)
+        updater.start_polling()
+        user = User(id=1, first_name="test")
+        updates = [Update(i, message=Message(i, user, None, Chat(45, "group"), text="/stuck",
+                                             bot=self.mockbot)) for i in range(3)]
+        self.assertFalse(self.mockbot.insertUpdates(updates, wait=True, timeout=.1))
+        updater.stop()
+
+    def test_insertUpdates_without_dispatcher(self):
+        start = time.time()
+        self.assertTrue(self.mockbot.insertUpdates([Update(0), Update(1)], wait=True))
+        self.assertTrue(time.time() - start < .3)
+        self.assertEqual([u.update_id for u in self.mockbot.getUpdates()], [0, 1])
+
     def test_properties(self):
         self.assertEqual(self.mockbot.id, 0)
         self.assertEqual(self.mockbot.first_name, "Mockbot")
@@ -81,6 +152,54 @@ class TestMockbot(unittest.TestCase):
         self.mockbot.reset()
         self.assertEqual(len(self.mockbot.sent_messages), 0)
 
+    def test_send_returns_lazy_message(self):
+        from ptbtest.lazymessage import LazyMessage
+        built = []
+        build = self.mockbot._build_message
+
+        def counting_build(*args):
+            built.append(args)
+            return build(*args)
+
+        self.mockbot._build_message = counting_build
+        m = self.mockbot.sendMessage(1, "lazy")
+        m2 = self.mockbot.sendMessage(1, "lazy 2")
+        self.assertIs(type(m), LazyMessage)
+        self.assertIs(m.__class__, LazyMessage)
+        self.assertIsInstance(m, Message)
+        self.assertEqual(built, [])
+        self.assertEqual(m.text, "lazy")
+        self.assertIs(type(m), Message)
+        self.assertEqual(len(built), 1)
+        self.assertEqual(m2.message_id, m.message_id + 1)
+        self.assertEqual(m2.to_dict()['text'], "lazy 2")
+        self.assertEqual(m2.chat.id, 1)
+        self.assertEqual(len(built), 2)
+
+    def test_lazy_message_taken_at_send_time(self):
+        with self.assertRaises(BadMarkupException):
+            self.mockbot.sendMessage(1, "x", parse_mode="Foo")
+        clock = VirtualClock(start=1000)
+        clock.attach(self.mockbot)
+        m = self.mockbot.sendMessage(1, "then")
+        clock.advance(3600)
+        self.assertEqual(m.date, datetime.datetime.fromtimestamp(1000))
+
+        build = self.mockbot._build_message
+        calls = []
+
+        def failing_build(*args):
+            calls.append(args)
+            if len(calls) == 1:
+                raise ValueError("first build fails")
+            return build(*args)
+
+        self.mockbot._build_message = failing_build
+        m = self.mockbot.sendMessage(1, "retry")
+        with self.assertRaises(ValueError):
+            m.text
+        self.assertEqual(m.text, "retry")
+
     def test_dejson_and_to_dict(self):
         import json
         d = self.mockbot.to_dict()
@@ -217,11 +336,48 @@ class TestMockbot(unittest.TestCase):
 
         self.assertIsInstance(data, User)
         self.assertEqual(data.name, "@MockBot")
+        self.assertIs(self.mockbot.getMe(), data)
+        self.mockbot.username = "Renamed"
+        self.assertEqual(self.mockbot.getMe().name, "@Renamed")
+        self.assertEqual(self.mockbot.name, "@Renamed")
+        self.mockbot._username = "Again"
+        self.mockbot.invalidate_identity()
+        self.assertEqual(self.mockbot.username, "Again")
 
     def test_getUpdates(self):
         data = self.mockbot.getUpdates()
 
         self.assertEqual(data, [])
+        self.assertEqual(self.mockbot.poll_stats,
+                         {'polls': 1, 'empty_polls': 1})
+
+    def test_getUpdates_long_poll(self):
+        import threading
+        update = Update(1)
+        start = time.time()
+        self.assertEqual(self.mockbot.getUpdates(timeout=.3), [])
+        self.assertTrue(time.time() - start >= .3)
+
+        threading.Timer(.1, self.mockbot.insertUpdate, [update]).start()
+        start = time.time()
+        self.assertEqual(self.mockbot.getUpdates(timeout=10), [update])
+        self.assertTrue(time.time() - start < .5)
+
+        start = time.time()
+        self.assertEqual(self.mockbot.getUpdates(offset=2, timeout=10), [])
+        self.assertTrue(time.time() - start < 1.5)
+        self.assertEqual(self.mockbot.poll_stats,
+                         {'polls': 3, 'empty_polls': 2})
+
+    def test_getUpdates_offset_limit(self):
+        updates = [Update(i) for i in range(1, 6)]
+        for u in updates:
+            self.mockbot._updates.put(u)
+        self.assertEqual(self.mockbot.getUpdates(limit=2), updates[:2])
+        self.assertEqual(self.mockbot.getUpdates(limit=2), updates[:2])
+        self.assertEqual(self.mockbot.getUpdates(offset=3, limit=2), updates[2:4])
+        self.assertEqual(self.mockbot.getUpdates(offset=5), updates[4:])
+        self.assertEqual(self.mockbot.getUpdates(offset=6), [])
 
     def test_getUserProfilePhotos(self):
         self.mockbot.getUserProfilePhotos(1, offset=2)
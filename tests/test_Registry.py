@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# pylint: disable=E0611,E0213,E1102,C0103,E1101,W0613,R0913,R0904
+#
+# A library that provides a testing suite fot python-telegram-bot
+# wich can be found on https://github.com/python-telegram-bot/python-telegram-bot
+# Copyright (C) 2017
+# Pieter Schutz - https://github.com/eldinnie
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser Public License for more details.
+#
+# You should have received a copy of the GNU Lesser Public License
+# along with this program.  If not, see [http://www.gnu.org/licenses/].
+from __future__ import absolute_import
+import unittest
+
+from ptbtest import ChatGenerator
+from ptbtest import MessageGenerator
+from ptbtest import Mockbot
+from ptbtest import Registry
+from ptbtest import UserGenerator
+
+
+class TestRegistry(unittest.TestCase):
+    def setUp(self):
+        self.bot = Mockbot()
+        self.registry = self.bot.registry
+
+    def test_mockbot_reuses_chats(self):
+        c1 = self.bot.sendMessage(12345, "one").chat
+        c2 = self.bot.sendMessage(12345, "two").chat
+        self.assertIs(c1, c2)
+        self.assertIs(self.registry.get_chat(12345), c1)
+        self.assertEqual(self.registry.get_user(12345).first_name,
+                         c1.first_name)
+
+    def test_generated_messages_share_state(self):
+        mg = MessageGenerator(bot=self.bot)
+        chat = ChatGenerator().get_chat(type="group")
+        u = mg.get_message(chat=chat, text="hello")
+        self.assertIs(self.registry.get_chat(chat.id), chat)
+        self.assertIs(self.registry.get_user(u.message.from_user.id),
+                      u.message.from_user)
+        reply = self.bot.sendMessage(chat.id, "hi there")
+        self.assertIs(reply.chat, chat)
+        private = mg.get_message().message.chat
+        self.assertIs(mg.get_message(chat=private).message.from_user,
+                      self.registry.get_user(private.id))
+
+    def test_generators_with_registry(self):
+        registry = Registry()
+        cg = ChatGenerator(registry=registry)
+        c = cg.get_chat()
+        self.assertIs(cg.get_chat(cid=c.id), c)
+        self.assertEqual(registry.get_user(c.id).id, c.id)
+        self.assertEqual(cg.get_chat(cid=c.id, type="channel").type, "channel")
+        self.assertIs(registry.get_chat(c.id), c)
+        ug = UserGenerator(registry=registry)
+        u = ug.get_user()
+        self.assertIs(ug.get_user(id=u.id), u)
+        self.assertIsNot(ug.get_user(id=u.id, first_name="Other"), u)
+        self.assertEqual(registry.get_user(u.id).first_name, "Other")
+        registry.clear()
+        self.assertIsNone(registry.get_chat(c.id))
+
+    def test_forward_from_unknown_message(self):
+        chat = self.bot.sendMessage(77, "private").chat
+        fwd = self.bot.forwardMessage(1, 77, 9999)
+        self.assertEqual(fwd.forward_from_chat.type, "channel")
+        self.assertIs(self.registry.get_chat(77), chat)
+        self.assertIs(self.bot.sendMessage(77, "still private").chat, chat)
+
+    def test_without_registry(self):
+        cg = ChatGenerator()
+        c = cg.get_chat(cid=42)
+        self.assertIsNot(cg.get_chat(cid=42), c)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# pylint: disable=E0611,E0213,E1102,C0103,E1101,W0613,R0913,R0904
+#
+# A library that provides a testing suite fot python-telegram-bot
+# wich can be found on https://github.com/python-telegram-bot/python-telegram-bot
+# Copyright (C) 2017
+# Pieter Schutz - https://github.com/eldinnie
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser Public License for more details.
+#
+# You should have received a copy of the GNU Lesser Public License
+# along with this program.  If not, see [http://www.gnu.org/licenses/].
+from __future__ import absolute_import
+import unittest
+
+from ptbtest import Mockbot
+from ptbtest.sentmessages import (SentMessage, SentMessages)
+from telegram import (InlineKeyboardButton, InlineKeyboardMarkup)
+
+
+class TestSentMessages(unittest.TestCase):
+    def setUp(self):
+        self.bot = Mockbot()
+        self.bot.sendMessage(1, "one")
+        self.bot.sendMessage(2, "two", reply_to_message_id=5)
+        self.bot.editMessageText("edited", chat_id=1, message_id=3)
+        self.bot.answerInlineQuery("q1", [])
+        self.bot.sendMessage(1, "three")
+
+    def test_list_view(self):
+        data = self.bot.sent_messages
+        self.assertIsInstance(data, SentMessages)
+        self.assertEqual(len(data), 5)
+        self.assertEqual(data[0]['text'], "one")
+        self.assertEqual(data[-1]['text'], "three")
+        self.assertEqual([m['method'] for m in data[1:3]],
+                         ['sendMessage', 'editMessageText'])
+        self.assertEqual(len([m for m in data if m.get('chat_id') == 1]), 3)
+        self.bot.reset()
+        self.assertEqual(self.bot.sent_messages, [])
+
+    def test_record(self):
+        markup = InlineKeyboardMarkup(
+            [[InlineKeyboardButton("b", callback_data="d")]])
+        self.bot.sendMessage(3, "keys", reply_markup=markup)
+        record = self.bot.sent_messages[-1]
+        self.assertIsInstance(record, SentMessage)
+        self.assertFalse(hasattr(record, '__dict__'))
+        self.assertEqual(record['method'], 'sendMessage')
+        self.assertEqual(record['reply_markup'], markup.to_json())
+        self.assertEqual(record.get('caption'), None)
+        self.assertIn('text', record)
+        self.assertNotIn('caption', record)
+        with self.assertRaises(KeyError):
+            record['caption']
+        self.assertEqual(record, {
+            'chat_id': 3,
+            'text': "keys",
+            'reply_markup': markup.to_json(),
+            'method': 'sendMessage'
+        })
+        self.assertEqual(self.bot.sent_messages[0], {
+            'chat_id': 1,
+            'text': "one",
+            'method': 'sendMessage'
+        })
+        record['text'] = "changed"
+        self.assertEqual(record.to_dict()['text'], "changed")
+        record['caption'] = "added"
+        self.assertEqual(record['caption'], "added")
+        self.assertEqual(self.bot.sent_messages[0].get('caption'), None)
+        self.assertIs(record._keys, SentMessage('sendMessage', {'chat_id': 4, 'text': "x", 'caption': "y"})._keys)
+
+    def test_lookups(self):
+        data = self.bot.sent_messages
+        self.assertEqual([m['text'] for m in data.by_chat(1)],
+                         ["one", "edited", "three"])
+        self.assertEqual(len(data.by_method('sendMessage')), 3)
+        self.assertEqual(data.by_reply_to_message_id(5)[0]['text'], "two")
+        self.assertEqual(data.by_inline_query_id("q1")[0]['method'],
+                         'answerInlineQuery')
+        self.assertEqual(data.by_chat(404), [])
+        self.assertEqual(data.latest(1)['text'], "three")
+        self.assertIsNone(data.latest(404))
+
+    def test_filter(self):
+        data = self.bot.sent_messages
+        found = data.filter(chat_id=1, method='editMessageText')
+        self.assertEqual(len(found), 1)
+        self.assertEqual(found[0]['message_id'], 3)
+        self.assertEqual(len(data.filter(text="two")), 1)
+        self.assertEqual(data.filter(chat_id=2, method='answerInlineQuery'), [])
+
+    def test_capacity(self):
+        bot = Mockbot(max_sent_messages=100)
+        for i in range(10000):
+            bot.sendMessage(i % 7, str(i))
+        data = bot.sent_messages
+        self.assertEqual(len(data), 100)
+        self.assertEqual(data[0]['text'], "9900")
+        self.assertEqual(data[-1]['text'], "9999")
+        self.assertEqual(data.total, 10000)
+        self.assertEqual(data.totals_by_method, {'sendMessage': 10000})
+        self.assertEqual(sum(data.totals_by_chat.values()), 10000)
+        self.assertEqual(data.totals_by_chat[0], 1429)
+        self.assertEqual(sum(len(data.by_chat(c)) for c in range(7)), 100)
+        self.assertEqual(data.latest(9999 % 7)['text'], "9999")
+        bot.reset()
+        self.assertEqual(bot.sent_messages.capacity, 100)
+        with self.assertRaises(ValueError):
+            SentMessages(capacity=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
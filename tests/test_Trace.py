@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# pylint: disable=E0611,E0213,E1102,C0103,E1101,W0613,R0913,R0904
+#
+# A library that provides a testing suite fot python-telegram-bot
+# wich can be found on https://github.com/python-telegram-bot/python-telegram-bot
+# Copyright (C) 2017
+# Pieter Schutz - https://github.com/eldinnie
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser Public License for more details.
+#
+# You should have received a copy of the GNU Lesser Public License
+# along with this program.  If not, see [http://www.gnu.org/licenses/].
+from __future__ import absolute_import
+import gzip
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from telegram.ext import (CommandHandler, Updater)
+
+from ptbtest import MessageGenerator
+from ptbtest import Mockbot
+from ptbtest import VirtualClock
+from ptbtest.trace import (TraceRecorder, TraceReplayer)
+
+
+class TestTrace(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.bot = Mockbot()
+        self.mg = MessageGenerator(bot=self.bot)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def echo_updater(self, bot):
+        def echo(bot, update):
+            bot.sendMessage(update.message.chat_id, update.message.text)
+
+        updater = Updater(workers=2, bot=bot)
+        updater.dispatcher.add_handler(CommandHandler("echo", echo))
+        bot.attach(updater)
+        updater.start_polling()
+        return updater
+
+    def test_record_and_replay(self):
+        path = os.path.join(self.dir, "trace.jsonl.gz")
+        updater = self.echo_updater(self.bot)
+        updates = [self.mg.get_message(text="/echo {0}".format(i)) for i in range(20)]
+        with TraceRecorder(path, bot=self.bot):
+            self.bot.insertUpdate(updates[0])
+            self.bot.insertUpdates(updates[1:], wait=True)
+        updater.stop()
+        self.bot.sendMessage(1, "not recorded")
+        with gzip.open(path, 'rb') as f:
+            self.assertEqual(len(f.readlines()), 40)
+
+        replayer = TraceReplayer(path)
+        calls = list(replayer.calls())
+        self.assertEqual(calls[0]['text'], "/echo 0")
+        self.assertEqual(calls[0]['update_id'], updates[0].update_id)
+        replayed = [update for _, update in replayer.updates()]
+        self.assertEqual([(u.update_id, u.message.text, u.message.chat_id) for u in replayed],
+                         [(u.update_id, u.message.text, u.message.chat_id) for u in updates])
+
+        bot = Mockbot()
+        updater = self.echo_updater(bot)
+        stats = replayer.replay(bot, speed=None, batch=7)
+        updater.stop()
+        self.assertEqual(stats['updates'], 20)
+        self.assertTrue(stats['handled'])
+        self.assertEqual([r['text'] for r in bot.sent_messages], [c['text'] for c in calls])
+
+    def test_replay_speed(self):
+        lines = [json.dumps({'t': t, 'update': self.mg.get_message().to_dict()})
+                 for t in (0, 10, 30)]
+        trace = io.BytesIO('\n'.join(lines).encode('utf-8'))
+        bot = Mockbot(clock=VirtualClock())
+        start = bot.clock.time()
+        stats = TraceReplayer(trace).replay(bot, speed=2)
+        self.assertEqual(stats['updates'], 3)
+        self.assertAlmostEqual(bot.clock.time() - start, 15)
+        self.assertEqual(len(bot.getUpdates()), 3)
+
+    def test_read_api_dumps(self):
+        path = os.path.join(self.dir, "dump.jsonl")
+        with open(path, 'w') as f:
+            f.write(json.dumps({'ok': True, 'result': [self.mg.get_message().to_dict(),
+                                                       self.mg.get_message().to_dict()]}) + '\n\n')
+            f.write(json.dumps(self.mg.get_message(text="single").to_dict()) + '\n')
+        updates = [update for t, update in TraceReplayer(path).updates()]
+        self.assertEqual(len(updates), 3)
+        self.assertEqual(updates[-1].message.text, "single")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# pylint: disable=E0611,E0213,E1102,C0103,E1101,W0613,R0913,R0904
+#
+# A library that provides a testing suite fot python-telegram-bot
+# wich can be found on https://github.com/python-telegram-bot/python-telegram-bot
+# Copyright (C) 2017
+# Pieter Schutz - https://github.com/eldinnie
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser Public License for more details.
+#
+# You should have received a copy of the GNU Lesser Public License
+# along with this program.  If not, see [http://www.gnu.org/licenses/].
+from __future__ import absolute_import
+import os
+import shutil
+import tempfile
+import unittest
+
+from telegram import (InlineKeyboardButton, InlineKeyboardMarkup)
+from telegram.ext import (CommandHandler, Updater)
+
+from ptbtest import MessageGenerator
+from ptbtest import Mockbot
+from ptbtest.trace import (TraceRecorder, TraceReplayer)
+from ptbtest.transcript import (TranscriptChecker, assert_transcript, compare_transcript, read_transcript,
+                                write_transcript)
+
+
+class TestTranscript(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, "golden.jsonl.gz")
+        self.bot = Mockbot()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def run_scenario(self, bot, file_id="abc"):
+        markup = InlineKeyboardMarkup([[InlineKeyboardButton("ok", callback_data="ok")]])
+        for i in range(50):
+            bot.sendMessage(1, "message {0}".format(i), reply_markup=markup)
+        bot.sendPhoto(1, photo=file_id)
+        bot.answerCallbackQuery("query", text="done")
+
+    def test_matching_run(self):
+        self.run_scenario(self.bot)
+        self.assertEqual(write_transcript(self.path, self.bot.sent_messages), 52)
+        first = next(read_transcript(self.path))
+        self.assertEqual(first['reply_markup']['inline_keyboard'][0][0]['text'], "ok")
+        other = Mockbot()
+        self.run_scenario(other)
+        self.assertIsNone(compare_transcript(self.path, other.sent_messages))
+        assert_transcript(self.path, other.sent_messages)
+
+    def test_first_difference(self):
+        self.run_scenario(self.bot)
+        write_transcript(self.path, self.bot.sent_messages)
+        other = Mockbot()
+        markup = InlineKeyboardMarkup([[InlineKeyboardButton("ok", callback_data="ok")]])
+        other.sendMessage(1, "message 0", reply_markup=markup)
+        other.sendMessage(2, "changed")
+        difference = compare_transcript(self.path, other.sent_messages)
+        self.assertEqual(difference.index, 1)
+        self.assertEqual(difference.fields, ['chat_id', 'reply_markup', 'text'])
+        with self.assertRaises(AssertionError):
+            assert_transcript(self.path, other.sent_messages)
+
+    def test_length_differences(self):
+        self.run_scenario(self.bot)
+        write_transcript(self.path, self.bot.sent_messages)
+        difference = compare_transcript(self.path, self.bot.sent_messages[:-1])
+        self.assertEqual(difference.index, 51)
+        self.assertIsNone(difference.actual)
+        self.bot.sendMessage(1, "extra")
+        difference = compare_transcript(self.path, self.bot.sent_messages)
+        self.assertEqual(difference.index, 52)
+        self.assertIsNone(difference.expected)
+
+    def test_ignore(self):
+        self.run_scenario(self.bot, file_id="first")
+        write_transcript(self.path, self.bot.sent_messages)
+        other = Mockbot()
+        self.run_scenario(other, file_id="second")
+        self.assertEqual(compare_transcript(self.path, other.sent_messages).fields, ['photo'])
+        self.assertIsNone(compare_transcript(self.path, other.sent_messages, ignore=['photo']))
+
+    def test_checker_as_listener(self):
+        self.run_scenario(self.bot)
+        write_transcript(self.path, self.bot.sent_messages)
+        bot = Mockbot(max_sent_messages=1)
+        checker = TranscriptChecker(self.path)
+        bot.add_listener(checker)
+        self.run_scenario(bot)
+        self.assertEqual(checker.checked, 52)
+        self.assertIsNone(checker.finish())
+
+    def test_transcript_of_trace(self):
+        def echo_bot():
+            bot = Mockbot()
+            updater = Updater(workers=2, bot=bot)
+            updater.dispatcher.add_handler(CommandHandler(
+                "echo", lambda bot, update: bot.sendMessage(update.message.chat_id, update.message.text)))
+            bot.attach(updater)
+            updater.start_polling()
+            return bot, updater
+
+        trace = os.path.join(self.dir, "trace.jsonl")
+        bot, updater = echo_bot()
+        mg = MessageGenerator(bot=bot)
+        with TraceRecorder(trace, bot=bot):
+            bot.insertUpdates([mg.get_message(text="/echo {0}".format(i)) for i in range(10)], wait=True)
+        updater.stop()
+        self.assertEqual(write_transcript(self.path, TraceReplayer(trace).calls()), 10)
+
+        bot, updater = echo_bot()
+        TraceReplayer(trace).replay(bot, speed=None)
+        updater.stop()
+        self.assertIsNone(compare_transcript(self.path, bot.sent_messages))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+# pylint: disable=E0611,E0213,E1102,C0103,E1101,W0613,R0913,R0904
+#
+# A library that provides a testing suite fot python-telegram-bot
+# wich can be found on https://github.com/python-telegram-bot/python-telegram-bot
+# Copyright (C) 2017
+# Pieter Schutz - https://github.com/eldinnie
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser Public License for more details.
+#
+# You should have received a copy of the GNU Lesser Public License
+# along with this program.  If not, see [http://www.gnu.org/licenses/].
+from __future__ import absolute_import
+import threading
+import time
+import unittest
+
+from telegram import Update
+
+from ptbtest.updatequeue import UpdateQueue
+
+
+class TestUpdateQueue(unittest.TestCase):
+    def setUp(self):
+        self.queue = UpdateQueue()
+
+    def test_drain(self):
+        self.assertEqual(self.queue.drain(), [])
+        self.queue.put(1)
+        self.queue.put(2)
+        self.assertEqual(len(self.queue), 2)
+        self.assertEqual(self.queue.drain(), [1, 2])
+        self.assertEqual(len(self.queue), 0)
+
+    def test_get_offset_limit(self):
+        updates = [Update(i) for i in range(1, 251)]
+        for u in updates:
+            self.queue.put(u)
+        batch = self.queue.get(limit=100)
+        self.assertEqual(batch, updates[:100])
+        # not acknowledged, so handed out again
+        self.assertEqual(self.queue.get(limit=100), updates[:100])
+        self.assertEqual(self.queue.get(offset=101, limit=100), updates[100:200])
+        self.assertEqual(self.queue.get(offset=151, limit=100), updates[150:250])
+        self.assertEqual(len(self.queue), 100)
+        self.assertEqual(self.queue.get(offset=251, limit=100), [])
+        self.assertEqual(len(self.queue), 0)
+
+    def test_get_undelivered_not_acknowledged(self):
+        self.queue.put(Update(5))
+        self.assertEqual(len(self.queue.get()), 1)
+        late = Update(1)
+        self.queue.put(late)
+        self.assertEqual(self.queue.get(offset=6), [late])
+        self.assertEqual(self.queue.get(offset=6), [])
+
+    def test_get_negative_offset(self):
+        for i in range(10):
+            self.queue.put(Update(i))
+        self.assertEqual([u.update_id for u in self.queue.get(offset=-3)],
+                         [7, 8, 9])
+
+    def test_maxlen(self):
+        queue = UpdateQueue(maxlen=3)
+        for i in range(5):
+            queue.put(Update(i))
+        self.assertEqual(queue.dropped, 2)
+        self.assertEqual([u.update_id for u in queue.drain()], [2, 3, 4])
+
+    def test_put_many(self):
+        queue = UpdateQueue(maxlen=5)
+        queue.put(Update(0))
+        queue.put_many(Update(i) for i in range(1, 7))
+        self.assertEqual(queue.dropped, 2)
+        self.assertEqual([u.update_id for u in queue.get()], [2, 3, 4, 5, 6])
+        queue.put_many([])
+        self.assertEqual(len(queue), 5)
+
+    def test_put_many_wakes_consumer(self):
+        threading.Timer(.1, self.queue.put_many, [[1, 2, 3]]).start()
+        start = time.time()
+        self.assertEqual(self.queue.drain(timeout=5), [1, 2, 3])
+        self.assertTrue(time.time() - start < 1)
+
+    def test_drain_waits(self):
+        threading.Timer(.1, self.queue.put, [1]).start()
+        start = time.time()
+        self.assertEqual(self.queue.drain(timeout=5), [1])
+        self.assertTrue(time.time() - start < 1)
+
+    def test_many_producers(self):
+        producers, per_producer = 16, 2000
+        received = []
+        done = threading.Event()
+
+        def produce(n):
+            for i in range(per_producer):
+                self.queue.put((n, i))
+
+        def consume():
+            while not done.is_set() or len(self.queue):
+                received.extend(self.queue.drain(timeout=.01))
+
+        consumer = threading.Thread(target=consume)
+        consumer.start()
+        threads = [
+            threading.Thread(target=produce, args=(n, ))
+            for n in range(producers)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        done.set()
+        consumer.join()
+
+        self.assertEqual(len(received), producers * per_producer)
+        self.assertEqual(len(set(received)), producers * per_producer)
+        for n in range(producers):
+            own = [i for p, i in received if p == n]
+            self.assertEqual(own, list(range(per_producer)))
+
+
+if __name__ == '__main__':
+    unittest.main()
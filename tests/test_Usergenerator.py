@@ -19,6 +19,7 @@
 # You should have received a copy of the GNU Lesser Public License
 # along with this program.  If not, see [http://www.gnu.org/licenses/].
 from __future__ import absolute_import
+import random
 import unittest
 
 from ptbtest import UserGenerator
@@ -45,6 +46,14 @@ class TestUserGenerator(unittest.TestCase):
 
         self.assertEqual(u.username, "misterbot")
 
+    def test_seed(self):
+        first = [UserGenerator(seed=7).get_user() for _ in range(2)]
+        self.assertEqual(first[0].to_dict(), first[1].to_dict())
+        rng = random.Random(7)
+        ug = UserGenerator(seed=rng)
+        self.assertIs(ug.random, rng)
+        self.assertEqual(ug.get_user().to_dict(), first[0].to_dict())
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# pylint: disable=E0611,E0213,E1102,C0103,E1101,W0613,R0913,R0904
+#
+# A library that provides a testing suite fot python-telegram-bot
+# wich can be found on https://github.com/python-telegram-bot/python-telegram-bot
+# Copyright (C) 2017
+# Pieter Schutz - https://github.com/eldinnie
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser Public License for more details.
+#
+# You should have received a copy of the GNU Lesser Public License
+# along with this program.  If not, see [http://www.gnu.org/licenses/].
+from __future__ import absolute_import
+import datetime
+import unittest
+
+from telegram.ext import Updater
+
+from ptbtest import MessageGenerator
+from ptbtest import Mockbot
+from ptbtest import VirtualClock
+from ptbtest.latency import ConstantLatency
+from ptbtest.virtualclock import VirtualJobQueue
+
+
+class TestVirtualClock(unittest.TestCase):
+    def setUp(self):
+        self.bot = Mockbot()
+        self.clock = VirtualClock(start=1000000)
+        self.updater = Updater(bot=self.bot)
+        self.clock.attach(self.updater)
+
+    def tearDown(self):
+        self.updater.stop()
+
+    def test_attach(self):
+        self.assertIsInstance(self.updater.job_queue, VirtualJobQueue)
+        self.assertIs(self.updater.dispatcher.job_queue,
+                      self.updater.job_queue)
+        self.assertIs(self.bot.clock, self.clock)
+
+    def test_advance_runs_due_jobs_in_order(self):
+        ran = []
+
+        def callback(bot, job):
+            ran.append((job.context, self.clock.time()))
+
+        jq = self.updater.job_queue
+        jq.start()
+        jq.run_once(callback, 30, context="c")
+        jq.run_once(callback, 10, context="a")
+        jq.run_once(callback, 10, context="b")
+        jq.run_repeating(callback, 20, first=5, context="r")
+        self.clock.advance(29)
+        self.assertEqual(ran, [("r", 1000005), ("a", 1000010),
+                               ("b", 1000010), ("r", 1000025)])
+        self.assertEqual(self.clock.time(), 1000029)
+        self.clock.advance(datetime.timedelta(seconds=1))
+        self.assertEqual(ran[-1], ("c", 1000030))
+        with self.assertRaises(ValueError):
+            self.clock.advance(-1)
+
+    def test_jobs_only_run_when_started(self):
+        ran = []
+        self.updater.job_queue.run_once(lambda b, j: ran.append(j), 1)
+        self.clock.advance(2)
+        self.assertEqual(ran, [])
+        self.updater.job_queue.start()
+        self.clock.advance(0)
+        self.assertEqual(len(ran), 1)
+
+    def test_thousands_of_jobs(self):
+        jq = self.updater.job_queue
+        jq.start()
+        for i in range(5000):
+            jq.run_once(lambda bot, job: bot.sendMessage(job.context, "hi"),
+                        i * 60, context=i)
+        self.clock.advance(datetime.timedelta(days=4))
+        self.assertEqual(len(self.bot.sent_messages), 5000)
+        self.assertEqual(self.bot.sent_messages[-1]['chat_id'], 4999)
+
+    def test_jobs_with_latency(self):
+        self.bot.latency = ConstantLatency(90)
+        ran = []
+
+        def callback(bot, job):
+            bot.sendMessage(1, job.context)
+            ran.append((job.context, self.clock.time()))
+
+        jq = self.updater.job_queue
+        jq.start()
+        jq.run_once(callback, 10, context="a")
+        jq.run_once(callback, 50, context="b")
+        jq.run_once(callback, 150, context="c")
+        self.clock.advance(60)
+        # b and c fall due while a waits for telegram, they run after it like in a real job queue
+        self.assertEqual(ran, [("a", 1000100), ("b", 1000190), ("c", 1000280)])
+        self.assertEqual(self.clock.time(), 1000280)
+        self.clock.advance(10)
+        self.assertEqual(self.clock.time(), 1000290)
+
+    def test_message_dates(self):
+        mg = MessageGenerator(bot=self.bot)
+        u = mg.get_message(forward_from=mg.ug.get_user())
+        self.assertEqual(u.message.date, self.clock.now())
+        self.assertEqual(u.message.forward_date, 1000000)
+        self.clock.advance(60)
+        m = self.bot.sendMessage(1, "test")
+        self.assertEqual(m.date, datetime.datetime.fromtimestamp(1000060))
+
+
+if __name__ == '__main__':
+    unittest.main()
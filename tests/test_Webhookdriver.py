@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# pylint: disable=E0611,E0213,E1102,C0103,E1101,W0613,R0913,R0904
+#
+# A library that provides a testing suite fot python-telegram-bot
+# wich can be found on https://github.com/python-telegram-bot/python-telegram-bot
+# Copyright (C) 2017
+# Pieter Schutz - https://github.com/eldinnie
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser Public License for more details.
+#
+# You should have received a copy of the GNU Lesser Public License
+# along with this program.  If not, see [http://www.gnu.org/licenses/].
+from __future__ import absolute_import
+import time
+import unittest
+
+from telegram.ext import Updater, MessageHandler, Filters
+
+from ptbtest import MessageGenerator
+from ptbtest import Mockbot
+from ptbtest import WebhookDriver
+from ptbtest.webhookdriver import percentile
+
+
+class TestWebhookDriver(unittest.TestCase):
+    def setUp(self):
+        self.bot = Mockbot()
+        self.mg = MessageGenerator(bot=self.bot)
+        self.updater = Updater(workers=2, bot=self.bot)
+        self.updater.dispatcher.add_handler(MessageHandler(
+            Filters.text,
+            lambda bot, update: bot.sendMessage(update.message.chat_id,
+                                                update.message.text)))
+        self.updater.start_webhook(listen='127.0.0.1', port=0, url_path='hook')
+
+    def tearDown(self):
+        self.updater.stop()
+
+    def test_post(self):
+        driver = WebhookDriver.from_updater(self.updater)
+        self.assertEqual(driver.path, '/hook')
+        self.assertEqual(driver.post(self.mg.get_message(text="one")), 200)
+        driver.path = '/wrong'
+        self.assertEqual(driver.post(self.mg.get_message(text="two")), 403)
+
+    def test_run(self):
+        for keep_alive in (True, False):
+            driver = WebhookDriver.from_updater(
+                self.updater, concurrency=4, keep_alive=keep_alive)
+            report = driver.run(
+                self.mg.get_message(text=str(i)) for i in range(40))
+            self.assertEqual(report.requests, 40)
+            self.assertEqual(report.non_200, 0)
+            self.assertEqual(report.errors, 0)
+            self.assertEqual(report.statuses[200], 40)
+            self.assertTrue(report.requests_per_second > 0)
+            self.assertTrue(report.percentile(50) <= report.percentile(99))
+            self.assertEqual(report.to_dict()['requests'], 40)
+
+
+class TestPercentile(unittest.TestCase):
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile(values, 100), 100)
+        self.assertEqual(percentile([3], 95), 3)
+        self.assertIsNone(percentile([], 50))
+
+
+if __name__ == '__main__':
+    unittest.main()